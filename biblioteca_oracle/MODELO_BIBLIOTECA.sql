@@ -1,9 +1,18 @@
+/* ============================
+   SECUENCIAS DE ID
+   ============================ */
+
+CREATE SEQUENCE USUARIOS_SEQ CACHE 1000;
+CREATE SEQUENCE LIBROS_SEQ CACHE 1000;
+CREATE SEQUENCE PRESTAMOS_SEQ CACHE 1000;
+
+
 /* ============================
    TABLA: USUARIOS
    ============================ */
 
 CREATE TABLE USUARIOS (
-    id INTEGER PRIMARY KEY,
+    id INTEGER DEFAULT ON NULL USUARIOS_SEQ.NEXTVAL PRIMARY KEY,
     nombre VARCHAR2(100),
     rut VARCHAR2(12),
     correo VARCHAR2(100),
@@ -16,7 +25,7 @@ CREATE TABLE USUARIOS (
    ============================ */
 
 CREATE TABLE LIBROS (
-    id INTEGER PRIMARY KEY,
+    id INTEGER DEFAULT ON NULL LIBROS_SEQ.NEXTVAL PRIMARY KEY,
     titulo VARCHAR2(150),
     autor VARCHAR2(100),
     anio_publicacion INTEGER
@@ -28,7 +37,7 @@ CREATE TABLE LIBROS (
    ============================ */
 
 CREATE TABLE PRESTAMOS (
-    id INTEGER PRIMARY KEY,
+    id INTEGER DEFAULT ON NULL PRESTAMOS_SEQ.NEXTVAL PRIMARY KEY,
     idUsuario INTEGER NOT NULL,
     idLibro INTEGER NOT NULL,
     fecha_prestamo DATE,
@@ -36,3 +45,77 @@ CREATE TABLE PRESTAMOS (
     FOREIGN KEY (idUsuario) REFERENCES USUARIOS(id),
     FOREIGN KEY (idLibro) REFERENCES LIBROS(id)
 );
+
+
+/* ============================
+   ÍNDICES Y LLAVES ÚNICAS
+   (migración 1, ver migraciones.py)
+   ============================ */
+
+CREATE INDEX PRESTAMOS_USUARIO_IX ON PRESTAMOS (idUsuario);
+CREATE INDEX PRESTAMOS_LIBRO_DEV_IX ON PRESTAMOS (idLibro, fecha_devolucion);
+ALTER TABLE USUARIOS ADD CONSTRAINT USUARIOS_RUT_UK UNIQUE (rut);
+ALTER TABLE USUARIOS ADD CONSTRAINT USUARIOS_CORREO_UK UNIQUE (correo);
+
+
+/* ============================
+   PRÉSTAMOS ABIERTOS
+   (migración 2, ver migraciones.py)
+   ============================ */
+
+-- Sólo contiene los préstamos sin devolver: en los devueltos ambas columnas son NULL
+CREATE INDEX PRESTAMOS_ABIERTOS_IX ON PRESTAMOS (
+    CASE WHEN fecha_devolucion IS NULL THEN fecha_prestamo END,
+    CASE WHEN fecha_devolucion IS NULL THEN idLibro END
+);
+
+CREATE MATERIALIZED VIEW LOG ON PRESTAMOS
+    WITH ROWID, SEQUENCE (idUsuario, idLibro, fecha_devolucion)
+    INCLUDING NEW VALUES;
+
+CREATE MATERIALIZED VIEW PRESTAMOS_ACTIVOS_USUARIO_MV
+    REFRESH FAST ON COMMIT AS
+    SELECT idUsuario, COUNT(*) AS activos FROM PRESTAMOS
+    WHERE fecha_devolucion IS NULL GROUP BY idUsuario;
+
+CREATE MATERIALIZED VIEW PRESTAMOS_ACTIVOS_LIBRO_MV
+    REFRESH FAST ON COMMIT AS
+    SELECT idLibro, COUNT(*) AS activos FROM PRESTAMOS
+    WHERE fecha_devolucion IS NULL GROUP BY idLibro;
+
+
+/* ============================
+   TABLA: PRESTAMOS_HISTORICO
+   (migración 3, ver migraciones.py y archivado.py)
+   ============================ */
+
+CREATE TABLE PRESTAMOS_HISTORICO (
+    id INTEGER PRIMARY KEY,
+    idUsuario INTEGER NOT NULL,
+    idLibro INTEGER NOT NULL,
+    fecha_prestamo DATE,
+    fecha_devolucion DATE,
+    archivado DATE DEFAULT SYSDATE
+) COMPRESS;
+
+CREATE INDEX PRESTAMOS_HIST_USUARIO_IX ON PRESTAMOS_HISTORICO (idUsuario) COMPRESS;
+
+
+/* ============================
+   PRESTAMOS PARTICIONADA (opcional)
+   create_all_tables(particionada=True) o PRESTAMOS_PARTICIONADA=1
+   ============================ */
+
+-- CREATE TABLE PRESTAMOS (
+--     id INTEGER DEFAULT ON NULL PRESTAMOS_SEQ.NEXTVAL PRIMARY KEY,
+--     idUsuario INTEGER NOT NULL,
+--     idLibro INTEGER NOT NULL,
+--     fecha_prestamo DATE NOT NULL,
+--     fecha_devolucion DATE,
+--     FOREIGN KEY (idUsuario) REFERENCES USUARIOS(id),
+--     FOREIGN KEY (idLibro) REFERENCES LIBROS(id)
+-- )
+-- PARTITION BY RANGE (fecha_prestamo)
+-- INTERVAL (NUMTOYMINTERVAL(1, 'MONTH'))
+-- (PARTITION PRESTAMOS_P0 VALUES LESS THAN (DATE '2000-01-01'))
+-- ENABLE ROW MOVEMENT;
@@ -0,0 +1,140 @@
+"""Mueve los préstamos devueltos antiguos de PRESTAMOS a PRESTAMOS_HISTORICO.
+
+Un préstamo se archiva si ya fue devuelto y su fecha_prestamo tiene más de
+`meses` meses. Se procesa por lotes: cada lote se borra de PRESTAMOS con
+DELETE ... RETURNING, se inserta en el historial por ruta directa
+(APPEND_VALUES, que deja las filas comprimidas) y se confirma, así un corte
+a mitad de camino no pierde ni duplica préstamos.
+
+Si PRESTAMOS está particionada por mes, al terminar se eliminan las
+particiones anteriores al corte que quedaron vacías, salvo que PRESTAMOS
+tenga log de vista materializada (ver _eliminar_particiones_vacias).
+
+Uso: python archivado.py [--meses 12] [--lote 10000]
+"""
+import argparse
+import calendar
+import logging
+from datetime import date, datetime
+
+import oracledb
+
+from conexion import get_connection
+
+logger = logging.getLogger(__name__)
+
+MESES = 12
+
+SQL_MOVER = (
+    "DELETE FROM PRESTAMOS WHERE id IN ("
+    "SELECT id FROM PRESTAMOS "
+    "WHERE fecha_devolucion IS NOT NULL AND fecha_prestamo < :corte "
+    "FETCH FIRST :lote ROWS ONLY) "
+    "RETURNING id, idUsuario, idLibro, fecha_prestamo, fecha_devolucion "
+    "INTO :id, :idUsuario, :idLibro, :fecha_prestamo, :fecha_devolucion"
+)
+
+SQL_HISTORICO = (
+    "INSERT /*+ APPEND_VALUES */ INTO PRESTAMOS_HISTORICO "
+    "(id, idUsuario, idLibro, fecha_prestamo, fecha_devolucion) "
+    "VALUES (:id, :idUsuario, :idLibro, :fecha_prestamo, :fecha_devolucion)"
+)
+
+
+def restar_meses(fecha: date, meses: int) -> date:
+    """Misma fecha `meses` meses antes (o el último día de ese mes si es más corto)."""
+    anio, mes = divmod(fecha.year * 12 + fecha.month - 1 - meses, 12)
+    mes += 1
+    return date(anio, mes, min(fecha.day, calendar.monthrange(anio, mes)[1]))
+
+
+def _mover_lote(cursor, corte: datetime, lote: int) -> list:
+    salida = {
+        "id": cursor.var(int, arraysize=lote),
+        "idUsuario": cursor.var(int, arraysize=lote),
+        "idLibro": cursor.var(int, arraysize=lote),
+        "fecha_prestamo": cursor.var(oracledb.DB_TYPE_DATE, arraysize=lote),
+        "fecha_devolucion": cursor.var(oracledb.DB_TYPE_DATE, arraysize=lote),
+    }
+    cursor.execute(SQL_MOVER, {"corte": corte, "lote": lote, **salida})
+    columnas = [var.getvalue() for var in salida.values()]
+    filas = [dict(zip(salida, valores)) for valores in zip(*columnas)]
+    if filas:
+        cursor.executemany(SQL_HISTORICO, filas)
+    return filas
+
+
+def _eliminar_particiones_vacias(cursor, meses_archivados: set, corte: datetime) -> int:
+    cursor.execute("SELECT partitioned FROM user_tables WHERE table_name = 'PRESTAMOS'")
+    fila = cursor.fetchone()
+    if fila is None or fila[0] != "YES":
+        return 0
+    # Las vistas PRESTAMOS_ACTIVOS_*_MV (migración 2) se refrescan con el log
+    # de PRESTAMOS; un DROP PARTITION no pasa por el log y las dejaría
+    # desactualizadas sin aviso. Las particiones vacías no molestan: se dejan.
+    cursor.execute("SELECT COUNT(*) FROM user_mview_logs WHERE master = 'PRESTAMOS'")
+    if cursor.fetchone()[0]:
+        logger.info("PRESTAMOS tiene log de vista materializada: no se eliminan particiones")
+        return 0
+    eliminadas = 0
+    for inicio in sorted(meses_archivados):
+        fin = date(inicio.year + inicio.month // 12, inicio.month % 12 + 1, 1)
+        if fin > corte.date():
+            continue
+        cursor.execute(
+            "SELECT COUNT(*) FROM PRESTAMOS "
+            "WHERE fecha_prestamo >= :inicio AND fecha_prestamo < :fin AND ROWNUM = 1",
+            {"inicio": datetime(inicio.year, inicio.month, 1), "fin": datetime(fin.year, fin.month, 1)},
+        )
+        if cursor.fetchone()[0]:
+            continue
+        try:
+            cursor.execute(
+                f"ALTER TABLE PRESTAMOS DROP PARTITION FOR (DATE '{inicio:%Y-%m-01}') "
+                "UPDATE GLOBAL INDEXES"
+            )
+            eliminadas += 1
+        except oracledb.DatabaseError as error:
+            # p. ej. ORA-14758: la partición inicial del rango no se puede eliminar
+            logger.info("No se eliminó la partición de %s: %s", f"{inicio:%Y-%m}", error)
+    return eliminadas
+
+
+def archivar(meses: int = MESES, lote: int = 10000, hoy: date | None = None) -> int:
+    """Archiva los préstamos devueltos de hace más de `meses` meses; retorna cuántos."""
+    corte = restar_meses(hoy or date.today(), meses)
+    corte = datetime(corte.year, corte.month, corte.day)
+    total = 0
+    meses_archivados = set()
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            while True:
+                filas = _mover_lote(cursor, corte, lote)
+                connection.commit()
+                total += len(filas)
+                meses_archivados.update(
+                    date(f["fecha_prestamo"].year, f["fecha_prestamo"].month, 1)
+                    for f in filas
+                    if f["fecha_prestamo"] is not None
+                )
+                logger.info("Archivados %s préstamos (total %s)", len(filas), total)
+                if len(filas) < lote:
+                    break
+            eliminadas = _eliminar_particiones_vacias(cursor, meses_archivados, corte)
+    if eliminadas:
+        logger.info("Particiones vacías eliminadas: %s", eliminadas)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archiva préstamos devueltos antiguos")
+    parser.add_argument("--meses", type=int, default=MESES)
+    parser.add_argument("--lote", type=int, default=10000)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    total = archivar(args.meses, args.lote)
+    print(f"{total} préstamos movidos a PRESTAMOS_HISTORICO.")
+
+
+if __name__ == "__main__":
+    main()
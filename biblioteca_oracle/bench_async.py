@@ -0,0 +1,64 @@
+"""Compara el rendimiento del CRUD síncrono contra el asíncrono.
+
+Hace N lecturas por id de LIBROS con crud_biblioteca (una tras otra) y con
+crud_biblioteca_async (hasta `concurrencia` consultas en vuelo a la vez).
+
+Uso: python bench_async.py [consultas] [concurrencia]
+"""
+import asyncio
+import contextlib
+import io
+import sys
+import time
+from itertools import islice
+
+import crud_biblioteca
+import crud_biblioteca_async
+
+
+def ids_de_prueba(n: int) -> list:
+    ids = [libro.id for libro in islice(crud_biblioteca.iter_libros(batch_size=n), n)]
+    if not ids:
+        sys.exit("LIBROS está vacía: cargue datos antes de medir.")
+    return [ids[i % len(ids)] for i in range(n)]
+
+
+def medir_sync(ids: list) -> float:
+    inicio = time.perf_counter()
+    # read_libro_by_id imprime cada fila; se descarta la salida
+    with contextlib.redirect_stdout(io.StringIO()):
+        for id in ids:
+            crud_biblioteca.read_libro_by_id(id)
+    return time.perf_counter() - inicio
+
+
+async def medir_async(ids: list, concurrencia: int) -> float:
+    semaforo = asyncio.Semaphore(concurrencia)
+
+    async def leer(id):
+        async with semaforo:
+            return await crud_biblioteca_async.read_libro_by_id(id)
+
+    # Calienta el pool para no contar su creación
+    await crud_biblioteca_async.read_libro_by_id(ids[0])
+    inicio = time.perf_counter()
+    await asyncio.gather(*(leer(id) for id in ids))
+    duracion = time.perf_counter() - inicio
+    await crud_biblioteca_async.close_pool()
+    return duracion
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    concurrencia = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    ids = ids_de_prueba(n)
+
+    sync = medir_sync(ids)
+    asincrono = asyncio.run(medir_async(ids, concurrencia))
+
+    print(f"sync : {n / sync:10.1f} consultas/s ({sync:.2f} s)")
+    print(f"async: {n / asincrono:10.1f} consultas/s ({asincrono:.2f} s, concurrencia={concurrencia})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compara la latencia de conectar en cada llamada contra usar el pool.
+
+Uso: python bench_pool.py [repeticiones]
+"""
+import statistics
+import sys
+import time
+
+import oracledb
+
+import conexion
+
+SQL = "SELECT 1 FROM dual"
+
+
+def medir(obtener_conexion, repeticiones: int) -> list:
+    """Ejecuta SQL obteniendo una conexión por iteración; retorna los tiempos en ms."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        with obtener_conexion() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(SQL).fetchall()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+
+def conexion_directa():
+    """Comportamiento anterior: un oracledb.connect() completo por llamada."""
+    return oracledb.connect(
+        user=conexion.username, password=conexion.password, dsn=conexion.dsn
+    )
+
+
+def resumen(nombre: str, tiempos: list):
+    tiempos = sorted(tiempos)
+    p95 = tiempos[int(len(tiempos) * 0.95) - 1]
+    print(
+        f"{nombre:<10} media={statistics.mean(tiempos):8.2f} ms  "
+        f"p50={statistics.median(tiempos):8.2f} ms  p95={p95:8.2f} ms"
+    )
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    # Calienta el pool para no contar su creación
+    conexion.get_connection().close()
+
+    resumen("connect()", medir(conexion_directa, repeticiones))
+    resumen("pool", medir(conexion.get_connection, repeticiones))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Benchmark del CRUD de la biblioteca.
+
+Carga `--filas` usuarios, libros y préstamos y mide, por tabla, inserciones,
+lecturas por id, actualizaciones, borrados y lecturas completas. Reporta
+operaciones por segundo y latencias p50/p95/p99, y guarda todo en JSON para
+comparar entre versiones.
+
+Ejemplos:
+    python benchmark.py --standin --filas 100000
+    python benchmark.py --dsn localhost/FREEPDB1 --filas 1000 --salida oracle.json
+    python benchmark.py --standin --comparar anterior.json
+
+Contra Oracle las filas de prueba usan ids desde --id-base y se borran al
+terminar, así no chocan con los datos existentes.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import conexion
+import crud_biblioteca as crud
+
+
+def percentil(ordenados: list, p: float) -> float:
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+def medir(operacion, argumentos: list) -> dict:
+    """Ejecuta operacion(*args) para cada elemento y resume las latencias."""
+    latencias = []
+    inicio_total = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for args in argumentos:
+            inicio = time.perf_counter()
+            operacion(*args)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+    total = time.perf_counter() - inicio_total
+    latencias.sort()
+    return {
+        "operaciones": len(latencias),
+        "ops_por_seg": round(len(latencias) / total, 1),
+        "media_ms": round(statistics.mean(latencias), 3),
+        "p50_ms": round(percentil(latencias, 50), 3),
+        "p95_ms": round(percentil(latencias, 95), 3),
+        "p99_ms": round(percentil(latencias, 99), 3),
+    }
+
+
+def cargar_datos(base: int, filas: int):
+    crud.bulk_create_usuarios(
+        {"id": base + i, "nombre": f"Usuario {i}", "rut": f"B{base + i}",
+         "correo": f"u{base + i}@bench.cl", "tipo_usuario": "estudiante"}
+        for i in range(filas)
+    )
+    crud.bulk_create_libros(
+        {"id": base + i, "titulo": f"Libro {i}", "autor": f"Autor {i % 1000}",
+         "anio_publicacion": 1900 + i % 120}
+        for i in range(filas)
+    )
+    crud.bulk_create_prestamos(
+        {"id": base + i, "idUsuario": base + i, "idLibro": base + (i * 7) % filas,
+         "fecha_prestamo": "01-03-2024", "fecha_devolucion": "15-03-2024" if i % 3 else None}
+        for i in range(filas)
+    )
+
+
+def limpiar(base: int):
+    with conexion.get_connection() as connection:
+        with connection.cursor() as cursor:
+            for tabla in ("PRESTAMOS", "LIBROS", "USUARIOS"):
+                cursor.execute(f"DELETE FROM {tabla} WHERE id >= :base", {"base": base})
+        connection.commit()
+
+
+def ejecutar(base: int, filas: int, operaciones: int, lecturas_completas: int) -> dict:
+    azar = random.Random(42)
+    existentes = [(base + azar.randrange(filas),) for _ in range(operaciones)]
+    nuevos = range(base + filas, base + filas + operaciones)
+    resultados = {}
+
+    resultados["usuarios.insertar"] = medir(
+        lambda id: crud.create_usuario(f"Nuevo {id}", f"N{id}", f"n{id}@bench.cl", "docente", id=id),
+        [(id,) for id in nuevos],
+    )
+    resultados["libros.insertar"] = medir(
+        lambda id: crud.create_libro(f"Nuevo {id}", "Autor", 2024, id=id),
+        [(id,) for id in nuevos],
+    )
+    resultados["prestamos.insertar"] = medir(
+        lambda id: crud.create_prestamo(id, id, "01-04-2024", None, id=id),
+        [(id,) for id in nuevos],
+    )
+
+    resultados["usuarios.leer_por_id"] = medir(crud.read_usuario_by_id, existentes)
+    resultados["libros.leer_por_id"] = medir(crud.read_libro_by_id, existentes)
+    resultados["prestamos.leer_por_id"] = medir(crud.read_prestamo_by_id, existentes)
+
+    resultados["usuarios.actualizar"] = medir(
+        lambda id: crud.update_usuario(id, correo=f"x{id}@bench.cl"), existentes
+    )
+    resultados["libros.actualizar"] = medir(
+        lambda id: crud.update_libro(id, anio_publicacion=2000), existentes
+    )
+    resultados["prestamos.actualizar"] = medir(
+        lambda id: crud.update_prestamo(id, fecha_devolucion="20-03-2024"), existentes
+    )
+
+    for tabla, iterador in (
+        ("usuarios", crud.iter_usuarios),
+        ("libros", crud.iter_libros),
+        ("prestamos", crud.iter_prestamos),
+    ):
+        resultados[f"{tabla}.leer_todo"] = medir(
+            lambda: sum(1 for _ in iterador(desde_id=base - 1)), [()] * lecturas_completas
+        )
+
+    # Se borran las filas insertadas, hijas primero por las FK
+    resultados["prestamos.borrar"] = medir(crud.delete_prestamo, [(id,) for id in nuevos])
+    resultados["libros.borrar"] = medir(crud.delete_libro, [(id,) for id in nuevos])
+    resultados["usuarios.borrar"] = medir(crud.delete_usuario, [(id,) for id in nuevos])
+    return resultados
+
+
+def comparar(actual: dict, anterior: dict):
+    print(f"\n{'escenario':<24}{'anterior':>12}{'actual':>12}{'cambio':>10}")
+    for escenario, datos in actual["resultados"].items():
+        previo = anterior.get("resultados", {}).get(escenario)
+        if not previo:
+            continue
+        cambio = datos["ops_por_seg"] / previo["ops_por_seg"] - 1
+        print(f"{escenario:<24}{previo['ops_por_seg']:>12.1f}{datos['ops_por_seg']:>12.1f}{cambio:>+10.1%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del CRUD de la biblioteca")
+    parser.add_argument("--standin", action="store_true", help="usar el driver sqlite en proceso")
+    parser.add_argument("--standin-archivo", default=":memory:")
+    parser.add_argument("--dsn", help="DSN de Oracle (por defecto ORACLE_DSN)")
+    parser.add_argument("--filas", type=int, default=1000, help="filas por tabla (1000, 100000, 1000000...)")
+    parser.add_argument("--operaciones", type=int, default=1000, help="operaciones por escenario")
+    parser.add_argument("--lecturas-completas", type=int, default=3)
+    parser.add_argument("--id-base", type=int, default=1_000_000_000)
+    parser.add_argument("--salida", default="benchmark.json")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    args = parser.parse_args(argv)
+
+    if args.standin:
+        import standin
+        conexion.usar_pool(standin.crear_pool(args.standin_archivo))
+        driver = "standin-sqlite"
+    else:
+        if args.dsn:
+            conexion.dsn = args.dsn
+        driver = "oracle"
+
+    print(f"Cargando {args.filas} filas por tabla ({driver})...", file=sys.stderr)
+    limpiar(args.id_base)
+    cargar_datos(args.id_base, args.filas)
+    try:
+        resultados = ejecutar(args.id_base, args.filas, args.operaciones, args.lecturas_completas)
+    finally:
+        limpiar(args.id_base)
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "driver": driver,
+        "dsn": None if args.standin else conexion.dsn,
+        "python": platform.python_version(),
+        "filas": args.filas,
+        "operaciones": args.operaciones,
+        "resultados": resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2)
+
+    for escenario, datos in resultados.items():
+        print(f"{escenario:<24}{datos['ops_por_seg']:>10.1f} ops/s  "
+              f"p50={datos['p50_ms']:.3f}  p95={datos['p95_ms']:.3f}  p99={datos['p99_ms']:.3f} ms")
+    print(f"Resultados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            comparar(informe, json.load(archivo))
+
+
+if __name__ == "__main__":
+    main()
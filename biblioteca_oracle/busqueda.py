@@ -0,0 +1,158 @@
+"""Búsqueda por título y autor con un índice invertido de trigramas en memoria.
+
+Cada libro se indexa por los trigramas de "título\\nautor" normalizado (sin
+mayúsculas ni tildes). Una búsqueda sólo revisa los libros que comparten los
+trigramas menos frecuentes de la consulta: con hasta k errores de tipeo se
+pierden a lo más 3k trigramas, así que todo resultado válido aparece en al
+menos una de las 3k + 1 listas más cortas. Nunca se recorre el catálogo.
+
+Orden de los resultados: campo que empieza con la consulta, palabra que
+empieza con la consulta, subcadena y por último coincidencia aproximada
+(proporción de trigramas compartidos).
+
+Al modificar un libro sus trigramas antiguos quedan en las listas hasta la
+próxima compactación; no afectan los resultados porque cada candidato se
+verifica contra el texto vigente.
+"""
+import threading
+import unicodedata
+from array import array
+from dataclasses import replace
+from typing import Iterable
+
+from modelos import Libro
+
+
+def normalizar(texto) -> str:
+    texto = unicodedata.normalize("NFKD", str(texto or "").lower())
+    return " ".join("".join(c for c in texto if not unicodedata.combining(c)).split())
+
+
+def trigramas(texto: str) -> set:
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def _texto(libro: Libro) -> str:
+    # Espacios en los bordes para que el inicio y fin de cada campo tengan trigramas
+    return f" {normalizar(libro.titulo)} \n {normalizar(libro.autor)} "
+
+
+class IndiceTrigramas:
+    def __init__(self):
+        self._libros: dict[int, Libro] = {}
+        self._textos: dict[int, str] = {}
+        self._listas: dict[str, array] = {}
+        self._obsoletas = 0
+        self._total = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._libros)
+
+    def _indexar(self, libro: Libro):
+        texto = self._textos[libro.id] = _texto(libro)
+        for trigrama in trigramas(texto):
+            lista = self._listas.get(trigrama)
+            if lista is None:
+                lista = self._listas[trigrama] = array("q")
+            lista.append(libro.id)
+            self._total += 1
+
+    def agregar(self, libros: Iterable[Libro]):
+        with self._lock:
+            for libro in libros:
+                anterior = self._textos.get(libro.id)
+                if anterior is not None:
+                    if anterior == _texto(libro):
+                        self._libros[libro.id] = libro
+                        continue
+                    self._obsoletas += len(trigramas(anterior))
+                self._libros[libro.id] = libro
+                self._indexar(libro)
+            self._compactar_si_conviene()
+
+    def actualizar(self, id: int, cambios: dict):
+        """Aplica cambios parciales (None = sin cambio) a un libro ya indexado."""
+        with self._lock:
+            libro = self._libros.get(id)
+            if libro is None:
+                return
+            cambios = {k: v for k, v in cambios.items() if v is not None}
+            self.agregar([replace(libro, **cambios)])
+
+    def quitar(self, ids: Iterable[int]):
+        with self._lock:
+            for id in ids:
+                self._libros.pop(id, None)
+                texto = self._textos.pop(id, None)
+                if texto is not None:
+                    self._obsoletas += len(trigramas(texto))
+            self._compactar_si_conviene()
+
+    def _compactar_si_conviene(self):
+        if self._obsoletas > self._total // 2:
+            self.compactar()
+
+    def compactar(self):
+        """Reconstruye las listas sin las entradas de libros modificados o borrados."""
+        with self._lock:
+            self._listas = {}
+            self._obsoletas = self._total = 0
+            for libro in self._libros.values():
+                self._indexar(libro)
+
+    def _puntaje_exacto(self, q: str, texto: str) -> float:
+        if any(campo.startswith(f" {q}") for campo in texto.split("\n")):
+            return 4.0
+        return 3.0 if f" {q}" in texto else 2.0
+
+    def buscar(self, consulta: str, limite: int = 20, errores: int = 1) -> list:
+        """Retorna [(puntaje, Libro)] de mayor a menor puntaje.
+
+        Primero se buscan coincidencias exactas (subcadena); sólo si no
+        completan `limite` se buscan las aproximadas, con hasta `errores`
+        errores de tipeo. En consultas cortas se toleran menos errores,
+        porque pocos trigramas no alcanzan para distinguir.
+        """
+        q = normalizar(consulta)
+        if len(q) < 2:
+            return []
+        q_trigramas = {f" {q}"} if len(q) == 2 else trigramas(q)
+
+        with self._lock:
+            listas = sorted((self._listas.get(t, ()) for t in q_trigramas), key=len)
+            # Toda subcadena exacta contiene todos los trigramas: basta revisar la lista más corta
+            exactos = {
+                id for id in listas[0]
+                if q in self._textos.get(id, "")
+            }
+            resultados = [
+                (self._puntaje_exacto(q, self._textos[id]), self._libros[id]) for id in exactos
+            ]
+
+            errores = max(0, min(errores, (len(q_trigramas) - 1) // 3))
+            if errores and len(resultados) < limite:
+                minimo = len(q_trigramas) - 3 * errores
+                candidatos = set()
+                for lista in listas[: 3 * errores + 1]:
+                    candidatos.update(lista)
+                candidatos -= exactos
+                for id in candidatos:
+                    texto = self._textos.get(id)
+                    if texto is None:
+                        continue
+                    comunes = sum(t in texto for t in q_trigramas)
+                    if comunes >= minimo:
+                        resultados.append((comunes / len(q_trigramas), self._libros[id]))
+
+        resultados.sort(key=lambda r: (-r[0], len(r[1].titulo or ""), r[1].id))
+        return resultados[:limite]
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {
+                "libros": len(self._libros),
+                "trigramas": len(self._listas),
+                "entradas": self._total,
+                "obsoletas": self._obsoletas,
+            }
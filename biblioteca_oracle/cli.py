@@ -0,0 +1,283 @@
+"""Modo no interactivo de crud_biblioteca: subcomandos y lotes JSON-lines.
+
+Cada resultado se escribe como una línea JSON en stdout; los mensajes que
+imprimen las funciones CRUD se descartan (o van a stderr con --verbose).
+
+Ejemplos:
+    python crud_biblioteca.py libros create --titulo "Rayuela" --autor "Cortázar" --anio_publicacion 1963
+    python crud_biblioteca.py libros get 10
+    python crud_biblioteca.py libros search "cortazar"
+    python crud_biblioteca.py prestamos list --since 01-01-2026
+    python crud_biblioteca.py prestamos update 7 --fecha_devolucion 15-03-2026
+    python crud_biblioteca.py batch --lote 500 < operaciones.jsonl
+
+Formato de cada línea del modo batch (fechas en DD-MM-YYYY):
+    {"op": "create", "tabla": "libros", "datos": {"titulo": "...", "autor": "...", "anio_publicacion": 1963}}
+    {"op": "update", "tabla": "prestamos", "id": 7, "datos": {"fecha_devolucion": "15-03-2026"}}
+    {"op": "delete", "tabla": "usuarios", "id": 3}
+    {"op": "get", "tabla": "libros", "id": 10}
+
+Las operaciones se agrupan en transacciones de --lote líneas sobre una sola
+conexión del pool. Si una falla, ese lote se revierte y se reintenta línea
+por línea, así cada resultado refleja lo que quedó confirmado.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+from dataclasses import asdict
+from datetime import date
+from itertools import islice
+
+import oracledb
+
+import crud_biblioteca as crud
+from conexion import transaction
+
+TABLAS = {"usuarios": "USUARIOS", "libros": "LIBROS", "prestamos": "PRESTAMOS"}
+
+CREAR = {
+    "usuarios": crud.create_usuario,
+    "libros": crud.create_libro,
+    "prestamos": crud.create_prestamo,
+}
+LEER = {
+    "usuarios": crud.read_usuario_by_id,
+    "libros": crud.read_libro_by_id,
+    "prestamos": crud.read_prestamo_by_id,
+}
+MODIFICAR = {
+    "usuarios": crud.update_usuario,
+    "libros": crud.update_libro,
+    "prestamos": crud.update_prestamo,
+}
+ELIMINAR = {
+    "usuarios": crud.delete_usuario,
+    "libros": crud.delete_libro,
+    "prestamos": crud.delete_prestamo,
+}
+ITERAR = {
+    "usuarios": crud.iter_usuarios,
+    "libros": crud.iter_libros,
+    "prestamos": crud.iter_prestamos,
+}
+
+# Columnas numéricas, para el tipo de los argumentos de los subcomandos
+ENTEROS = {"anio_publicacion", "idUsuario", "idLibro"}
+
+# Errores que se informan como resultado de una operación en vez de abortar;
+# TransaccionFallida es un DatabaseError
+ERRORES_OPERACION = (oracledb.DatabaseError, KeyError, TypeError, ValueError)
+
+
+class OperacionFallida(ValueError):
+    """La función CRUD informó el error por pantalla y no retornó resultado."""
+
+
+def _json(valor) -> str:
+    def convertir(v):
+        if isinstance(v, date):
+            return v.isoformat()
+        if hasattr(v, "__dataclass_fields__"):
+            return asdict(v)
+        return str(v)
+
+    return json.dumps(valor, default=convertir, ensure_ascii=False)
+
+
+def ejecutar(operacion: dict) -> dict:
+    """Ejecuta una operación {"op", "tabla", "id", "datos"}; retorna su resultado."""
+    op = operacion["op"]
+    tabla = operacion["tabla"]
+    if tabla not in TABLAS:
+        raise ValueError(f"Tabla desconocida: {tabla}")
+    datos = operacion.get("datos") or {}
+
+    if op == "create":
+        id = CREAR[tabla](**datos)
+        if id is None:
+            raise OperacionFallida(f"No se pudo insertar en {tabla}")
+        return {"id": id}
+    if op == "get":
+        return {"fila": LEER[tabla](int(operacion["id"]))}
+    if op == "update":
+        filas = MODIFICAR[tabla](int(operacion["id"]), **datos)
+        if filas is None:
+            raise OperacionFallida("No se enviaron datos por modificar")
+        return {"filas": filas}
+    if op == "delete":
+        filas = ELIMINAR[tabla](int(operacion["id"]))
+        if filas is None:
+            raise OperacionFallida(f"No se pudo eliminar de {tabla}")
+        return {"filas": filas}
+    raise ValueError(f"Operación desconocida: {op}")
+
+
+def _en_transaccion(lote: list) -> list:
+    with transaction() as tx:
+        resultados = []
+        for linea, operacion in lote:
+            # Las funciones CRUD capturan e imprimen sus errores; la
+            # transacción los anota y así se informa el error de Oracle
+            try:
+                resultado = ejecutar(operacion)
+            except OperacionFallida:
+                if tx.error is not None:
+                    raise tx.error
+                raise
+            if tx.error is not None:
+                raise tx.error
+            resultados.append({"linea": linea, "ok": True, **resultado})
+    return resultados
+
+
+def _ejecutar_lote(lote: list) -> list:
+    """Ejecuta [(línea, operación)] en una transacción; si falla, de a una."""
+    try:
+        return _en_transaccion(lote)
+    except ERRORES_OPERACION as error:
+        if len(lote) == 1:
+            return [{"linea": lote[0][0], "ok": False, "error": str(error)}]
+    return [resultado for item in lote for resultado in _ejecutar_lote([item])]
+
+
+def batch(entrada, salida, lote: int = 500) -> int:
+    """Lee operaciones JSON-lines de `entrada` y escribe un resultado por línea.
+
+    Retorna la cantidad de líneas con error.
+    """
+    errores = 0
+    pendientes = []
+
+    def procesar():
+        nonlocal errores
+        for resultado in _ejecutar_lote(pendientes):
+            errores += not resultado["ok"]
+            print(_json(resultado), file=salida)
+        salida.flush()
+        pendientes.clear()
+
+    for linea, texto in enumerate(entrada, start=1):
+        if not texto.strip():
+            continue
+        try:
+            operacion = json.loads(texto)
+        except json.JSONDecodeError as error:
+            # Primero los resultados de las líneas anteriores, para no desordenar la salida
+            if pendientes:
+                procesar()
+            errores += 1
+            print(_json({"linea": linea, "ok": False, "error": f"JSON inválido: {error}"}), file=salida)
+            continue
+        pendientes.append((linea, operacion))
+        if len(pendientes) >= lote:
+            procesar()
+    if pendientes:
+        procesar()
+    return errores
+
+
+# ---------------------------------------------------------------------------
+# Subcomandos
+# ---------------------------------------------------------------------------
+
+def _agregar_columnas(parser, tabla: str):
+    for columna in crud.COLUMNAS_EDITABLES[TABLAS[tabla]]:
+        parser.add_argument(f"--{columna}", type=int if columna in ENTEROS else str)
+
+
+def _datos(args, tabla: str) -> dict:
+    return {
+        columna: getattr(args, columna)
+        for columna in crud.COLUMNAS_EDITABLES[TABLAS[tabla]]
+        if getattr(args, columna) is not None
+    }
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="crud_biblioteca.py",
+        description="CRUD de la biblioteca sin menús; los resultados salen en JSON-lines",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="mostrar en stderr los mensajes de las funciones CRUD")
+    subparsers = parser.add_subparsers(dest="tabla", required=True)
+
+    for tabla in TABLAS:
+        parser_tabla = subparsers.add_parser(tabla, help=f"operaciones sobre {TABLAS[tabla]}")
+        acciones = parser_tabla.add_subparsers(dest="accion", required=True)
+
+        crear = acciones.add_parser("create", help="insertar un registro")
+        crear.add_argument("--id", type=int, help="id (por defecto lo asigna la secuencia)")
+        _agregar_columnas(crear, tabla)
+
+        acciones.add_parser("get", help="leer un registro por id").add_argument("id", type=int)
+
+        modificar = acciones.add_parser("update", help="modificar columnas de un registro")
+        modificar.add_argument("id", type=int)
+        _agregar_columnas(modificar, tabla)
+
+        acciones.add_parser("delete", help="eliminar un registro").add_argument("id", type=int)
+
+        listar = acciones.add_parser("list", help="listar registros por id")
+        listar.add_argument("--desde-id", type=int, default=0)
+        listar.add_argument("--limite", type=int)
+        if tabla == "prestamos":
+            listar.add_argument("--since", help="sólo préstamos desde esta fecha (DD-MM-YYYY)")
+
+        if tabla == "libros":
+            buscar = acciones.add_parser("search", help="buscar por título o autor")
+            buscar.add_argument("consulta")
+            buscar.add_argument("--limite", type=int, default=20)
+
+    lotes = subparsers.add_parser("batch", help="operaciones JSON-lines desde stdin")
+    lotes.add_argument("--lote", type=int, default=500, help="operaciones por transacción")
+    return parser
+
+
+def _listar(args, salida):
+    opciones = {"desde_id": args.desde_id, "batch_size": 1000}
+    if getattr(args, "since", None):
+        opciones["donde"] = "fecha_prestamo >= :desde"
+        opciones["parametros"] = {"desde": crud._parse_fecha(args.since)}
+    for fila in islice(ITERAR[args.tabla](**opciones), args.limite):
+        print(_json(fila), file=salida)
+
+
+def main(argv=None) -> int:
+    args = crear_parser().parse_args(argv)
+    salida = sys.stdout
+
+    with contextlib.ExitStack() as pila:
+        # Los print de las funciones CRUD no deben mezclarse con el JSON de salida
+        if args.verbose:
+            pila.enter_context(contextlib.redirect_stdout(sys.stderr))
+        else:
+            pila.enter_context(contextlib.redirect_stdout(pila.enter_context(open(os.devnull, "w"))))
+
+        if args.tabla == "batch":
+            return 1 if batch(sys.stdin, salida, args.lote) else 0
+
+        try:
+            if args.accion == "list":
+                _listar(args, salida)
+                return 0
+            if args.accion == "search":
+                for puntaje, libro in crud.buscar_libros(args.consulta, args.limite):
+                    print(_json({"puntaje": round(puntaje, 3), "fila": libro}), file=salida)
+                return 0
+
+            operacion = {"op": args.accion, "tabla": args.tabla}
+            if args.accion in ("get", "update", "delete"):
+                operacion["id"] = args.id
+            if args.accion in ("create", "update"):
+                operacion["datos"] = _datos(args, args.tabla)
+                if args.accion == "create" and args.id is not None:
+                    operacion["datos"]["id"] = args.id
+            resultado = _ejecutar_lote([(1, operacion)])[0]
+        except oracledb.DatabaseError as error:
+            resultado = {"ok": False, "error": str(error)}
+        resultado.pop("linea", None)
+        print(_json(resultado), file=salida)
+        return 0 if resultado["ok"] else 1
@@ -1,21 +1,222 @@
+import atexit
 import oracledb
 import os
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dotenv import load_dotenv
 
+# Raíz del repositorio, para el paquete compartido (ver compartido/__init__.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from compartido import instrumentacion
+
 load_dotenv()
 
 username = os.getenv("ORACLE_USER")
 dsn = os.getenv("ORACLE_DSN")
 password = os.getenv("ORACLE_PASSWORD")
 
-with oracledb.connect(
-        user=username,
-        password=password,
-        dsn=dsn
-) as connection:
+# Parámetros del pool (opcionales en el .env)
+pool_min = int(os.getenv("ORACLE_POOL_MIN", "1"))
+pool_max = int(os.getenv("ORACLE_POOL_MAX", "4"))
+pool_increment = int(os.getenv("ORACLE_POOL_INCREMENT", "1"))
+pool_ping_interval = int(os.getenv("ORACLE_POOL_PING_INTERVAL", "60"))
+pool_timeout = int(os.getenv("ORACLE_POOL_TIMEOUT", "10"))
+
+_pool = None
+_transaccion = ContextVar("transaccion", default=None)
+# SID de cada sesión que abrió el pool de este proceso (ver sesiones_propias)
+_sids = set()
+
+
+def _registrar_sesion(connection, tag_pedido):
+    # session_callback: corre una vez por sesión nueva del pool
     with connection.cursor() as cursor:
-        sql = "select sysdate from dual"
-        for row in cursor.execute(sql):
-            for column in row:
-                print(column)
+        cursor.execute("SELECT SYS_CONTEXT('USERENV', 'SID') FROM dual")
+        _sids.add(int(cursor.fetchone()[0]))
+
+
+def sesiones_propias() -> set:
+    """SID de las sesiones abiertas por el pool de este proceso."""
+    return set(_sids)
+
+
+def get_pool():
+    """Retorna el pool de conexiones del proceso, creándolo la primera vez."""
+    global _pool
+    if _pool is None:
+        _pool = oracledb.create_pool(
+            user=username,
+            password=password,
+            dsn=dsn,
+            min=pool_min,
+            max=pool_max,
+            increment=pool_increment,
+            ping_interval=pool_ping_interval,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=pool_timeout * 1000,
+            session_callback=_registrar_sesion,
+        )
+    return _pool
+
+
+def usar_pool(pool):
+    """Reemplaza el pool del proceso (por ejemplo por standin.crear_pool())."""
+    global _pool
+    close_pool()
+    _pool = pool
+
+
+def get_connection():
+    """Retorna una conexión del pool; al cerrarla vuelve al pool.
+
+    Dentro de un bloque transaction() retorna la conexión de ese bloque.
+    """
+    actual = _transaccion.get()
+    if actual is not None:
+        return actual
+    return instrumentacion.adquirir(get_pool().acquire)
+
+
+class TransaccionFallida(oracledb.DatabaseError):
+    """Una sentencia falló dentro de transaction() y se hizo rollback."""
+
+
+class _CursorTransaccion:
+    """Cursor que marca la transacción como fallida si una sentencia falla.
+
+    Las funciones CRUD capturan e imprimen sus errores; sin esta marca el
+    bloque terminaría con commit de un trabajo incompleto.
+    """
+
+    def __init__(self, cursor, transaccion):
+        self._cursor = cursor
+        self._transaccion = transaccion
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def __setattr__(self, nombre, valor):
+        if nombre.startswith("_"):
+            object.__setattr__(self, nombre, valor)
+        else:
+            setattr(self._cursor, nombre, valor)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+    def _vigilar(self, metodo, *args, **kwargs):
+        try:
+            resultado = metodo(*args, **kwargs)
+        except oracledb.DatabaseError as error:
+            self._transaccion.error = error
+            raise
+        return self if resultado is self._cursor else resultado
+
+    def execute(self, *args, **kwargs):
+        return self._vigilar(self._cursor.execute, *args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self._vigilar(self._cursor.executemany, *args, **kwargs)
+
+
+class Transaccion:
+    """Conexión compartida por todas las llamadas CRUD dentro de transaction().
+
+    Se usa igual que una conexión, pero salir de su `with` no la devuelve
+    al pool y commit() no hace nada: el commit ocurre al cerrar el bloque.
+    `tras_commit` guarda lo que debe ejecutarse sólo si ese commit ocurre
+    (ver despues_del_commit).
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.error = None
+        self.tras_commit = []
+
+    def __getattr__(self, nombre):
+        return getattr(self.connection, nombre)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def cursor(self, *args, **kwargs):
+        return _CursorTransaccion(self.connection.cursor(*args, **kwargs), self)
+
+    def commit(self):
+        pass
+
+
+@contextmanager
+def transaction():
+    """Agrupa varias llamadas CRUD en una sola conexión y un solo commit.
+
+        with transaction():
+            id_usuario = create_usuario(...)
+            id_libro = create_libro(...)
+            create_prestamo(id_usuario, id_libro, ...)
+
+    Si algo falla dentro del bloque se hace rollback de todo. Un
+    transaction() anidado se une al bloque exterior.
+    """
+    actual = _transaccion.get()
+    if actual is not None:
+        yield actual
+        return
+
+    with instrumentacion.adquirir(get_pool().acquire) as connection:
+        tx = Transaccion(connection)
+        token = _transaccion.set(tx)
+        try:
+            yield tx
+            if tx.error is not None:
+                raise TransaccionFallida(f"Transacción revertida: {tx.error}")
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            _transaccion.reset(token)
+    for funcion in tx.tras_commit:
+        funcion()
+
+
+def despues_del_commit(funcion):
+    """Ejecuta `funcion` cuando el trabajo en curso queda confirmado.
+
+    Dentro de transaction() se difiere hasta el commit del bloque y se
+    descarta si hay rollback; fuera de él se ejecuta de inmediato, porque
+    las funciones CRUD ya hicieron commit.
+    """
+    actual = _transaccion.get()
+    if actual is None:
+        funcion()
+    else:
+        actual.tras_commit.append(funcion)
+
+
+@atexit.register
+def close_pool():
+    """Cierra el pool y todas sus conexiones."""
+    global _pool
+    if _pool is not None:
+        _pool.close(force=True)
+        _pool = None
+
 
+if __name__ == "__main__":
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            sql = "select sysdate from dual"
+            for row in cursor.execute(sql):
+                for column in row:
+                    print(column)
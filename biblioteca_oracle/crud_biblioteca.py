@@ -1,20 +1,31 @@
+from collections import deque
 from datetime import datetime
+from itertools import islice
+import logging
 import oracledb
 import os
-from dotenv import load_dotenv
-from typing import Optional
-
-# Cargar variables de entorno (.env)
-load_dotenv()
-
-username = os.getenv("ORACLE_USER")
-dsn = os.getenv("ORACLE_DSN")
-password = os.getenv("ORACLE_PASSWORD")
-
-
-def get_connection():
-    """Retorna una conexión a la base de datos Oracle."""
-    return oracledb.connect(user=username, password=password, dsn=dsn)
+import sys
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+# Las conexiones salen del pool del proceso (ver conexion.py)
+from conexion import (
+    TransaccionFallida,
+    despues_del_commit,
+    get_connection,
+    sesiones_propias,
+    transaction,
+)
+import archivado
+from busqueda import IndiceTrigramas
+from compartido import instrumentacion
+from migraciones import migrar
+from modelos import MODELOS, Libro, Prestamo, Usuario, columnas
+from replica import Replica
+import reportes
+
+logger = logging.getLogger(__name__)
 
 
 # ---------------------------------------------------------------------------
@@ -32,8 +43,27 @@ def create_schema(query: str):
         print(f"No se pudo crear la tabla: {error}")
 
 
-def create_all_tables():
-    """Crea todas las tablas del sistema de biblioteca."""
+# Partición inicial de PRESTAMOS particionada; INTERVAL crea una partición
+# por mes a medida que llegan préstamos posteriores a esta fecha. ROW MOVEMENT
+# deja que update_prestamo cambie fecha_prestamo a otro mes (sin él, ORA-14402)
+PRESTAMOS_PARTICIONES = (
+    "PARTITION BY RANGE (fecha_prestamo) "
+    "INTERVAL (NUMTOYMINTERVAL(1, 'MONTH')) "
+    "(PARTITION PRESTAMOS_P0 VALUES LESS THAN (DATE '2000-01-01')) "
+    "ENABLE ROW MOVEMENT"
+)
+
+
+def create_all_tables(particionada: Optional[bool] = None):
+    """Crea todas las tablas del sistema de biblioteca.
+
+    Con particionada=True (o PRESTAMOS_PARTICIONADA=1) PRESTAMOS se crea
+    particionada por mes según fecha_prestamo, que pasa a ser obligatoria.
+    Las consultas que filtran por fecha_prestamo sólo leen los meses
+    pedidos, y archivado.py puede vaciar los meses antiguos.
+    """
+    if particionada is None:
+        particionada = os.getenv("PRESTAMOS_PARTICIONADA", "0") == "1"
     tables = [
         # Tabla USUARIOS
         (
@@ -60,32 +90,491 @@ def create_all_tables():
             "id INTEGER PRIMARY KEY,"
             "idUsuario INTEGER NOT NULL,"
             "idLibro INTEGER NOT NULL,"
-            "fecha_prestamo DATE,"
-            "fecha_devolucion DATE,"
+            + ("fecha_prestamo DATE NOT NULL," if particionada else "fecha_prestamo DATE,")
+            + "fecha_devolucion DATE,"
             "FOREIGN KEY (idUsuario) REFERENCES USUARIOS(id),"
             "FOREIGN KEY (idLibro) REFERENCES LIBROS(id)"
             ")"
+            + (f" {PRESTAMOS_PARTICIONES}" if particionada else "")
         ),
     ]
 
     for query in tables:
         create_schema(query)
 
+    create_sequences()
+    migrar()
+
+
+# Secuencias que alimentan los id; se crean partiendo desde MAX(id) + 1 para
+# no chocar con filas existentes y quedan como DEFAULT ON NULL de la columna.
+SECUENCIAS = {
+    "USUARIOS": "USUARIOS_SEQ",
+    "LIBROS": "LIBROS_SEQ",
+    "PRESTAMOS": "PRESTAMOS_SEQ",
+}
+
+
+def create_sequences():
+    """Crea (si faltan) las secuencias de id y las asigna como valor por defecto."""
+    plsql = """
+        DECLARE
+            v_existe NUMBER;
+            v_inicio NUMBER;
+        BEGIN
+            SELECT COUNT(*) INTO v_existe
+              FROM user_sequences WHERE sequence_name = :secuencia;
+            IF v_existe = 0 THEN
+                EXECUTE IMMEDIATE 'SELECT NVL(MAX(id), 0) + 1 FROM ' || :tabla
+                    INTO v_inicio;
+                EXECUTE IMMEDIATE 'CREATE SEQUENCE ' || :secuencia
+                    || ' START WITH ' || v_inicio || ' CACHE 1000';
+            END IF;
+            EXECUTE IMMEDIATE 'ALTER TABLE ' || :tabla
+                || ' MODIFY id DEFAULT ON NULL ' || :secuencia || '.NEXTVAL';
+        END;
+    """
+    try:
+        with get_connection() as connection:
+            with connection.cursor() as cursor:
+                for tabla, secuencia in SECUENCIAS.items():
+                    cursor.execute(plsql, {"tabla": tabla, "secuencia": secuencia})
+                    print(f"Secuencia {secuencia} asignada a {tabla}.id")
+    except oracledb.DatabaseError as error:
+        print(f"No se pudieron crear las secuencias: {error}")
+
+
+class ReservaIds:
+    """Entrega ids de una secuencia reservándolos por bloques.
+
+    Un solo SELECT trae `bloque` valores de NEXTVAL, así una carga masiva no
+    paga un viaje a la base de datos por cada id nuevo.
+    """
+
+    def __init__(self, secuencia: str, bloque: int = 1000):
+        self.secuencia = secuencia
+        self.bloque = bloque
+        self._libres = deque()
+        self._lock = threading.Lock()
+
+    def siguientes(self, cursor, n: int) -> list:
+        with self._lock:
+            faltan = n - len(self._libres)
+            if faltan > 0:
+                cursor.execute(
+                    f"SELECT {self.secuencia}.NEXTVAL FROM dual "
+                    "CONNECT BY LEVEL <= :n",
+                    {"n": max(faltan, self.bloque)},
+                )
+                self._libres.extend(fila[0] for fila in cursor.fetchall())
+            return [self._libres.popleft() for _ in range(n)]
+
+
+RESERVAS = {tabla: ReservaIds(secuencia) for tabla, secuencia in SECUENCIAS.items()}
+
+
+# ---------------------------------------------------------------------------
+# LECTURA POR LOTES
+# ---------------------------------------------------------------------------
+
+def _iter_lotes(
+    tabla: str,
+    batch_size: int = 500,
+    desde_id: int = 0,
+    arraysize: Optional[int] = None,
+    prefetchrows: Optional[int] = None,
+    donde: str = "",
+    parametros: Optional[dict] = None,
+):
+    """Recorre una tabla en lotes de hasta batch_size registros, ordenados por id.
+
+    Usa paginación por llave (id > último id leído) en vez de OFFSET, así
+    cada página cuesta lo mismo sin importar cuán avanzada esté la lectura.
+    Por defecto arraysize y prefetchrows cubren una página completa, de modo
+    que cada lote es un único viaje a la base de datos. `donde` agrega una
+    condición SQL con sus binds en `parametros`, p. ej.
+    donde="fecha_prestamo >= :desde", parametros={"desde": fecha}.
+    """
+    modelo = MODELOS[tabla]
+    sql = (
+        f"SELECT {columnas(modelo)} FROM {tabla} WHERE id > :ultimo "
+        + (f"AND ({donde}) " if donde else "")
+        + "ORDER BY id FETCH FIRST :n ROWS ONLY"
+    )
+    ultimo = desde_id
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.arraysize = arraysize or batch_size
+            cursor.prefetchrows = prefetchrows or batch_size + 1
+            while True:
+                cursor.execute(sql, {**(parametros or {}), "ultimo": ultimo, "n": batch_size})
+                cursor.rowfactory = modelo
+                lote = cursor.fetchall()
+                if not lote:
+                    return
+                yield lote
+                if len(lote) < batch_size:
+                    return
+                ultimo = lote[-1].id
+
+
+def _iter_filas(tabla: str, **opciones):
+    for lote in _iter_lotes(tabla, **opciones):
+        yield from lote
+
+
+def iter_usuarios_lotes(**opciones):
+    """Genera listas de Usuario (ver _iter_lotes para las opciones)."""
+    return _iter_lotes("USUARIOS", **opciones)
+
+
+def iter_usuarios(**opciones):
+    """Genera los Usuario de USUARIOS uno a uno, con memoria acotada."""
+    return _iter_filas("USUARIOS", **opciones)
+
+
+def iter_libros_lotes(**opciones):
+    """Genera listas de Libro (ver _iter_lotes para las opciones)."""
+    return _iter_lotes("LIBROS", **opciones)
+
+
+def iter_libros(**opciones):
+    """Genera los Libro de LIBROS uno a uno, con memoria acotada."""
+    return _iter_filas("LIBROS", **opciones)
+
+
+def iter_prestamos_lotes(**opciones):
+    """Genera listas de Prestamo (ver _iter_lotes para las opciones)."""
+    return _iter_lotes("PRESTAMOS", **opciones)
+
+
+def iter_prestamos(**opciones):
+    """Genera los Prestamo de PRESTAMOS uno a uno, con memoria acotada."""
+    return _iter_filas("PRESTAMOS", **opciones)
+
+
+# ---------------------------------------------------------------------------
+# RÉPLICA LOCAL DEL CATÁLOGO
+# ---------------------------------------------------------------------------
+
+# Si está activa, read_usuario_by_id y read_libro_by_id leen de la réplica
+# (ver replica.py); las escrituras van a Oracle e invalidan los id tocados.
+# Los listados completos van siempre a Oracle: en la réplica faltarían los
+# id invalidados y los creados desde la última sincronización.
+_replica: Optional[Replica] = None
+
+
+def activar_replica(ruta: str = ":memory:", intervalo: float = 30) -> Replica:
+    """Crea la réplica de USUARIOS y LIBROS, la carga y la mantiene al día."""
+    global _replica
+    desactivar_replica()
+    replica = Replica(ruta)
+    replica.sincronizar(reconciliar=True)
+    replica.iniciar(intervalo)
+    _replica = replica
+    return replica
+
+
+def desactivar_replica():
+    global _replica
+    if _replica is not None:
+        _replica.close()
+        _replica = None
+
+
+def _leer_replica(tabla: str, id: int):
+    return _replica.obtener(tabla, id) if _replica is not None else None
+
+
+def _invalidar_replica(tabla: str, ids):
+    """Quita los id de la réplica ya, y otra vez tras el commit.
+
+    La segunda vez cubre una sincronización que haya leído la fila antigua
+    mientras la transacción seguía abierta.
+    """
+    replica = _replica
+    if replica is not None:
+        ids = [int(id) for id in ids]
+        replica.invalidar(tabla, ids)
+
+        def otra_vez():
+            if _replica is replica:
+                replica.invalidar(tabla, ids)
+
+        despues_del_commit(otra_vez)
+
+
+# ---------------------------------------------------------------------------
+# BÚSQUEDA DE LIBROS
+# ---------------------------------------------------------------------------
+
+# Índice de trigramas de título y autor (ver busqueda.py). Se carga completo
+# la primera vez que se busca y luego lo mantienen create/update/delete, sólo
+# después del commit (dentro de transaction(), al cerrar el bloque). Los
+# cambios de otros procesos (importar.py, el modo batch) llegan al recargarlo:
+# pasados INDICE_LIBROS_RECARGA segundos se reconstruye en un hilo de fondo
+# mientras las búsquedas siguen usando el anterior.
+INDICE_LIBROS_RECARGA = float(os.getenv("INDICE_LIBROS_RECARGA", "300"))
+
+_indice_libros: Optional[IndiceTrigramas] = None
+_indice_cargado = 0.0
+# Cambios propios confirmados durante una recarga, para repetirlos en el índice nuevo
+_indice_recarga: Optional[list] = None
+_indice_lock = threading.Lock()
+
+
+def _cargar_indice() -> IndiceTrigramas:
+    indice = IndiceTrigramas()
+    # Siempre desde Oracle: la réplica puede no tener los libros
+    # invalidados o aún no sincronizados
+    indice.agregar(iter_libros(batch_size=5000))
+    return indice
+
+
+def indice_libros() -> IndiceTrigramas:
+    """Retorna el índice de búsqueda, cargándolo desde LIBROS la primera vez."""
+    global _indice_libros, _indice_cargado
+    with _indice_lock:
+        if _indice_libros is None:
+            _indice_libros = _cargar_indice()
+            _indice_cargado = time.monotonic()
+        elif (
+            _indice_recarga is None
+            and time.monotonic() - _indice_cargado > INDICE_LIBROS_RECARGA
+        ):
+            threading.Thread(
+                target=recargar_indice_libros, name="indice-libros", daemon=True
+            ).start()
+        return _indice_libros
+
+
+def recargar_indice_libros():
+    """Reconstruye el índice desde LIBROS y lo reemplaza al terminar."""
+    global _indice_libros, _indice_cargado, _indice_recarga
+    with _indice_lock:
+        if _indice_recarga is not None:
+            return
+        _indice_recarga = []
+    try:
+        indice = _cargar_indice()
+    except oracledb.Error as error:
+        logger.warning("No se pudo recargar el índice de libros: %s", error)
+        indice = None
+    with _indice_lock:
+        if indice is not None:
+            for cambio in _indice_recarga:
+                cambio(indice)
+            _indice_libros = indice
+        _indice_cargado = time.monotonic()
+        _indice_recarga = None
+
+
+def _cambiar_indice(cambio: Callable[[IndiceTrigramas], None]):
+    """Aplica cambio(índice) tras el commit, también al índice que se esté recargando."""
+
+    def aplicar():
+        with _indice_lock:
+            if _indice_recarga is not None:
+                _indice_recarga.append(cambio)
+            if _indice_libros is not None:
+                cambio(_indice_libros)
+
+    despues_del_commit(aplicar)
+
+
+def _indexar_libros(libros):
+    libros = list(libros)
+    _cambiar_indice(lambda indice: indice.agregar(libros))
+
+
+def _actualizar_indice_libros(cambios: dict):
+    """cambios es {id: {columna: valor}}, como en bulk_update_libros."""
+
+    def actualizar(indice):
+        for id, campos in cambios.items():
+            indice.actualizar(int(id), campos)
+
+    _cambiar_indice(actualizar)
+
+
+def _desindexar_libros(ids):
+    ids = list(ids)
+    _cambiar_indice(lambda indice: indice.quitar(ids))
+
+
+def buscar_libros(consulta: str, limite: int = 20, errores: int = 1) -> list:
+    """Busca por subcadena, prefijo o con errores de tipeo en título y autor.
+
+    Retorna [(puntaje, Libro)] ordenado por relevancia (ver busqueda.py).
+    """
+    return indice_libros().buscar(consulta, limite, errores)
+
+
+# ---------------------------------------------------------------------------
+# ACTUALIZACIONES PARCIALES
+# ---------------------------------------------------------------------------
+
+def _parse_fecha(valor):
+    """Convierte 'DD-MM-YYYY' a datetime; deja pasar fechas y vacíos."""
+    if valor is None or isinstance(valor, datetime):
+        return valor
+    valor = str(valor).strip()
+    return datetime.strptime(valor, "%d-%m-%Y") if valor else None
+
+
+# Columnas modificables y la conversión que aplica cada create/update
+COLUMNAS_EDITABLES = {
+    "USUARIOS": {
+        "nombre": str,
+        "rut": str,
+        "correo": str,
+        "tipo_usuario": str.upper,
+    },
+    "LIBROS": {
+        "titulo": str,
+        "autor": str,
+        "anio_publicacion": int,
+    },
+    "PRESTAMOS": {
+        "idUsuario": int,
+        "idLibro": int,
+        "fecha_prestamo": _parse_fecha,
+        "fecha_devolucion": _parse_fecha,
+    },
+}
+
+# Tipo de bind de las columnas que no son texto: un None sin tipo se enviaría
+# como VARCHAR2 y NVL convertiría la columna a texto
+TIPOS_BIND = {
+    "USUARIOS": {},
+    "LIBROS": {"anio_publicacion": oracledb.DB_TYPE_NUMBER},
+    "PRESTAMOS": {
+        "idUsuario": oracledb.DB_TYPE_NUMBER,
+        "idLibro": oracledb.DB_TYPE_NUMBER,
+        "fecha_prestamo": oracledb.DB_TYPE_DATE,
+        "fecha_devolucion": oracledb.DB_TYPE_DATE,
+    },
+}
+
+# Un único UPDATE por tabla: las columnas con bind NULL conservan su valor.
+# Así cualquier combinación de campos reutiliza la misma sentencia, que se
+# parsea una vez en el servidor y ocupa un solo lugar en el caché de sentencias.
+SQL_UPDATE = {
+    tabla: (
+        f"UPDATE {tabla} SET "
+        + ", ".join(f"{columna} = NVL(:{columna}, {columna})" for columna in editables)
+        + " WHERE id = :id"
+    )
+    for tabla, editables in COLUMNAS_EDITABLES.items()
+}
+
+
+def parametros_update(tabla: str, id: int, cambios: dict) -> dict:
+    """Binds completos para SQL_UPDATE[tabla]; las columnas sin cambio van en None."""
+    editables = COLUMNAS_EDITABLES[tabla]
+    desconocidas = set(cambios) - set(editables)
+    if desconocidas:
+        raise ValueError(f"Columnas no editables en {tabla}: {sorted(desconocidas)}")
+    parametros = {
+        columna: None if cambios.get(columna) is None else convertir(cambios[columna])
+        for columna, convertir in editables.items()
+    }
+    parametros["id"] = int(id)
+    return parametros
+
+
+def _update(tabla: str, id: int, cambios: dict) -> int:
+    """Ejecuta SQL_UPDATE[tabla] para un id; retorna las filas actualizadas."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            if TIPOS_BIND[tabla]:
+                cur.setinputsizes(**TIPOS_BIND[tabla])
+            cur.execute(SQL_UPDATE[tabla], parametros_update(tabla, id, cambios))
+            filas = cur.rowcount
+        conn.commit()
+    _invalidar_replica(tabla, [int(id)])
+    return filas
+
+
+ESTADISTICAS_PARSEO = (
+    "parse count (total)",
+    "parse count (hard)",
+    "session cursor cache hits",
+    "execute count",
+)
+
+# Valores por (sid, estadística) al marcar la línea base (ver marcar_parseo)
+_parseo_base: dict = {}
+
+
+def _leer_parseo() -> dict:
+    """{(sid, estadística): valor} de las sesiones del pool de este proceso.
+
+    Requiere SELECT sobre V_$SESSTAT y V_$STATNAME.
+    """
+    sids = sorted(sesiones_propias())
+    if not sids:
+        return {}
+    binds = {f"sid{i}": sid for i, sid in enumerate(sids)}
+    nombres = {f"nombre{i}": nombre for i, nombre in enumerate(ESTADISTICAS_PARSEO)}
+    sql = (
+        "SELECT s.sid, n.name, s.value FROM v$sesstat s "
+        "JOIN v$statname n ON n.statistic# = s.statistic# "
+        f"WHERE n.name IN ({', '.join(':' + b for b in nombres)}) "
+        f"AND s.sid IN ({', '.join(':' + b for b in binds)})"
+    )
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {**binds, **nombres})
+            return {(sid, nombre): valor for sid, nombre, valor in cursor}
+
+
+def marcar_parseo():
+    """Toma la línea base de estadisticas_parseo() (al iniciar el programa)."""
+    global _parseo_base
+    _parseo_base = _leer_parseo()
+
+
+def estadisticas_parseo() -> dict:
+    """Parseos y aciertos de caché de cursores de este proceso desde marcar_parseo().
+
+    Sólo cuenta las sesiones que abrió el pool de este proceso; las creadas
+    después de la línea base cuentan completas. Un caché de sentencias
+    efectivo mantiene 'parse count' muy por debajo de 'execute count' y los
+    hard parses casi en cero.
+    """
+    stats = dict.fromkeys(ESTADISTICAS_PARSEO, 0)
+    for (sid, nombre), valor in _leer_parseo().items():
+        stats[nombre] += valor - _parseo_base.get((sid, nombre), 0)
+    return stats
+
+
+def imprimir_parseo(stats: dict):
+    ejecuciones = stats["execute count"] or 1
+    print(
+        f"Parseos: {stats['parse count (total)']} totales "
+        f"({stats['parse count (hard)']} hard) para {stats['execute count']} ejecuciones "
+        f"({100 * stats['parse count (total)'] / ejecuciones:.1f}%); "
+        f"aciertos de caché de cursores: {stats['session cursor cache hits']}"
+    )
+
 
 # ---------------------------------------------------------------------------
 # CRUD USUARIOS
 # ---------------------------------------------------------------------------
 
 def create_usuario(
-    id: int,
     nombre: str,
     rut: str,
     correo: str,
     tipo_usuario: str,
-):
+    id: Optional[int] = None,
+) -> Optional[int]:
+    """Inserta un usuario y retorna su id (asignado por USUARIOS_SEQ si no se indica)."""
     sql = (
         "INSERT INTO USUARIOS (id,nombre,rut,correo,tipo_usuario) "
-        "VALUES (:id,:nombre,:rut,:correo,:tipo_usuario)"
+        "VALUES (:id,:nombre,:rut,:correo,:tipo_usuario) "
+        "RETURNING id INTO :nuevo_id"
     )
 
     parametros = {
@@ -99,39 +588,45 @@ def create_usuario(
     try:
         with get_connection() as connection:
             with connection.cursor() as cursor:
-                cursor.execute(sql, parametros)
+                nuevo_id = cursor.var(int)
+                cursor.execute(sql, {**parametros, "nuevo_id": nuevo_id})
             connection.commit()
-            print("Inserción de usuario correcta.")
+            id = nuevo_id.getvalue()[0]
+            print(f"Inserción de usuario correcta (ID={id}).")
+            return id
     except oracledb.DatabaseError as error:
         print(f"No se pudo insertar el usuario\n{error}\n{sql}\n{parametros}")
 
 
 def read_usuarios():
-    sql = "SELECT * FROM USUARIOS"
+    sql = f"SELECT {columnas(Usuario)} FROM USUARIOS"
     try:
-        with get_connection() as connection:
-            with connection.cursor() as cursor:
-                print(sql)
-                for fila in cursor.execute(sql):
-                    print(fila)
+        print(sql)
+        for fila in iter_usuarios():
+            print(fila)
     except oracledb.DatabaseError as error:
         print(f"No se pudo ejecutar la query\n{error}\n{sql}")
 
 
-def read_usuario_by_id(id: int):
-    sql = "SELECT * FROM USUARIOS WHERE id = :id"
+def read_usuario_by_id(id: int) -> Optional[Usuario]:
+    fila = _leer_replica("USUARIOS", id)
+    if fila is not None:
+        print(fila)
+        return fila
+    sql = f"SELECT {columnas(Usuario)} FROM USUARIOS WHERE id = :id"
     parametros = {"id": id}
     try:
         with get_connection() as connection:
             with connection.cursor() as cursor:
                 print(sql, parametros)
-                resultados = cursor.execute(sql, parametros)
-                encontrado = False
-                for fila in resultados:
-                    print(fila)
-                    encontrado = True
-                if not encontrado:
+                cursor.execute(sql, parametros)
+                cursor.rowfactory = Usuario
+                fila = cursor.fetchone()
+                if fila is None:
                     print(f"No hay usuarios con ID {id}")
+                else:
+                    print(fila)
+                return fila
     except oracledb.DatabaseError as error:
         print(f"No se pudo ejecutar la query\n{error}\n{sql}\n{parametros}")
 
@@ -143,32 +638,19 @@ def update_usuario(
     correo: Optional[str] = None,
     tipo_usuario: Optional[str] = None,
 ):
-    modificaciones = []
-    parametros: dict = {"id": id}
-
-    if nombre is not None:
-        modificaciones.append("nombre = :nombre")
-        parametros["nombre"] = nombre
-    if rut is not None:
-        modificaciones.append("rut = :rut")
-        parametros["rut"] = rut
-    if correo is not None:
-        modificaciones.append("correo = :correo")
-        parametros["correo"] = correo
-    if tipo_usuario is not None:
-        modificaciones.append("tipo_usuario = :tipo_usuario")
-        parametros["tipo_usuario"] = tipo_usuario.upper()
-
-    if not modificaciones:
-        return print("No has enviado datos por modificar")
+    cambios = {
+        "nombre": nombre,
+        "rut": rut,
+        "correo": correo,
+        "tipo_usuario": tipo_usuario,
+    }
 
-    sql = f"UPDATE USUARIOS SET {', '.join(modificaciones)} WHERE id = :id"
+    if all(valor is None for valor in cambios.values()):
+        return print("No has enviado datos por modificar")
 
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(sql, parametros)
-        conn.commit()
-        print(f"Usuario con ID={id} actualizado.")
+    filas = _update("USUARIOS", id, cambios)
+    print(f"Usuario con ID={id} actualizado.")
+    return filas
 
 
 def delete_usuario(id: int):
@@ -178,8 +660,11 @@ def delete_usuario(id: int):
         with get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(sql, parametros)
+                filas = cur.rowcount
             conn.commit()
+            _invalidar_replica("USUARIOS", [id])
             print(f"Usuario eliminado\n{parametros}")
+            return filas
     except oracledb.DatabaseError as e:
         print(f"Error al eliminar usuario: {e}\n{sql}\n{parametros}")
 
@@ -189,14 +674,16 @@ def delete_usuario(id: int):
 # ---------------------------------------------------------------------------
 
 def create_libro(
-    id: int,
     titulo: str,
     autor: str,
     anio_publicacion: int,
-):
+    id: Optional[int] = None,
+) -> Optional[int]:
+    """Inserta un libro y retorna su id (asignado por LIBROS_SEQ si no se indica)."""
     sql = (
         "INSERT INTO LIBROS (id,titulo,autor,anio_publicacion) "
-        "VALUES (:id,:titulo,:autor,:anio_publicacion)"
+        "VALUES (:id,:titulo,:autor,:anio_publicacion) "
+        "RETURNING id INTO :nuevo_id"
     )
 
     parametros = {
@@ -209,39 +696,46 @@ def create_libro(
     try:
         with get_connection() as connection:
             with connection.cursor() as cursor:
-                cursor.execute(sql, parametros)
+                nuevo_id = cursor.var(int)
+                cursor.execute(sql, {**parametros, "nuevo_id": nuevo_id})
             connection.commit()
-            print("Inserción de libro correcta.")
+            id = nuevo_id.getvalue()[0]
+            _indexar_libros([Libro(id, titulo, autor, anio_publicacion)])
+            print(f"Inserción de libro correcta (ID={id}).")
+            return id
     except oracledb.DatabaseError as error:
         print(f"No se pudo insertar el libro\n{error}\n{sql}\n{parametros}")
 
 
 def read_libros():
-    sql = "SELECT * FROM LIBROS"
+    sql = f"SELECT {columnas(Libro)} FROM LIBROS"
     try:
-        with get_connection() as connection:
-            with connection.cursor() as cursor:
-                print(sql)
-                for fila in cursor.execute(sql):
-                    print(fila)
+        print(sql)
+        for fila in iter_libros():
+            print(fila)
     except oracledb.DatabaseError as error:
         print(f"No se pudo ejecutar la query\n{error}\n{sql}")
 
 
-def read_libro_by_id(id: int):
-    sql = "SELECT * FROM LIBROS WHERE id = :id"
+def read_libro_by_id(id: int) -> Optional[Libro]:
+    fila = _leer_replica("LIBROS", id)
+    if fila is not None:
+        print(fila)
+        return fila
+    sql = f"SELECT {columnas(Libro)} FROM LIBROS WHERE id = :id"
     parametros = {"id": id}
     try:
         with get_connection() as connection:
             with connection.cursor() as cursor:
                 print(sql, parametros)
-                resultados = cursor.execute(sql, parametros)
-                encontrado = False
-                for fila in resultados:
-                    print(fila)
-                    encontrado = True
-                if not encontrado:
+                cursor.execute(sql, parametros)
+                cursor.rowfactory = Libro
+                fila = cursor.fetchone()
+                if fila is None:
                     print(f"No hay libros con ID {id}")
+                else:
+                    print(fila)
+                return fila
     except oracledb.DatabaseError as error:
         print(f"No se pudo ejecutar la query\n{error}\n{sql}\n{parametros}")
 
@@ -252,29 +746,19 @@ def update_libro(
     autor: Optional[str] = None,
     anio_publicacion: Optional[int] = None,
 ):
-    modificaciones = []
-    parametros: dict = {"id": id}
-
-    if titulo is not None:
-        modificaciones.append("titulo = :titulo")
-        parametros["titulo"] = titulo
-    if autor is not None:
-        modificaciones.append("autor = :autor")
-        parametros["autor"] = autor
-    if anio_publicacion is not None:
-        modificaciones.append("anio_publicacion = :anio_publicacion")
-        parametros["anio_publicacion"] = anio_publicacion
-
-    if not modificaciones:
-        return print("No has enviado datos por modificar")
+    cambios = {
+        "titulo": titulo,
+        "autor": autor,
+        "anio_publicacion": anio_publicacion,
+    }
 
-    sql = f"UPDATE LIBROS SET {', '.join(modificaciones)} WHERE id = :id"
+    if all(valor is None for valor in cambios.values()):
+        return print("No has enviado datos por modificar")
 
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(sql, parametros)
-        conn.commit()
-        print(f"Libro con ID={id} actualizado.")
+    filas = _update("LIBROS", id, cambios)
+    _actualizar_indice_libros({id: cambios})
+    print(f"Libro con ID={id} actualizado.")
+    return filas
 
 
 def delete_libro(id: int):
@@ -284,8 +768,12 @@ def delete_libro(id: int):
         with get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(sql, parametros)
+                filas = cur.rowcount
             conn.commit()
+            _invalidar_replica("LIBROS", [id])
+            _desindexar_libros([int(id)])
             print(f"Libro eliminado\n{parametros}")
+            return filas
     except oracledb.DatabaseError as e:
         print(f"Error al eliminar libro: {e}\n{sql}\n{parametros}")
 
@@ -295,18 +783,19 @@ def delete_libro(id: int):
 # ---------------------------------------------------------------------------
 
 def create_prestamo(
-    id: int,
     idUsuario: int,
     idLibro: int,
     fecha_prestamo: str,
-    fecha_devolucion: Optional[str],
-):
+    fecha_devolucion: Optional[str] = None,
+    id: Optional[int] = None,
+) -> Optional[int]:
+    """Inserta un préstamo y retorna su id (asignado por PRESTAMOS_SEQ si no se indica)."""
     sql = (
         "INSERT INTO PRESTAMOS ("
         "id,idUsuario,idLibro,fecha_prestamo,fecha_devolucion"
         ") VALUES ("
         ":id,:idUsuario,:idLibro,:fecha_prestamo,:fecha_devolucion"
-        ")"
+        ") RETURNING id INTO :nuevo_id"
     )
 
     parametros = {
@@ -324,39 +813,41 @@ def create_prestamo(
     try:
         with get_connection() as connection:
             with connection.cursor() as cursor:
-                cursor.execute(sql, parametros)
+                nuevo_id = cursor.var(int)
+                cursor.execute(sql, {**parametros, "nuevo_id": nuevo_id})
             connection.commit()
-            print("Inserción de préstamo correcta.")
+            id = nuevo_id.getvalue()[0]
+            print(f"Inserción de préstamo correcta (ID={id}).")
+            return id
     except oracledb.DatabaseError as error:
         print(f"No se pudo insertar el préstamo\n{error}\n{sql}\n{parametros}")
 
 
 def read_prestamos():
-    sql = "SELECT * FROM PRESTAMOS"
+    sql = f"SELECT {columnas(Prestamo)} FROM PRESTAMOS"
     try:
-        with get_connection() as connection:
-            with connection.cursor() as cursor:
-                print(sql)
-                for fila in cursor.execute(sql):
-                    print(fila)
+        print(sql)
+        for fila in iter_prestamos():
+            print(fila)
     except oracledb.DatabaseError as error:
         print(f"No se pudo ejecutar la query\n{error}\n{sql}")
 
 
-def read_prestamo_by_id(id: int):
-    sql = "SELECT * FROM PRESTAMOS WHERE id = :id"
+def read_prestamo_by_id(id: int) -> Optional[Prestamo]:
+    sql = f"SELECT {columnas(Prestamo)} FROM PRESTAMOS WHERE id = :id"
     parametros = {"id": id}
     try:
         with get_connection() as connection:
             with connection.cursor() as cursor:
                 print(sql, parametros)
-                resultados = cursor.execute(sql, parametros)
-                encontrado = False
-                for fila in resultados:
-                    print(fila)
-                    encontrado = True
-                if not encontrado:
+                cursor.execute(sql, parametros)
+                cursor.rowfactory = Prestamo
+                fila = cursor.fetchone()
+                if fila is None:
                     print(f"No hay préstamos con ID {id}")
+                else:
+                    print(fila)
+                return fila
     except oracledb.DatabaseError as error:
         print(f"No se pudo ejecutar la query\n{error}\n{sql}\n{parametros}")
 
@@ -368,36 +859,19 @@ def update_prestamo(
     fecha_prestamo: Optional[str] = None,
     fecha_devolucion: Optional[str] = None,
 ):
-    modificaciones = []
-    parametros: dict = {"id": id}
-
-    if idUsuario is not None:
-        modificaciones.append("idUsuario = :idUsuario")
-        parametros["idUsuario"] = idUsuario
-    if idLibro is not None:
-        modificaciones.append("idLibro = :idLibro")
-        parametros["idLibro"] = idLibro
-    if fecha_prestamo is not None:
-        modificaciones.append("fecha_prestamo = :fecha_prestamo")
-        parametros["fecha_prestamo"] = datetime.strptime(
-            fecha_prestamo, "%d-%m-%Y"
-        )
-    if fecha_devolucion is not None:
-        modificaciones.append("fecha_devolucion = :fecha_devolucion")
-        parametros["fecha_devolucion"] = datetime.strptime(
-            fecha_devolucion, "%d-%m-%Y"
-        )
+    cambios = {
+        "idUsuario": idUsuario,
+        "idLibro": idLibro,
+        "fecha_prestamo": fecha_prestamo,
+        "fecha_devolucion": fecha_devolucion,
+    }
 
-    if not modificaciones:
+    if all(valor is None for valor in cambios.values()):
         return print("No has enviado datos por modificar")
 
-    sql = f"UPDATE PRESTAMOS SET {', '.join(modificaciones)} WHERE id = :id"
-
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute(sql, parametros)
-        conn.commit()
-        print(f"Préstamo con ID={id} actualizado.")
+    filas = _update("PRESTAMOS", id, cambios)
+    print(f"Préstamo con ID={id} actualizado.")
+    return filas
 
 
 def delete_prestamo(id: int):
@@ -407,19 +881,258 @@ def delete_prestamo(id: int):
         with get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(sql, parametros)
+                filas = cur.rowcount
             conn.commit()
             print(f"Préstamo eliminado\n{parametros}")
+            return filas
     except oracledb.DatabaseError as e:
         print(f"Error al eliminar préstamo: {e}\n{sql}\n{parametros}")
 
 
+# ---------------------------------------------------------------------------
+# CARGA MASIVA
+# ---------------------------------------------------------------------------
+
+def _id_opcional(valor) -> Optional[int]:
+    return int(valor) if str(valor or "").strip() else None
+
+
+def _bulk_insert(
+    sql: str,
+    filas: Iterable[dict],
+    preparar: Callable[[dict], dict],
+    batch_size: int,
+    tipos: Optional[dict] = None,
+    reserva: Optional[ReservaIds] = None,
+    al_confirmar: Optional[Callable[[list], None]] = None,
+):
+    """Inserta filas por lotes con executemany y batcherrors.
+
+    Cada lote se confirma por separado; las filas con error no detienen el
+    lote y se retornan como (posición, mensaje) junto al total insertado.
+    Las filas sin id reciben uno de `reserva` antes de enviarse.
+    `al_confirmar` recibe los parámetros de las filas insertadas de cada lote.
+    """
+    insertados = 0
+    errores = []
+    posicion = 0
+    iterador = iter(filas)
+
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            while True:
+                lote = []
+                for fila in islice(iterador, batch_size):
+                    try:
+                        lote.append(preparar(fila))
+                    except (KeyError, TypeError, ValueError) as error:
+                        errores.append((posicion + len(lote), f"fila inválida: {error}"))
+                        lote.append(None)
+                if not lote:
+                    break
+
+                validas = [(i, p) for i, p in enumerate(lote) if p is not None]
+                sin_id = [p for _, p in validas if p["id"] is None]
+                if sin_id and reserva is not None:
+                    for p, nuevo_id in zip(sin_id, reserva.siguientes(cursor, len(sin_id))):
+                        p["id"] = nuevo_id
+                if validas:
+                    if tipos:
+                        cursor.setinputsizes(**tipos)
+                    cursor.executemany(
+                        sql, [p for _, p in validas], batcherrors=True
+                    )
+                    fallidas = cursor.getbatcherrors()
+                    for error in fallidas:
+                        indice = validas[error.offset][0]
+                        errores.append((posicion + indice, error.message))
+                    insertados += len(validas) - len(fallidas)
+                    connection.commit()
+                    if al_confirmar is not None:
+                        offsets = {error.offset for error in fallidas}
+                        al_confirmar([p for k, (_, p) in enumerate(validas) if k not in offsets])
+
+                posicion += len(lote)
+
+    return insertados, errores
+
+
+def bulk_create_usuarios(filas: Iterable[dict], batch_size: int = 1000):
+    sql = (
+        "INSERT INTO USUARIOS (id,nombre,rut,correo,tipo_usuario) "
+        "VALUES (:id,:nombre,:rut,:correo,:tipo_usuario)"
+    )
+
+    def preparar(fila: dict) -> dict:
+        return {
+            "id": _id_opcional(fila.get("id")),
+            "nombre": fila["nombre"],
+            "rut": fila["rut"],
+            "correo": fila["correo"],
+            "tipo_usuario": fila["tipo_usuario"].upper(),
+        }
+
+    return _bulk_insert(
+        sql, filas, preparar, batch_size, reserva=RESERVAS["USUARIOS"]
+    )
+
+
+def bulk_create_libros(filas: Iterable[dict], batch_size: int = 1000):
+    sql = (
+        "INSERT INTO LIBROS (id,titulo,autor,anio_publicacion) "
+        "VALUES (:id,:titulo,:autor,:anio_publicacion)"
+    )
+
+    def preparar(fila: dict) -> dict:
+        anio = fila.get("anio_publicacion")
+        return {
+            "id": _id_opcional(fila.get("id")),
+            "titulo": fila["titulo"],
+            "autor": fila["autor"],
+            "anio_publicacion": int(anio) if str(anio or "").strip() else None,
+        }
+
+    return _bulk_insert(
+        sql,
+        filas,
+        preparar,
+        batch_size,
+        {"anio_publicacion": oracledb.DB_TYPE_NUMBER},
+        reserva=RESERVAS["LIBROS"],
+        al_confirmar=lambda insertadas: _indexar_libros(Libro(**p) for p in insertadas),
+    )
+
+
+def bulk_create_prestamos(filas: Iterable[dict], batch_size: int = 1000):
+    sql = (
+        "INSERT INTO PRESTAMOS ("
+        "id,idUsuario,idLibro,fecha_prestamo,fecha_devolucion"
+        ") VALUES ("
+        ":id,:idUsuario,:idLibro,:fecha_prestamo,:fecha_devolucion"
+        ")"
+    )
+
+    def preparar(fila: dict) -> dict:
+        return {
+            "id": _id_opcional(fila.get("id")),
+            "idUsuario": int(fila["idUsuario"]),
+            "idLibro": int(fila["idLibro"]),
+            "fecha_prestamo": _parse_fecha(fila["fecha_prestamo"]),
+            "fecha_devolucion": _parse_fecha(fila.get("fecha_devolucion")),
+        }
+
+    return _bulk_insert(
+        sql,
+        filas,
+        preparar,
+        batch_size,
+        {
+            "fecha_prestamo": oracledb.DB_TYPE_DATE,
+            "fecha_devolucion": oracledb.DB_TYPE_DATE,
+        },
+        reserva=RESERVAS["PRESTAMOS"],
+    )
+
+
+# ---------------------------------------------------------------------------
+# ACTUALIZACIÓN Y BORRADO MASIVO
+# ---------------------------------------------------------------------------
+
+def _executemany_con_resultados(cursor, sql: str, filas: list, ids: list, resultados: dict):
+    """executemany con batcherrors; anota por id las filas afectadas o el error."""
+    cursor.executemany(sql, filas, batcherrors=True, arraydmlrowcounts=True)
+    for id, filas_afectadas in zip(ids, cursor.getarraydmlrowcounts()):
+        resultados[id] = filas_afectadas
+    for error in cursor.getbatcherrors():
+        resultados[ids[error.offset]] = error.message
+
+
+def _bulk_update(tabla: str, cambios) -> dict:
+    """Aplica cambios {id: {columna: valor}} como DML en arreglo, en una transacción.
+
+    Los valores None se ignoran, igual que en update_*. Todas las filas usan
+    SQL_UPDATE[tabla], por lo que basta un solo executemany. Retorna {id:
+    filas actualizadas} o {id: mensaje de error} por cada id recibido.
+    """
+    filas = [parametros_update(tabla, id, campos) for id, campos in dict(cambios).items()]
+    resultados: dict = {}
+    if not filas:
+        return resultados
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            if TIPOS_BIND[tabla]:
+                cursor.setinputsizes(**TIPOS_BIND[tabla])
+            ids = [fila["id"] for fila in filas]
+            _executemany_con_resultados(cursor, SQL_UPDATE[tabla], filas, ids, resultados)
+        connection.commit()
+    _invalidar_replica(tabla, ids)
+    return resultados
+
+
+def _bulk_delete(tabla: str, ids: Iterable[int]) -> dict:
+    """Borra los ids dados en un solo executemany; retorna {id: filas borradas o error}."""
+    ids = [int(id) for id in ids]
+    resultados: dict = {}
+    if not ids:
+        return resultados
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            _executemany_con_resultados(
+                cursor,
+                f"DELETE FROM {tabla} WHERE id = :id",
+                [{"id": id} for id in ids],
+                ids,
+                resultados,
+            )
+        connection.commit()
+    _invalidar_replica(tabla, ids)
+    return resultados
+
+
+def bulk_update_usuarios(cambios) -> dict:
+    return _bulk_update("USUARIOS", cambios)
+
+
+def bulk_update_libros(cambios) -> dict:
+    cambios = dict(cambios)
+    resultados = _bulk_update("LIBROS", cambios)
+    _actualizar_indice_libros(
+        {id: campos for id, campos in cambios.items() if resultados.get(int(id)) == 1}
+    )
+    return resultados
+
+
+def bulk_update_prestamos(cambios) -> dict:
+    return _bulk_update("PRESTAMOS", cambios)
+
+
+def bulk_delete_usuarios(ids: Iterable[int]) -> dict:
+    return _bulk_delete("USUARIOS", ids)
+
+
+def bulk_delete_libros(ids: Iterable[int]) -> dict:
+    resultados = _bulk_delete("LIBROS", ids)
+    _desindexar_libros(id for id, borradas in resultados.items() if borradas == 1)
+    return resultados
+
+
+def bulk_delete_prestamos(ids: Iterable[int]) -> dict:
+    return _bulk_delete("PRESTAMOS", ids)
+
+
 # ---------------------------------------------------------------------------
 # MENÚS
 # ---------------------------------------------------------------------------
 
+def limpiar_pantalla():
+    """Limpia la terminal con una secuencia ANSI (sin lanzar un proceso)."""
+    if sys.stdout.isatty():
+        print("\033[2J\033[H", end="", flush=True)
+
+
 def menu_usuarios():
     while True:
-        os.system("cls")
+        limpiar_pantalla()
         print(
             """
                 ====================================
@@ -437,28 +1150,29 @@ def menu_usuarios():
         opcion = input("Elige una opción [1-5, 0]: ")
 
         if opcion == "1":
-            os.system("cls")
+            limpiar_pantalla()
             print("1. Insertar un usuario")
-            id = input("ID usuario: ")
+            id_str = input("ID usuario (vacío = automático): ")
+            id = int(id_str) if id_str.strip() else None
             nombre = input("Nombre: ")
             rut = input("RUT: ")
             correo = input("Correo: ")
             tipo = input("Tipo de usuario (ESTUDIANTE/DOCENTE/INVESTIGADOR): ")
-            create_usuario(id, nombre, rut, correo, tipo)
+            create_usuario(nombre, rut, correo, tipo, id=id)
             input("Ingrese ENTER para continuar...")
         elif opcion == "2":
-            os.system("cls")
+            limpiar_pantalla()
             print("2. Consultar todos los usuarios")
             read_usuarios()
             input("Ingrese ENTER para continuar...")
         elif opcion == "3":
-            os.system("cls")
+            limpiar_pantalla()
             print("3. Consultar usuario por ID")
             id = input("ID usuario: ")
             read_usuario_by_id(id)
             input("Ingrese ENTER para continuar...")
         elif opcion == "4":
-            os.system("cls")
+            limpiar_pantalla()
             print("4. Modificar un usuario")
             id = input("ID usuario: ")
             print("[Sólo ingrese los datos a modificar, deje vacío los que no quiera cambiar]")
@@ -479,24 +1193,24 @@ def menu_usuarios():
             update_usuario(id, nombre, rut, correo, tipo)
             input("Ingrese ENTER para continuar...")
         elif opcion == "5":
-            os.system("cls")
+            limpiar_pantalla()
             print("5. Eliminar un usuario")
             id = input("ID usuario: ")
             delete_usuario(id)
             input("Ingrese ENTER para continuar...")
         elif opcion == "0":
-            os.system("cls")
+            limpiar_pantalla()
             print("Volviendo al menú principal...")
             break
         else:
-            os.system("cls")
+            limpiar_pantalla()
             print("Opción incorrecta, intente nuevamente.")
             input("Ingrese ENTER para continuar...")
 
 
 def menu_libros():
     while True:
-        os.system("cls")
+        limpiar_pantalla()
         print(
             """
                 ====================================
@@ -507,35 +1221,37 @@ def menu_libros():
                 | 3. Consultar libro por ID        |
                 | 4. Modificar un libro            |
                 | 5. Eliminar un libro             |
+                | 6. Buscar por título o autor     |
                 | 0. Volver al menú principal      |
                 ====================================
             """
         )
-        opcion = input("Elige una opción [1-5, 0]: ")
+        opcion = input("Elige una opción [1-6, 0]: ")
 
         if opcion == "1":
-            os.system("cls")
+            limpiar_pantalla()
             print("1. Insertar un libro")
-            id = input("ID libro: ")
+            id_str = input("ID libro (vacío = automático): ")
+            id = int(id_str) if id_str.strip() else None
             titulo = input("Título: ")
             autor = input("Autor: ")
             anio_str = input("Año de publicación: ")
             anio = int(anio_str) if anio_str.strip() else None
-            create_libro(id, titulo, autor, anio)
+            create_libro(titulo, autor, anio, id=id)
             input("Ingrese ENTER para continuar...")
         elif opcion == "2":
-            os.system("cls")
+            limpiar_pantalla()
             print("2. Consultar todos los libros")
             read_libros()
             input("Ingrese ENTER para continuar...")
         elif opcion == "3":
-            os.system("cls")
+            limpiar_pantalla()
             print("3. Consultar libro por ID")
             id = input("ID libro: ")
             read_libro_by_id(id)
             input("Ingrese ENTER para continuar...")
         elif opcion == "4":
-            os.system("cls")
+            limpiar_pantalla()
             print("4. Modificar un libro")
             id = input("ID libro: ")
             print("[Sólo ingrese los datos a modificar, deje vacío los que no quiera cambiar]")
@@ -555,24 +1271,34 @@ def menu_libros():
             update_libro(id, titulo, autor, anio)
             input("Ingrese ENTER para continuar...")
         elif opcion == "5":
-            os.system("cls")
+            limpiar_pantalla()
             print("5. Eliminar un libro")
             id = input("ID libro: ")
             delete_libro(id)
             input("Ingrese ENTER para continuar...")
+        elif opcion == "6":
+            limpiar_pantalla()
+            print("6. Buscar por título o autor")
+            consulta = input("Buscar: ")
+            resultados = buscar_libros(consulta)
+            if not resultados:
+                print(f"No hay libros que coincidan con '{consulta}'")
+            for puntaje, libro in resultados:
+                print(f"{puntaje:4.2f}  {libro}")
+            input("Ingrese ENTER para continuar...")
         elif opcion == "0":
-            os.system("cls")
+            limpiar_pantalla()
             print("Volviendo al menú principal...")
             break
         else:
-            os.system("cls")
+            limpiar_pantalla()
             print("Opción incorrecta, intente nuevamente.")
             input("Ingrese ENTER para continuar...")
 
 
 def menu_prestamos():
     while True:
-        os.system("cls")
+        limpiar_pantalla()
         print(
             """
                 ====================================
@@ -583,35 +1309,40 @@ def menu_prestamos():
                 | 3. Consultar préstamo por ID     |
                 | 4. Modificar un préstamo         |
                 | 5. Eliminar un préstamo          |
+                | 6. Libros prestados ahora        |
+                | 7. Préstamos vencidos            |
+                | 8. Préstamos activos por usuario |
+                | 9. Préstamos activos por libro   |
                 | 0. Volver al menú principal      |
                 ====================================
             """
         )
-        opcion = input("Elige una opción [1-5, 0]: ")
+        opcion = input("Elige una opción [1-9, 0]: ")
 
         if opcion == "1":
-            os.system("cls")
+            limpiar_pantalla()
             print("1. Insertar un préstamo")
-            id = input("ID préstamo: ")
+            id_str = input("ID préstamo (vacío = automático): ")
+            id = int(id_str) if id_str.strip() else None
             idUsuario = input("ID usuario: ")
             idLibro = input("ID libro: ")
             fecha_prestamo = input("Fecha préstamo (DD-MM-YYYY): ")
             fecha_devolucion = input("Fecha devolución (DD-MM-YYYY, opcional): ")
-            create_prestamo(id, idUsuario, idLibro, fecha_prestamo, fecha_devolucion)
+            create_prestamo(idUsuario, idLibro, fecha_prestamo, fecha_devolucion, id=id)
             input("Ingrese ENTER para continuar...")
         elif opcion == "2":
-            os.system("cls")
+            limpiar_pantalla()
             print("2. Consultar todos los préstamos")
             read_prestamos()
             input("Ingrese ENTER para continuar...")
         elif opcion == "3":
-            os.system("cls")
+            limpiar_pantalla()
             print("3. Consultar préstamo por ID")
             id = input("ID préstamo: ")
             read_prestamo_by_id(id)
             input("Ingrese ENTER para continuar...")
         elif opcion == "4":
-            os.system("cls")
+            limpiar_pantalla()
             print("4. Modificar un préstamo")
             id = input("ID préstamo: ")
             print("[Sólo ingrese los datos a modificar, deje vacío los que no quiera cambiar]")
@@ -644,17 +1375,57 @@ def menu_prestamos():
             )
             input("Ingrese ENTER para continuar...")
         elif opcion == "5":
-            os.system("cls")
+            limpiar_pantalla()
             print("5. Eliminar un préstamo")
             id = input("ID préstamo: ")
             delete_prestamo(id)
             input("Ingrese ENTER para continuar...")
+        elif opcion == "6":
+            limpiar_pantalla()
+            print("6. Libros prestados ahora")
+            try:
+                reportes.imprimir_prestamos(reportes.libros_prestados())
+            except oracledb.DatabaseError as error:
+                print(f"No se pudo generar el reporte\n{error}")
+            input("Ingrese ENTER para continuar...")
+        elif opcion == "7":
+            limpiar_pantalla()
+            print("7. Préstamos vencidos")
+            plazo_str = input(f"Días de plazo (vacío = {reportes.PLAZO_DIAS}): ")
+            plazo = int(plazo_str) if plazo_str.strip() else reportes.PLAZO_DIAS
+            try:
+                reportes.imprimir_prestamos(reportes.prestamos_vencidos(plazo), plazo)
+            except oracledb.DatabaseError as error:
+                print(f"No se pudo generar el reporte\n{error}")
+            input("Ingrese ENTER para continuar...")
+        elif opcion in ("8", "9"):
+            limpiar_pantalla()
+            por_usuario = opcion == "8"
+            entidad = "usuario" if por_usuario else "libro"
+            print(f"{opcion}. Préstamos activos por {entidad}")
+            id_str = input(f"ID {entidad} (vacío = los que tienen más): ")
+            id = int(id_str) if id_str.strip() else None
+            reporte = (
+                reportes.prestamos_activos_por_usuario
+                if por_usuario
+                else reportes.prestamos_activos_por_libro
+            )
+            try:
+                filas = reporte(id)
+            except oracledb.DatabaseError as error:
+                print(f"No se pudo generar el reporte (¿se aplicó la migración 2?)\n{error}")
+            else:
+                if not filas and id is not None:
+                    print(f"El {entidad} {id} no tiene préstamos activos")
+                for id_fila, activos in filas:
+                    print(f"{entidad.capitalize()} {id_fila}: {activos} préstamos activos")
+            input("Ingrese ENTER para continuar...")
         elif opcion == "0":
-            os.system("cls")
+            limpiar_pantalla()
             print("Volviendo al menú principal...")
             break
         else:
-            os.system("cls")
+            limpiar_pantalla()
             print("Opción incorrecta, intente nuevamente.")
             input("Ingrese ENTER para continuar...")
 
@@ -663,9 +1434,30 @@ def menu_prestamos():
 # MAIN
 # ---------------------------------------------------------------------------
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        # Con argumentos no hay menús: ver cli.py
+        import cli
+        return cli.main(argv)
+
+    # LOG_LEVEL=INFO muestra, entre otros, las estadísticas de parseo al salir
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING"))
+    # REPLICA_CATALOGO=:memory: (o la ruta de un archivo SQLite) activa la réplica
+    if os.getenv("REPLICA_CATALOGO"):
+        try:
+            activar_replica(
+                os.getenv("REPLICA_CATALOGO"),
+                float(os.getenv("REPLICA_INTERVALO", "30")),
+            )
+        except oracledb.DatabaseError as error:
+            logger.warning("No se pudo cargar la réplica del catálogo: %s", error)
+    try:
+        marcar_parseo()
+    except oracledb.DatabaseError as error:
+        logger.info("Sin línea base de parseos: %s", error)
     while True:
-        os.system("cls")
+        limpiar_pantalla()
         print(
             """
                 ====================================
@@ -675,6 +1467,9 @@ def main():
                 | 2. Gestionar tabla Usuarios      |
                 | 3. Gestionar tabla Libros        |
                 | 4. Gestionar tabla Préstamos     |
+                | 5. Migrar esquema (índices)      |
+                | 6. Estadísticas de consultas     |
+                | 7. Archivar préstamos antiguos   |
                 | 0. Salir del sistema             |
                 |----------------------------------|
                 | * Cree primero usuarios y libros |
@@ -682,11 +1477,13 @@ def main():
                 ====================================
             """
         )
-        opcion = input("Elige una opción [1-4, 0]: ")
+        opcion = input("Elige una opción [1-7, 0]: ")
 
         if opcion == "1":
-            os.system("cls")
-            create_all_tables()
+            limpiar_pantalla()
+            # Sin un "s" decide PRESTAMOS_PARTICIONADA (ver create_all_tables)
+            respuesta = input("¿Particionar PRESTAMOS por mes? [s/N]: ").strip().lower()
+            create_all_tables(True if respuesta == "s" else None)
             input("Ingrese ENTER para continuar...")
         elif opcion == "2":
             menu_usuarios()
@@ -694,15 +1491,48 @@ def main():
             menu_libros()
         elif opcion == "4":
             menu_prestamos()
+        elif opcion == "5":
+            limpiar_pantalla()
+            migrar()
+            input("Ingrese ENTER para continuar...")
+        elif opcion == "6":
+            limpiar_pantalla()
+            print("6. Estadísticas de consultas")
+            instrumentacion.imprimir_resumen()
+            try:
+                imprimir_parseo(estadisticas_parseo())
+            except oracledb.DatabaseError as error:
+                print(f"Parseos: no disponibles (¿permiso sobre V$SESSTAT?)\n{error}")
+            ruta = input("Archivo para exportar en formato Prometheus (vacío = no exportar): ")
+            if ruta.strip():
+                with open(ruta.strip(), "w", encoding="utf-8") as archivo:
+                    archivo.write(instrumentacion.prometheus())
+                print(f"Métricas escritas en {ruta.strip()}")
+            input("Ingrese ENTER para continuar...")
+        elif opcion == "7":
+            limpiar_pantalla()
+            print("7. Archivar préstamos antiguos")
+            meses_str = input(f"Archivar préstamos devueltos de hace más de N meses (vacío = {archivado.MESES}): ")
+            meses = int(meses_str) if meses_str.strip() else archivado.MESES
+            try:
+                total = archivado.archivar(meses)
+                print(f"{total} préstamos movidos a PRESTAMOS_HISTORICO.")
+            except oracledb.DatabaseError as error:
+                print(f"No se pudo archivar (¿se aplicó la migración 3?)\n{error}")
+            input("Ingrese ENTER para continuar...")
         elif opcion == "0":
-            os.system("cls")
+            limpiar_pantalla()
             print("Saliendo del sistema...")
+            try:
+                imprimir_parseo(estadisticas_parseo())
+            except oracledb.DatabaseError as error:
+                logger.warning("No se pudieron leer las estadísticas de parseo: %s", error)
             break
         else:
-            os.system("cls")
+            limpiar_pantalla()
             print("Opción incorrecta, intente nuevamente.")
             input("Ingrese ENTER para continuar...")
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
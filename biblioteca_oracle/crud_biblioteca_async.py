@@ -0,0 +1,257 @@
+"""CRUD asíncrono de la biblioteca sobre el API async de python-oracledb.
+
+Ofrece las mismas operaciones que crud_biblioteca.py, pero como corrutinas
+que comparten un pool creado con oracledb.create_pool_async(). Así un solo
+event loop puede tener muchas consultas en vuelo sin un hilo por cada una.
+
+A diferencia del módulo síncrono, estas funciones no imprimen: retornan los
+datos y dejan que los errores de oracledb lleguen al llamador.
+"""
+import os
+from datetime import datetime
+from typing import Optional
+
+import oracledb
+
+import conexion
+from crud_biblioteca import SQL_UPDATE, TIPOS_BIND, parametros_update
+from modelos import Libro, Prestamo, Usuario, columnas
+
+# Un servicio async suele necesitar más sesiones que el menú interactivo
+pool_max_async = int(os.getenv("ORACLE_ASYNC_POOL_MAX", "32"))
+
+_pool = None
+
+
+def get_pool():
+    """Retorna el pool async del proceso, creándolo la primera vez."""
+    global _pool
+    if _pool is None:
+        _pool = oracledb.create_pool_async(
+            user=conexion.username,
+            password=conexion.password,
+            dsn=conexion.dsn,
+            min=conexion.pool_min,
+            max=pool_max_async,
+            increment=conexion.pool_increment,
+            ping_interval=conexion.pool_ping_interval,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=conexion.pool_timeout * 1000,
+        )
+    return _pool
+
+
+async def close_pool():
+    """Cierra el pool async; llamar antes de terminar el event loop."""
+    global _pool
+    if _pool is not None:
+        await _pool.close(force=True)
+        _pool = None
+
+
+def _fecha(valor: Optional[str]):
+    return datetime.strptime(valor, "%d-%m-%Y") if valor and valor.strip() else None
+
+
+async def _insert(sql: str, parametros: dict) -> int:
+    async with get_pool().acquire() as connection:
+        with connection.cursor() as cursor:
+            nuevo_id = cursor.var(int)
+            await cursor.execute(sql, {**parametros, "nuevo_id": nuevo_id})
+        await connection.commit()
+    return nuevo_id.getvalue()[0]
+
+
+async def _fetchall(modelo, tabla: str) -> list:
+    sql = f"SELECT {columnas(modelo)} FROM {tabla} ORDER BY id"
+    async with get_pool().acquire() as connection:
+        with connection.cursor() as cursor:
+            await cursor.execute(sql)
+            cursor.rowfactory = modelo
+            return await cursor.fetchall()
+
+
+async def _fetch_by_id(modelo, tabla: str, id: int):
+    sql = f"SELECT {columnas(modelo)} FROM {tabla} WHERE id = :id"
+    async with get_pool().acquire() as connection:
+        with connection.cursor() as cursor:
+            await cursor.execute(sql, {"id": id})
+            cursor.rowfactory = modelo
+            return await cursor.fetchone()
+
+
+async def _dml(sql: str, parametros: dict) -> int:
+    async with get_pool().acquire() as connection:
+        with connection.cursor() as cursor:
+            await cursor.execute(sql, parametros)
+            filas = cursor.rowcount
+        await connection.commit()
+    return filas
+
+
+async def _update(tabla: str, id: int, cambios: dict) -> int:
+    """Actualiza sólo las columnas de `cambios` que no sean None (ver SQL_UPDATE)."""
+    if all(valor is None for valor in cambios.values()):
+        return 0
+    async with get_pool().acquire() as connection:
+        with connection.cursor() as cursor:
+            if TIPOS_BIND[tabla]:
+                cursor.setinputsizes(**TIPOS_BIND[tabla])
+            await cursor.execute(SQL_UPDATE[tabla], parametros_update(tabla, id, cambios))
+            filas = cursor.rowcount
+        await connection.commit()
+    return filas
+
+
+# ---------------------------------------------------------------------------
+# CRUD USUARIOS
+# ---------------------------------------------------------------------------
+
+async def create_usuario(
+    nombre: str,
+    rut: str,
+    correo: str,
+    tipo_usuario: str,
+    id: Optional[int] = None,
+) -> int:
+    sql = (
+        "INSERT INTO USUARIOS (id,nombre,rut,correo,tipo_usuario) "
+        "VALUES (:id,:nombre,:rut,:correo,:tipo_usuario) "
+        "RETURNING id INTO :nuevo_id"
+    )
+    return await _insert(sql, {
+        "id": id,
+        "nombre": nombre,
+        "rut": rut,
+        "correo": correo,
+        "tipo_usuario": tipo_usuario.upper(),
+    })
+
+
+async def read_usuarios() -> list[Usuario]:
+    return await _fetchall(Usuario, "USUARIOS")
+
+
+async def read_usuario_by_id(id: int) -> Optional[Usuario]:
+    return await _fetch_by_id(Usuario, "USUARIOS", id)
+
+
+async def update_usuario(
+    id: int,
+    nombre: Optional[str] = None,
+    rut: Optional[str] = None,
+    correo: Optional[str] = None,
+    tipo_usuario: Optional[str] = None,
+) -> int:
+    return await _update("USUARIOS", id, {
+        "nombre": nombre,
+        "rut": rut,
+        "correo": correo,
+        "tipo_usuario": tipo_usuario,
+    })
+
+
+async def delete_usuario(id: int) -> int:
+    return await _dml("DELETE FROM USUARIOS WHERE id = :id", {"id": id})
+
+
+# ---------------------------------------------------------------------------
+# CRUD LIBROS
+# ---------------------------------------------------------------------------
+
+async def create_libro(
+    titulo: str,
+    autor: str,
+    anio_publicacion: int,
+    id: Optional[int] = None,
+) -> int:
+    sql = (
+        "INSERT INTO LIBROS (id,titulo,autor,anio_publicacion) "
+        "VALUES (:id,:titulo,:autor,:anio_publicacion) "
+        "RETURNING id INTO :nuevo_id"
+    )
+    return await _insert(sql, {
+        "id": id,
+        "titulo": titulo,
+        "autor": autor,
+        "anio_publicacion": anio_publicacion,
+    })
+
+
+async def read_libros() -> list[Libro]:
+    return await _fetchall(Libro, "LIBROS")
+
+
+async def read_libro_by_id(id: int) -> Optional[Libro]:
+    return await _fetch_by_id(Libro, "LIBROS", id)
+
+
+async def update_libro(
+    id: int,
+    titulo: Optional[str] = None,
+    autor: Optional[str] = None,
+    anio_publicacion: Optional[int] = None,
+) -> int:
+    return await _update("LIBROS", id, {
+        "titulo": titulo,
+        "autor": autor,
+        "anio_publicacion": anio_publicacion,
+    })
+
+
+async def delete_libro(id: int) -> int:
+    return await _dml("DELETE FROM LIBROS WHERE id = :id", {"id": id})
+
+
+# ---------------------------------------------------------------------------
+# CRUD PRESTAMOS
+# ---------------------------------------------------------------------------
+
+async def create_prestamo(
+    idUsuario: int,
+    idLibro: int,
+    fecha_prestamo: str,
+    fecha_devolucion: Optional[str] = None,
+    id: Optional[int] = None,
+) -> int:
+    sql = (
+        "INSERT INTO PRESTAMOS ("
+        "id,idUsuario,idLibro,fecha_prestamo,fecha_devolucion"
+        ") VALUES ("
+        ":id,:idUsuario,:idLibro,:fecha_prestamo,:fecha_devolucion"
+        ") RETURNING id INTO :nuevo_id"
+    )
+    return await _insert(sql, {
+        "id": id,
+        "idUsuario": idUsuario,
+        "idLibro": idLibro,
+        "fecha_prestamo": _fecha(fecha_prestamo),
+        "fecha_devolucion": _fecha(fecha_devolucion),
+    })
+
+
+async def read_prestamos() -> list[Prestamo]:
+    return await _fetchall(Prestamo, "PRESTAMOS")
+
+
+async def read_prestamo_by_id(id: int) -> Optional[Prestamo]:
+    return await _fetch_by_id(Prestamo, "PRESTAMOS", id)
+
+
+async def update_prestamo(
+    id: int,
+    idUsuario: Optional[int] = None,
+    idLibro: Optional[int] = None,
+    fecha_prestamo: Optional[str] = None,
+    fecha_devolucion: Optional[str] = None,
+) -> int:
+    return await _update("PRESTAMOS", id, {
+        "idUsuario": idUsuario,
+        "idLibro": idLibro,
+        "fecha_prestamo": fecha_prestamo,
+        "fecha_devolucion": fecha_devolucion,
+    })
+
+
+async def delete_prestamo(id: int) -> int:
+    return await _dml("DELETE FROM PRESTAMOS WHERE id = :id", {"id": id})
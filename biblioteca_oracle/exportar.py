@@ -0,0 +1,138 @@
+"""Exporta tablas a archivos columnares (Parquet o Feather) con pyarrow.
+
+Las filas se leen con fetchmany en lotes de batch_size y cada lote se escribe
+como un RecordBatch, así la memoria usada no depende del tamaño de la tabla.
+Requiere pyarrow (pip install pyarrow).
+
+Ejemplos:
+    python exportar.py prestamos libros --formato parquet --destino export/
+    python exportar.py indicadores --formato feather
+"""
+import argparse
+import os
+import sys
+
+import oracledb
+
+from conexion import get_connection
+from modelos import Libro, Prestamo, Usuario, columnas
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pa = None
+
+CONSULTAS = {
+    "usuarios": f"SELECT {columnas(Usuario)} FROM USUARIOS",
+    "libros": f"SELECT {columnas(Libro)} FROM LIBROS",
+    "prestamos": f"SELECT {columnas(Prestamo)} FROM PRESTAMOS",
+    # Tabla de unidad3_indicadores, en el mismo esquema
+    "indicadores": (
+        "SELECT id, nombre, fecha_indicador, valor, fecha_consulta, usuario, fuente "
+        "FROM INDICADORES"
+    ),
+}
+
+# Columnas NUMBER sin precisión que sólo guardan enteros. cursor.description
+# no lo distingue (precisión 0, escala -127) y se exportarían como float64
+TIPOS = {
+    "indicadores": {"id": "int64"},
+}
+
+
+def _tipo_arrow(columna):
+    """Tipo Arrow para una columna según cursor.description."""
+    tipo = columna.type_code
+    if tipo is oracledb.DB_TYPE_NUMBER:
+        # INTEGER en Oracle es NUMBER(38) con escala 0; NUMBER(p, s) con
+        # escala negativa también redondea a enteros. -127 es NUMBER sin precisión
+        entero = columna.precision and -127 < columna.scale <= 0
+        return pa.int64() if entero else pa.float64()
+    if tipo in (oracledb.DB_TYPE_DATE, oracledb.DB_TYPE_TIMESTAMP):
+        return pa.timestamp("s")
+    if tipo is oracledb.DB_TYPE_RAW:
+        return pa.binary()
+    if tipo in (oracledb.DB_TYPE_BINARY_FLOAT, oracledb.DB_TYPE_BINARY_DOUBLE):
+        return pa.float64()
+    return pa.string()
+
+
+def iter_record_batches(sql: str, batch_size: int = 50000, tipos: dict | None = None):
+    """Ejecuta sql; genera primero el schema y luego RecordBatch de hasta batch_size filas.
+
+    El schema sale de cursor.description antes de leer filas, así existe
+    aunque la consulta no retorne ninguna. `tipos` ({columna: alias de
+    pyarrow}) reemplaza el tipo deducido.
+    """
+    tipos = tipos or {}
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.arraysize = batch_size
+            cursor.prefetchrows = batch_size
+            cursor.execute(sql)
+            schema = pa.schema([
+                pa.field(
+                    c.name.lower(),
+                    pa.type_for_alias(tipos[c.name.lower()])
+                    if c.name.lower() in tipos else _tipo_arrow(c),
+                )
+                for c in cursor.description
+            ])
+            yield schema
+            while True:
+                filas = cursor.fetchmany(batch_size)
+                if not filas:
+                    return
+                columnas_lote = list(zip(*filas))
+                yield pa.RecordBatch.from_arrays(
+                    [pa.array(col, type=campo.type) for col, campo in zip(columnas_lote, schema)],
+                    schema=schema,
+                )
+
+
+def exportar(tabla: str, destino: str, formato: str = "parquet", batch_size: int = 50000) -> int:
+    """Escribe la tabla en destino/<tabla>.<formato>; retorna las filas escritas.
+
+    Una tabla vacía también deja su archivo, con el schema y cero filas.
+    """
+    ruta = os.path.join(destino, f"{tabla}.{formato}")
+    lotes = iter_record_batches(CONSULTAS[tabla], batch_size, TIPOS.get(tabla))
+    total = 0
+    try:
+        schema = next(lotes)
+        if formato == "parquet":
+            escritor = pa.parquet.ParquetWriter(ruta, schema)
+        else:
+            escritor = pa.ipc.new_file(ruta, schema)
+        try:
+            for lote in lotes:
+                escritor.write_batch(lote)
+                total += lote.num_rows
+        finally:
+            escritor.close()
+    finally:
+        lotes.close()
+    print(f"{tabla.upper()}: {total} filas -> {ruta}")
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exportación columnar de la biblioteca")
+    parser.add_argument("tablas", nargs="+", choices=sorted(CONSULTAS))
+    parser.add_argument("--formato", choices=["parquet", "feather"], default="parquet")
+    parser.add_argument("--destino", default=".")
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    if pa is None:
+        sys.exit("Se necesita pyarrow para exportar: pip install pyarrow")
+
+    os.makedirs(args.destino, exist_ok=True)
+    for tabla in args.tablas:
+        exportar(tabla, args.destino, args.formato, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
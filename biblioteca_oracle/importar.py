@@ -0,0 +1,80 @@
+"""Importa USUARIOS, LIBROS o PRESTAMOS desde archivos CSV o JSONL.
+
+El archivo se lee fila a fila y se envía por lotes a los bulk_create_*,
+por lo que la memoria usada no depende del tamaño del archivo.
+
+Ejemplos:
+    python importar.py libros catalogo.csv
+    python importar.py prestamos prestamos.jsonl --batch-size 5000
+"""
+import argparse
+import csv
+import json
+import sys
+
+import crud_biblioteca
+
+CARGAS = {
+    "usuarios": crud_biblioteca.bulk_create_usuarios,
+    "libros": crud_biblioteca.bulk_create_libros,
+    "prestamos": crud_biblioteca.bulk_create_prestamos,
+}
+
+
+def leer_csv(ruta: str):
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        yield from csv.DictReader(archivo)
+
+
+def leer_jsonl(ruta: str, ilegibles: list):
+    """Genera las filas del archivo; las líneas que no son JSON válido no se
+    envían y quedan en `ilegibles` como (posición, mensaje)."""
+    with open(ruta, encoding="utf-8") as archivo:
+        posicion = 0
+        for linea in archivo:
+            if not linea.strip():
+                continue
+            try:
+                yield json.loads(linea)
+            except json.JSONDecodeError as error:
+                ilegibles.append((posicion, f"JSON inválido: {error}"))
+            posicion += 1
+
+
+def _en_archivo(posicion: int, ilegibles: list) -> int:
+    """Posición en el archivo de la fila `posicion` de las enviadas a la carga."""
+    for omitida, _ in ilegibles:
+        if omitida <= posicion:
+            posicion += 1
+    return posicion
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga masiva de la biblioteca")
+    parser.add_argument("tabla", choices=sorted(CARGAS))
+    parser.add_argument("archivo")
+    parser.add_argument(
+        "--formato",
+        choices=["csv", "jsonl"],
+        help="por defecto se deduce de la extensión del archivo",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    formato = args.formato or ("jsonl" if args.archivo.endswith((".jsonl", ".json")) else "csv")
+    ilegibles = []
+    filas = leer_jsonl(args.archivo, ilegibles) if formato == "jsonl" else leer_csv(args.archivo)
+
+    insertados, errores = CARGAS[args.tabla](filas, batch_size=args.batch_size)
+    errores = sorted(
+        [(_en_archivo(posicion, ilegibles), mensaje) for posicion, mensaje in errores] + ilegibles
+    )
+
+    for posicion, mensaje in errores:
+        print(f"Fila {posicion + 1}: {mensaje}", file=sys.stderr)
+    print(f"{insertados} filas insertadas en {args.tabla.upper()}, {len(errores)} con error.")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Migraciones versionadas del esquema de la biblioteca.
+
+Cada migración se aplica una sola vez y queda registrada en SCHEMA_VERSION.
+Las sentencias toleran objetos ya existentes, por lo que se pueden ejecutar
+sobre bases creadas a mano o con versiones anteriores de create_all_tables().
+
+Uso: python migraciones.py
+"""
+import oracledb
+
+from conexion import get_connection
+
+# Errores que indican que el objeto ya existe
+YA_EXISTE = {
+    955,   # ORA-00955: el nombre ya está siendo usado
+    1408,  # ORA-01408: esa lista de columnas ya está indexada
+    2261,  # ORA-02261: ya existe esa llave única o primaria
+    2275,  # ORA-02275: ya existe esa restricción referencial
+    12000,  # ORA-12000: ya existe el log de la vista materializada
+}
+
+# Expresiones del índice de préstamos abiertos. Son NULL en los préstamos
+# devueltos, y Oracle no guarda entradas con todas las columnas NULL: el
+# índice sólo contiene los préstamos abiertos. Las consultas deben usar
+# exactamente estas expresiones para que el optimizador lo elija.
+ABIERTO_FECHA = "CASE WHEN fecha_devolucion IS NULL THEN fecha_prestamo END"
+ABIERTO_LIBRO = "CASE WHEN fecha_devolucion IS NULL THEN idLibro END"
+
+MIGRACIONES = [
+    (
+        1,
+        "Índices de PRESTAMOS y llaves únicas de USUARIOS",
+        [
+            # Cubre la FK idUsuario: evita full scans y el bloqueo de toda
+            # la tabla hija al borrar en USUARIOS
+            "CREATE INDEX PRESTAMOS_USUARIO_IX ON PRESTAMOS (idUsuario)",
+            # idLibro como primera columna también cubre la FK hacia LIBROS
+            "CREATE INDEX PRESTAMOS_LIBRO_DEV_IX "
+            "ON PRESTAMOS (idLibro, fecha_devolucion)",
+            "ALTER TABLE USUARIOS ADD CONSTRAINT USUARIOS_RUT_UK UNIQUE (rut)",
+            "ALTER TABLE USUARIOS ADD CONSTRAINT USUARIOS_CORREO_UK UNIQUE (correo)",
+        ],
+    ),
+    (
+        2,
+        "Índice de préstamos abiertos y conteos de préstamos activos",
+        [
+            f"CREATE INDEX PRESTAMOS_ABIERTOS_IX ON PRESTAMOS ({ABIERTO_FECHA}, {ABIERTO_LIBRO})",
+            # Conteos por usuario y por libro, refrescados en cada commit sólo
+            # con las filas cambiadas (requiere el privilegio CREATE MATERIALIZED VIEW)
+            "CREATE MATERIALIZED VIEW LOG ON PRESTAMOS "
+            "WITH ROWID, SEQUENCE (idUsuario, idLibro, fecha_devolucion) "
+            "INCLUDING NEW VALUES",
+            "CREATE MATERIALIZED VIEW PRESTAMOS_ACTIVOS_USUARIO_MV "
+            "REFRESH FAST ON COMMIT AS "
+            "SELECT idUsuario, COUNT(*) AS activos FROM PRESTAMOS "
+            "WHERE fecha_devolucion IS NULL GROUP BY idUsuario",
+            "CREATE MATERIALIZED VIEW PRESTAMOS_ACTIVOS_LIBRO_MV "
+            "REFRESH FAST ON COMMIT AS "
+            "SELECT idLibro, COUNT(*) AS activos FROM PRESTAMOS "
+            "WHERE fecha_devolucion IS NULL GROUP BY idLibro",
+        ],
+    ),
+    (
+        3,
+        "Tabla PRESTAMOS_HISTORICO para préstamos archivados",
+        [
+            # Sin FK: el historial se conserva aunque se borre el usuario o el
+            # libro. COMPRESS comprime lo que se carga por ruta directa, que es
+            # como inserta archivado.py (APPEND_VALUES)
+            "CREATE TABLE PRESTAMOS_HISTORICO ("
+            "id INTEGER PRIMARY KEY,"
+            "idUsuario INTEGER NOT NULL,"
+            "idLibro INTEGER NOT NULL,"
+            "fecha_prestamo DATE,"
+            "fecha_devolucion DATE,"
+            "archivado DATE DEFAULT SYSDATE"
+            ") COMPRESS",
+            "CREATE INDEX PRESTAMOS_HIST_USUARIO_IX ON PRESTAMOS_HISTORICO (idUsuario) COMPRESS",
+        ],
+    ),
+]
+
+
+def _crear_tabla_versiones(cursor):
+    try:
+        cursor.execute(
+            "CREATE TABLE SCHEMA_VERSION ("
+            "version INTEGER PRIMARY KEY,"
+            "descripcion VARCHAR2(200),"
+            "aplicada DATE DEFAULT SYSDATE"
+            ")"
+        )
+    except oracledb.DatabaseError as error:
+        if error.args[0].code not in YA_EXISTE:
+            raise
+
+
+def _ejecutar(cursor, sentencia: str):
+    try:
+        cursor.execute(sentencia)
+    except oracledb.DatabaseError as error:
+        if error.args[0].code not in YA_EXISTE:
+            raise
+        print(f"  (ya existía) {sentencia}")
+    else:
+        print(f"  {sentencia}")
+
+
+def migrar() -> list:
+    """Aplica en orden las migraciones que falten; retorna las versiones pendientes.
+
+    Las migraciones no dependen entre sí: si una falla (p. ej. ORA-02299 por
+    RUT duplicados, u ORA-01031 sin el privilegio CREATE MATERIALIZED VIEW)
+    queda pendiente y se siguen aplicando las demás.
+    """
+    pendientes = []
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            _crear_tabla_versiones(cursor)
+            cursor.execute("SELECT version FROM SCHEMA_VERSION")
+            aplicadas = {version for (version,) in cursor.fetchall()}
+
+            for version, descripcion, sentencias in MIGRACIONES:
+                if version in aplicadas:
+                    continue
+                print(f"Migración {version}: {descripcion}")
+                try:
+                    for sentencia in sentencias:
+                        _ejecutar(cursor, sentencia)
+                except oracledb.DatabaseError as error:
+                    print(f"Migración {version} no aplicada: {error}")
+                    pendientes.append(version)
+                    continue
+                cursor.execute(
+                    "INSERT INTO SCHEMA_VERSION (version, descripcion) "
+                    "VALUES (:version, :descripcion)",
+                    {"version": version, "descripcion": descripcion},
+                )
+                connection.commit()
+
+    if pendientes:
+        print(f"Migraciones pendientes: {', '.join(map(str, pendientes))}.")
+    else:
+        print(f"Esquema en la versión {MIGRACIONES[-1][0]}.")
+    return pendientes
+
+
+if __name__ == "__main__":
+    migrar()
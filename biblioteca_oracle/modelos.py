@@ -0,0 +1,48 @@
+"""Registros tipados para las filas de USUARIOS, LIBROS y PRESTAMOS.
+
+Son dataclasses con __slots__: ocupan bastante menos memoria que un dict por
+fila y se llenan directamente con cursor.rowfactory. Los nombres de los campos
+coinciden con las columnas, así las consultas listan columnas explícitas en
+vez de depender del orden de SELECT *.
+"""
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(slots=True)
+class Usuario:
+    id: int
+    nombre: Optional[str]
+    rut: Optional[str]
+    correo: Optional[str]
+    tipo_usuario: Optional[str]
+
+
+@dataclass(slots=True)
+class Libro:
+    id: int
+    titulo: Optional[str]
+    autor: Optional[str]
+    anio_publicacion: Optional[int]
+
+
+@dataclass(slots=True)
+class Prestamo:
+    id: int
+    idUsuario: int
+    idLibro: int
+    fecha_prestamo: Optional[datetime]
+    fecha_devolucion: Optional[datetime]
+
+
+MODELOS = {
+    "USUARIOS": Usuario,
+    "LIBROS": Libro,
+    "PRESTAMOS": Prestamo,
+}
+
+
+def columnas(modelo) -> str:
+    """Lista de columnas para un SELECT, en el orden de los campos del modelo."""
+    return ", ".join(campo.name for campo in fields(modelo))
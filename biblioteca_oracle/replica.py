@@ -0,0 +1,220 @@
+"""Réplica local (SQLite) de LIBROS y USUARIOS para lecturas sin ir a Oracle.
+
+Las escrituras siguen yendo a Oracle; la réplica sólo se usa para leer.
+sincronizar() trae las filas con ORA_ROWSCN mayor al último visto (ORA_ROWSCN
+es por bloque salvo con ROWDEPENDENCIES, así que puede traer filas de más,
+nunca de menos) y cada `reconciliar_cada` sincronizaciones compara los id
+para quitar los borrados y recuperar los que falten.
+
+Un id que no está en la réplica no significa que no exista: quien lee debe
+consultar Oracle en ese caso (ver crud_biblioteca.read_*_by_id).
+"""
+import logging
+import sqlite3
+import threading
+from dataclasses import fields
+from datetime import datetime
+from typing import Optional
+
+import oracledb
+
+from conexion import get_connection
+from modelos import MODELOS, columnas
+
+logger = logging.getLogger(__name__)
+
+TABLAS = ("USUARIOS", "LIBROS")
+
+
+class Replica:
+    """Copia local de las tablas del catálogo, alimentada desde Oracle."""
+
+    def __init__(self, ruta: str = ":memory:", reconciliar_cada: int = 10):
+        self.reconciliar_cada = reconciliar_cada
+        self.hits = 0
+        self.misses = 0
+        self._sincronizaciones = 0
+        self._lock = threading.Lock()
+        self._sincronizando = threading.Lock()
+        # Generación de la última invalidación de cada id: una sincronización
+        # no guarda las filas invalidadas después de que empezó su lectura
+        self._generacion = 0
+        self._invalidados = {tabla: {} for tabla in TABLAS}
+        self._detener = threading.Event()
+        self._hilo = None
+        self._conn = sqlite3.connect(ruta, check_same_thread=False)
+        with self._conn:
+            for tabla in TABLAS:
+                campos = [campo.name for campo in fields(MODELOS[tabla])]
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {tabla} "
+                    f"({campos[0]} INTEGER PRIMARY KEY, {', '.join(campos[1:])})"
+                )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS REPLICA_ESTADO ("
+                "tabla TEXT PRIMARY KEY, scn INTEGER NOT NULL, sincronizada TEXT)"
+            )
+
+    # -- lectura -------------------------------------------------------------
+
+    def obtener(self, tabla: str, id: int):
+        """Retorna el registro de la réplica o None si no está."""
+        modelo = MODELOS[tabla]
+        with self._lock:
+            fila = self._conn.execute(
+                f"SELECT {columnas(modelo)} FROM {tabla} WHERE id = ?", (id,)
+            ).fetchone()
+        if fila is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return modelo(*fila)
+
+    def invalidar(self, tabla: str, ids):
+        """Quita ids de la réplica tras escribirlos en Oracle; se releen en Oracle
+        hasta que la próxima sincronización los traiga de vuelta."""
+        if tabla not in TABLAS:
+            return
+        ids = [int(id) for id in ids]
+        with self._lock, self._conn:
+            self._generacion += 1
+            for id in ids:
+                self._invalidados[tabla][id] = self._generacion
+            self._conn.executemany(f"DELETE FROM {tabla} WHERE id = ?", [(id,) for id in ids])
+
+    def estado(self) -> dict:
+        with self._lock:
+            estado = {
+                tabla: {"scn": scn, "sincronizada": sincronizada}
+                for tabla, scn, sincronizada in self._conn.execute(
+                    "SELECT tabla, scn, sincronizada FROM REPLICA_ESTADO"
+                )
+            }
+            for tabla in TABLAS:
+                estado.setdefault(tabla, {"scn": 0, "sincronizada": None})
+                estado[tabla]["filas"] = self._conn.execute(
+                    f"SELECT COUNT(*) FROM {tabla}"
+                ).fetchone()[0]
+        return {**estado, "hits": self.hits, "misses": self.misses}
+
+    # -- sincronización ------------------------------------------------------
+
+    def _scn(self, tabla: str) -> int:
+        fila = self._conn.execute(
+            "SELECT scn FROM REPLICA_ESTADO WHERE tabla = ?", (tabla,)
+        ).fetchone()
+        return fila[0] if fila else 0
+
+    def _guardar(self, tabla: str, filas: list, desde: int):
+        """Inserta o reemplaza filas (columnas del modelo + ORA_ROWSCN al final).
+
+        Omite los id invalidados después de la generación `desde`: la fila
+        leída puede ser anterior a esa escritura.
+        """
+        if not filas:
+            return
+        n = len(filas[0]) - 1
+        marcas = ", ".join("?" * n)
+        with self._lock, self._conn:
+            invalidados = self._invalidados[tabla]
+            filas = [fila for fila in filas if invalidados.get(fila[0], 0) <= desde]
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {tabla} ({columnas(MODELOS[tabla])}) VALUES ({marcas})",
+                [fila[:n] for fila in filas],
+            )
+
+    def _sincronizar_tabla(self, cursor, tabla: str, reconciliar: bool) -> dict:
+        with self._lock:
+            desde = self._generacion
+        scn = self._scn(tabla)
+        nuevo_scn = scn
+        traidas = 0
+        cursor.execute(
+            f"SELECT {columnas(MODELOS[tabla])}, ORA_ROWSCN FROM {tabla} "
+            "WHERE ORA_ROWSCN > :scn",
+            {"scn": scn},
+        )
+        while True:
+            lote = cursor.fetchmany()
+            if not lote:
+                break
+            self._guardar(tabla, lote, desde)
+            traidas += len(lote)
+            nuevo_scn = max(nuevo_scn, max(fila[-1] for fila in lote))
+
+        borradas = recuperadas = 0
+        if reconciliar:
+            remotos = {id for (id,) in cursor.execute(f"SELECT id FROM {tabla}")}
+            with self._lock:
+                locales = {id for (id,) in self._conn.execute(f"SELECT id FROM {tabla}")}
+            sobrantes = locales - remotos
+            self.invalidar(tabla, sobrantes)
+            borradas = len(sobrantes)
+            faltantes = sorted(remotos - locales)
+            for inicio in range(0, len(faltantes), 500):
+                lote_ids = faltantes[inicio:inicio + 500]
+                binds = {f"id{i}": id for i, id in enumerate(lote_ids)}
+                cursor.execute(
+                    f"SELECT {columnas(MODELOS[tabla])}, ORA_ROWSCN FROM {tabla} "
+                    f"WHERE id IN ({', '.join(':' + nombre for nombre in binds)})",
+                    binds,
+                )
+                filas = cursor.fetchall()
+                self._guardar(tabla, filas, desde)
+                recuperadas += len(filas)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO REPLICA_ESTADO (tabla, scn, sincronizada) VALUES (?, ?, ?)",
+                (tabla, nuevo_scn, datetime.now().isoformat(timespec="seconds")),
+            )
+            # Las invalidaciones anteriores a esta lectura ya no hacen falta
+            self._invalidados[tabla] = {
+                id: generacion
+                for id, generacion in self._invalidados[tabla].items()
+                if generacion > desde
+            }
+        return {"traidas": traidas, "borradas": borradas, "recuperadas": recuperadas}
+
+    def sincronizar(self, reconciliar: Optional[bool] = None) -> dict:
+        """Trae los cambios de Oracle; retorna {tabla: {traidas, borradas, recuperadas}}."""
+        if reconciliar is None:
+            reconciliar = self._sincronizaciones % self.reconciliar_cada == 0
+        resultado = {}
+        with self._sincronizando, get_connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.arraysize = 1000
+                for tabla in TABLAS:
+                    resultado[tabla] = self._sincronizar_tabla(cursor, tabla, reconciliar)
+        self._sincronizaciones += 1
+        logger.info("Réplica sincronizada: %s", resultado)
+        return resultado
+
+    def iniciar(self, intervalo: float = 30):
+        """Sincroniza cada `intervalo` segundos en un hilo de fondo.
+
+        Si Oracle no responde, la réplica sigue sirviendo los últimos datos.
+        """
+        if self._hilo is not None:
+            return
+        self._detener.clear()
+
+        def ciclo():
+            while not self._detener.wait(intervalo):
+                try:
+                    self.sincronizar()
+                except oracledb.Error as error:
+                    logger.warning("No se pudo sincronizar la réplica: %s", error)
+
+        self._hilo = threading.Thread(target=ciclo, name="replica-catalogo", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        if self._hilo is not None:
+            self._detener.set()
+            self._hilo.join()
+            self._hilo = None
+
+    def close(self):
+        self.detener()
+        self._conn.close()
@@ -0,0 +1,108 @@
+"""Reportes de préstamos abiertos, vencidos y activos por usuario o libro.
+
+Se apoyan en la migración 2 (ver migraciones.py): los préstamos abiertos se
+leen desde PRESTAMOS_ABIERTOS_IX, que sólo contiene préstamos sin devolver,
+y los conteos salen de las vistas materializadas PRESTAMOS_ACTIVOS_*_MV, que
+Oracle mantiene al día en cada commit. Ninguno recorre el historial completo.
+
+Uso: python reportes.py [días de plazo]
+"""
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from conexion import get_connection
+from migraciones import ABIERTO_FECHA, ABIERTO_LIBRO
+
+PLAZO_DIAS = 14
+
+
+@dataclass(slots=True)
+class PrestamoAbierto:
+    id: int
+    idUsuario: int
+    idLibro: int
+    titulo: Optional[str]
+    fecha_prestamo: Optional[datetime]
+
+    def dias_atraso(self, plazo: int = PLAZO_DIAS, hoy: Optional[datetime] = None) -> int:
+        if self.fecha_prestamo is None:
+            return 0
+        return max(0, ((hoy or datetime.now()) - self.fecha_prestamo).days - plazo)
+
+
+def _abiertos(filtro: str, parametros: dict, limite: Optional[int]) -> list:
+    sql = (
+        "SELECT a.id, a.idUsuario, a.idLibro, l.titulo, a.fecha_prestamo "
+        "FROM (SELECT id, idUsuario, idLibro, fecha_prestamo FROM PRESTAMOS "
+        f"WHERE {filtro}) a "
+        "JOIN LIBROS l ON l.id = a.idLibro "
+        "ORDER BY a.fecha_prestamo, a.id"
+    )
+    if limite is not None:
+        sql += " FETCH FIRST :limite ROWS ONLY"
+        parametros = {**parametros, "limite": limite}
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, parametros)
+            cursor.rowfactory = PrestamoAbierto
+            return cursor.fetchall()
+
+
+def libros_prestados(limite: Optional[int] = None) -> list:
+    """Préstamos sin devolver (libros fuera ahora), del más antiguo al más nuevo."""
+    return _abiertos(f"{ABIERTO_LIBRO} IS NOT NULL", {}, limite)
+
+
+def prestamos_vencidos(
+    plazo: int = PLAZO_DIAS, hoy: Optional[datetime] = None, limite: Optional[int] = None
+) -> list:
+    """Préstamos sin devolver con más de `plazo` días desde fecha_prestamo."""
+    corte = (hoy or datetime.now()) - timedelta(days=plazo)
+    return _abiertos(f"{ABIERTO_FECHA} < :corte", {"corte": corte}, limite)
+
+
+def _activos(vista: str, columna: str, id: Optional[int], limite: int) -> list:
+    if id is not None:
+        sql = f"SELECT {columna}, activos FROM {vista} WHERE {columna} = :id"
+        parametros = {"id": int(id)}
+    else:
+        sql = (
+            f"SELECT {columna}, activos FROM {vista} "
+            f"ORDER BY activos DESC, {columna} FETCH FIRST :limite ROWS ONLY"
+        )
+        parametros = {"limite": limite}
+    with get_connection() as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, parametros)
+            return cursor.fetchall()
+
+
+def prestamos_activos_por_usuario(idUsuario: Optional[int] = None, limite: int = 50) -> list:
+    """[(idUsuario, activos)]: un usuario o los `limite` con más préstamos abiertos.
+
+    Los usuarios sin préstamos abiertos no aparecen (su conteo es 0).
+    """
+    return _activos("PRESTAMOS_ACTIVOS_USUARIO_MV", "idUsuario", idUsuario, limite)
+
+
+def prestamos_activos_por_libro(idLibro: Optional[int] = None, limite: int = 50) -> list:
+    """[(idLibro, activos)]: un libro o los `limite` con más préstamos abiertos."""
+    return _activos("PRESTAMOS_ACTIVOS_LIBRO_MV", "idLibro", idLibro, limite)
+
+
+def imprimir_prestamos(prestamos: list, plazo: Optional[int] = None):
+    if not prestamos:
+        print("No hay préstamos que mostrar.")
+    for p in prestamos:
+        fecha = p.fecha_prestamo.strftime("%d-%m-%Y") if p.fecha_prestamo else "-"
+        atraso = f"  {p.dias_atraso(plazo)} días de atraso" if plazo is not None else ""
+        print(f"Préstamo {p.id}: libro {p.idLibro} '{p.titulo}' a usuario {p.idUsuario} "
+              f"desde {fecha}{atraso}")
+
+
+if __name__ == "__main__":
+    plazo = int(sys.argv[1]) if len(sys.argv) > 1 else PLAZO_DIAS
+    print(f"Préstamos vencidos (plazo {plazo} días):")
+    imprimir_prestamos(prestamos_vencidos(plazo), plazo)
@@ -0,0 +1,219 @@
+"""Driver sustituto en proceso, sobre sqlite3, para medir sin un servidor Oracle.
+
+Imita la parte de python-oracledb que usa crud_biblioteca (pool, conexiones,
+cursores, var(), rowfactory, executemany con batcherrors/arraydmlrowcounts)
+y traduce las pocas construcciones propias de Oracle que aparecen en sus
+sentencias. No reemplaza a Oracle: sirve para comparar versiones del código
+Python con la misma base, sin red ni servidor.
+
+Uso:
+    import conexion, standin
+    conexion.usar_pool(standin.crear_pool())
+"""
+import re
+import sqlite3
+
+import oracledb
+
+from migraciones import ABIERTO_FECHA, ABIERTO_LIBRO
+
+ESQUEMA = [
+    "CREATE TABLE USUARIOS (id INTEGER PRIMARY KEY, nombre TEXT, rut TEXT UNIQUE, "
+    "correo TEXT UNIQUE, tipo_usuario TEXT)",
+    "CREATE TABLE LIBROS (id INTEGER PRIMARY KEY, titulo TEXT, autor TEXT, "
+    "anio_publicacion INTEGER)",
+    "CREATE TABLE PRESTAMOS (id INTEGER PRIMARY KEY, "
+    "idUsuario INTEGER NOT NULL REFERENCES USUARIOS(id), "
+    "idLibro INTEGER NOT NULL REFERENCES LIBROS(id), "
+    "fecha_prestamo TIMESTAMP, fecha_devolucion TIMESTAMP)",
+    "CREATE INDEX PRESTAMOS_USUARIO_IX ON PRESTAMOS (idUsuario)",
+    "CREATE INDEX PRESTAMOS_LIBRO_DEV_IX ON PRESTAMOS (idLibro, fecha_devolucion)",
+    f"CREATE INDEX PRESTAMOS_ABIERTOS_IX ON PRESTAMOS ({ABIERTO_FECHA}, {ABIERTO_LIBRO})",
+    # sqlite no tiene vistas materializadas: vistas comunes con el mismo nombre
+    "CREATE VIEW PRESTAMOS_ACTIVOS_USUARIO_MV AS SELECT idUsuario, COUNT(*) AS activos "
+    "FROM PRESTAMOS WHERE fecha_devolucion IS NULL GROUP BY idUsuario",
+    "CREATE VIEW PRESTAMOS_ACTIVOS_LIBRO_MV AS SELECT idLibro, COUNT(*) AS activos "
+    "FROM PRESTAMOS WHERE fecha_devolucion IS NULL GROUP BY idLibro",
+    "CREATE TABLE PRESTAMOS_HISTORICO (id INTEGER PRIMARY KEY, idUsuario INTEGER NOT NULL, "
+    "idLibro INTEGER NOT NULL, fecha_prestamo TIMESTAMP, fecha_devolucion TIMESTAMP, "
+    "archivado TIMESTAMP DEFAULT CURRENT_TIMESTAMP)",
+    # Lo mínimo del diccionario de datos que consulta archivado.py
+    "CREATE VIEW USER_TABLES AS SELECT name AS table_name, 'NO' AS partitioned "
+    "FROM sqlite_master WHERE type = 'table'",
+]
+
+_RETURNING = re.compile(
+    r"\s+RETURNING\s+([\w\s,]+?)\s+INTO\s+(:\w+(?:\s*,\s*:\w+)*)", re.IGNORECASE
+)
+_FETCH_FIRST = re.compile(r"FETCH\s+FIRST\s+(:\w+|\d+)\s+ROWS\s+ONLY", re.IGNORECASE)
+
+
+def _traducir(sql: str):
+    """Retorna (sql para sqlite, nombres de los binds de RETURNING)."""
+    retorno = []
+    coincidencia = _RETURNING.search(sql)
+    if coincidencia:
+        retorno = [bind.strip().lstrip(":") for bind in coincidencia.group(2).split(",")]
+        sql = _RETURNING.sub(r" RETURNING \1", sql)
+    sql = _FETCH_FIRST.sub(r"LIMIT \1", sql)
+    return sql, retorno
+
+
+class _ErrorLote:
+    def __init__(self, offset: int, message: str):
+        self.offset = offset
+        self.message = message
+
+
+class Var:
+    def __init__(self):
+        self._valores = []
+
+    def getvalue(self, pos: int = 0):
+        # Como en oracledb tras un DML con RETURNING: un valor por fila afectada
+        return self._valores
+
+
+class Cursor:
+    def __init__(self, conexion):
+        self._cursor = conexion._db.cursor()
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self.rowfactory = None
+        self.rowcount = 0
+        self._errores = []
+        self._conteos = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            fila = self.fetchone()
+            if fila is None:
+                return
+            yield fila
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def var(self, *args, **kwargs):
+        return Var()
+
+    def setinputsizes(self, *args, **kwargs):
+        pass
+
+    def _ejecutar(self, sql: str, parametros):
+        sql, retorno = _traducir(sql)
+        parametros = dict(parametros or {})
+        variables = [parametros.pop(nombre) for nombre in retorno]
+        try:
+            self._cursor.execute(sql, parametros)
+            if variables:
+                filas = self._cursor.fetchall()
+        except sqlite3.Error as error:
+            raise oracledb.DatabaseError(str(error)) from error
+        if variables:
+            for posicion, var in enumerate(variables):
+                var._valores = [fila[posicion] for fila in filas]
+            self.rowcount = len(filas)
+        else:
+            self.rowcount = self._cursor.rowcount
+        return not variables and self._cursor.description is not None
+
+    def execute(self, sql: str, parametros=None):
+        """Como en oracledb: retorna el cursor sólo si la sentencia es una consulta."""
+        self.rowfactory = None
+        return self if self._ejecutar(sql, parametros) else None
+
+    def executemany(self, sql: str, filas, batcherrors=False, arraydmlrowcounts=False):
+        self._errores = []
+        self._conteos = []
+        total = 0
+        for offset, parametros in enumerate(filas):
+            try:
+                self._ejecutar(sql, parametros)
+            except oracledb.DatabaseError as error:
+                if not batcherrors:
+                    raise
+                self._errores.append(_ErrorLote(offset, str(error)))
+                self._conteos.append(0)
+                continue
+            self._conteos.append(self.rowcount)
+            total += self.rowcount
+        self.rowcount = total
+
+    def getbatcherrors(self):
+        return self._errores
+
+    def getarraydmlrowcounts(self):
+        return self._conteos
+
+    def _fabricar(self, fila):
+        if fila is None or self.rowfactory is None:
+            return fila
+        return self.rowfactory(*fila)
+
+    def fetchone(self):
+        return self._fabricar(self._cursor.fetchone())
+
+    def fetchmany(self, n=None):
+        return [self._fabricar(f) for f in self._cursor.fetchmany(n or self.arraysize)]
+
+    def fetchall(self):
+        return [self._fabricar(f) for f in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+
+class Conexion:
+    def __init__(self, db):
+        self._db = db
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        self._db.commit()
+
+    def rollback(self):
+        self._db.rollback()
+
+    def close(self):
+        # Igual que en el pool real: cerrar devuelve la conexión, sin cortar la base
+        pass
+
+
+class Pool:
+    def __init__(self, ruta: str = ":memory:"):
+        self._db = sqlite3.connect(
+            ruta, check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.create_function("NVL", 2, lambda a, b: b if a is None else a, deterministic=True)
+
+    def acquire(self):
+        return Conexion(self._db)
+
+    def close(self, force: bool = False):
+        self._db.close()
+
+
+def crear_pool(ruta: str = ":memory:") -> Pool:
+    """Crea un pool sustituto con las tablas de la biblioteca ya creadas."""
+    pool = Pool(ruta)
+    for sentencia in ESQUEMA:
+        pool._db.execute(sentencia)
+    pool._db.commit()
+    return pool
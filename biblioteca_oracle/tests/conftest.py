@@ -0,0 +1,28 @@
+"""Las pruebas corren sobre standin.py (sqlite), sin un servidor Oracle."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import conexion
+import crud_biblioteca
+import standin
+
+
+@pytest.fixture
+def base():
+    """Pool sustituto con las tablas vacías y el índice de búsqueda sin cargar."""
+    pool = standin.crear_pool()
+    conexion.usar_pool(pool)
+    crud_biblioteca._indice_libros = None
+    yield pool
+    crud_biblioteca._indice_libros = None
+    conexion.close_pool()
+
+
+@pytest.fixture
+def contar(base):
+    """contar(tabla): filas de la tabla en la base sustituta."""
+    return lambda tabla: base._db.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
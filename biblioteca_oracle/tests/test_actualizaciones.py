@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pytest
+
+import crud_biblioteca as crud
+
+
+def test_parametros_update_completa_las_columnas_sin_cambio():
+    parametros = crud.parametros_update("PRESTAMOS", "7", {"fecha_devolucion": "15-03-2026"})
+    assert parametros == {
+        "idUsuario": None,
+        "idLibro": None,
+        "fecha_prestamo": None,
+        "fecha_devolucion": datetime(2026, 3, 15),
+        "id": 7,
+    }
+    assert crud.parametros_update("USUARIOS", 1, {"tipo_usuario": "alumno"})["tipo_usuario"] == "ALUMNO"
+
+
+def test_parametros_update_rechaza_columnas_no_editables():
+    with pytest.raises(ValueError, match="id"):
+        crud.parametros_update("LIBROS", 1, {"id": 2})
+    with pytest.raises(ValueError):
+        crud.parametros_update("LIBROS", 1, {"anio_publicacion": "mil"})
+
+
+def test_update_parcial_conserva_las_demas_columnas(base):
+    crud.create_libro("Rayuela", "Julio Cortázar", 1963, id=1)
+    assert crud.update_libro(1, anio_publicacion=1964) == 1
+    assert crud.update_libro(1, titulo="Rayuela (ed. 2)") == 1
+    libro = crud.read_libro_by_id(1)
+    assert (libro.titulo, libro.autor, libro.anio_publicacion) == ("Rayuela (ed. 2)", "Julio Cortázar", 1964)
+
+
+def test_estadisticas_parseo_es_la_diferencia_por_sesion(monkeypatch):
+    lecturas = iter([
+        {(11, "parse count (total)"): 50, (11, "execute count"): 80},
+        {
+            (11, "parse count (total)"): 55,
+            (11, "execute count"): 180,
+            # Sesión abierta después de la línea base: cuenta completa
+            (12, "parse count (total)"): 3,
+            (12, "parse count (hard)"): 1,
+            (12, "execute count"): 20,
+        },
+    ])
+    monkeypatch.setattr(crud, "_leer_parseo", lambda: next(lecturas))
+    monkeypatch.setattr(crud, "_parseo_base", {})
+    crud.marcar_parseo()
+    assert crud.estadisticas_parseo() == {
+        "parse count (total)": 8,
+        "parse count (hard)": 1,
+        "session cursor cache hits": 0,
+        "execute count": 120,
+    }
+
+
+def test_estadisticas_parseo_sin_sesiones_propias(base):
+    # El pool sustituto no registra sesiones: no hay nada que consultar
+    assert crud.estadisticas_parseo() == dict.fromkeys(crud.ESTADISTICAS_PARSEO, 0)
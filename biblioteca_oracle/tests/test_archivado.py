@@ -0,0 +1,77 @@
+import logging
+from datetime import date
+
+import pytest
+
+import archivado
+import crud_biblioteca as crud
+from archivado import restar_meses
+
+HOY = date(2026, 3, 15)
+
+
+@pytest.mark.parametrize("fecha, meses, esperada", [
+    (date(2026, 3, 15), 12, date(2025, 3, 15)),
+    (date(2026, 1, 10), 1, date(2025, 12, 10)),
+    (date(2026, 3, 31), 1, date(2026, 2, 28)),
+    (date(2024, 5, 31), 3, date(2024, 2, 29)),
+    (date(2026, 3, 15), 0, date(2026, 3, 15)),
+])
+def test_restar_meses(fecha, meses, esperada):
+    assert restar_meses(fecha, meses) == esperada
+
+
+@pytest.fixture
+def prestamos(base):
+    crud.bulk_create_usuarios([
+        {"id": 1, "nombre": "Ana", "rut": "1-9", "correo": "ana@x.cl", "tipo_usuario": "alumno"},
+    ])
+    crud.bulk_create_libros([
+        {"id": 10, "titulo": "Rayuela", "autor": "Julio Cortázar", "anio_publicacion": 1963},
+    ])
+    crud.bulk_create_prestamos([
+        # Devueltos y anteriores al corte (15-03-2025): se archivan
+        {"id": 1, "idUsuario": 1, "idLibro": 10, "fecha_prestamo": "02-01-2025",
+         "fecha_devolucion": "10-01-2025"},
+        {"id": 2, "idUsuario": 1, "idLibro": 10, "fecha_prestamo": "20-01-2025",
+         "fecha_devolucion": "01-02-2025"},
+        {"id": 3, "idUsuario": 1, "idLibro": 10, "fecha_prestamo": "05-02-2025",
+         "fecha_devolucion": "12-02-2025"},
+        # Antiguo pero sin devolver, y devuelto pero reciente: se quedan
+        {"id": 4, "idUsuario": 1, "idLibro": 10, "fecha_prestamo": "01-12-2024"},
+        {"id": 5, "idUsuario": 1, "idLibro": 10, "fecha_prestamo": "01-03-2026",
+         "fecha_devolucion": "10-03-2026"},
+    ])
+
+
+def ids(base, tabla):
+    return [fila[0] for fila in base._db.execute(f"SELECT id FROM {tabla} ORDER BY id")]
+
+
+def test_archivar_mueve_los_devueltos_antiguos_por_lotes(base, prestamos):
+    assert archivado.archivar(12, lote=2, hoy=HOY) == 3
+    assert ids(base, "PRESTAMOS") == [4, 5]
+    assert ids(base, "PRESTAMOS_HISTORICO") == [1, 2, 3]
+    fila = base._db.execute(
+        "SELECT idUsuario, idLibro, fecha_prestamo, fecha_devolucion "
+        "FROM PRESTAMOS_HISTORICO WHERE id = 2"
+    ).fetchone()
+    assert fila[:2] == (1, 10)
+    assert (fila[2].date(), fila[3].date()) == (date(2025, 1, 20), date(2025, 2, 1))
+
+    assert archivado.archivar(12, lote=2, hoy=HOY) == 0
+
+
+def test_no_elimina_particiones_si_prestamos_tiene_log(base, prestamos, caplog):
+    # PRESTAMOS particionada y con log de vista materializada (migración 2)
+    base._db.execute("DROP VIEW USER_TABLES")
+    base._db.execute(
+        "CREATE VIEW USER_TABLES AS SELECT name AS table_name, "
+        "CASE name WHEN 'PRESTAMOS' THEN 'YES' ELSE 'NO' END AS partitioned "
+        "FROM sqlite_master WHERE type = 'table'"
+    )
+    base._db.execute("CREATE VIEW USER_MVIEW_LOGS AS SELECT 'PRESTAMOS' AS master")
+    with caplog.at_level(logging.INFO, logger="archivado"):
+        assert archivado.archivar(12, lote=10, hoy=HOY) == 3
+    assert "no se eliminan particiones" in caplog.text
+    assert "partición de" not in caplog.text
@@ -0,0 +1,128 @@
+import pytest
+
+import crud_biblioteca as crud
+from busqueda import IndiceTrigramas, normalizar
+from conexion import TransaccionFallida, despues_del_commit, transaction
+from modelos import Libro
+
+LIBROS = [
+    Libro(1, "Ficciones", "Jorge Luis Borges", 1944),
+    Libro(2, "El Aleph", "Jorge Luis Borges", 1949),
+    Libro(3, "Rayuela", "Julio Cortázar", 1963),
+    Libro(4, "Cien años de soledad", "Gabriel García Márquez", 1967),
+    Libro(5, "Borges y yo", "Alguien Más", 2001),
+    Libro(6, "Antología de Cortázar", "Varios", 1990),
+]
+
+
+def indice():
+    indice = IndiceTrigramas()
+    indice.agregar(LIBROS)
+    return indice
+
+
+def ids(resultados):
+    return [libro.id for _, libro in resultados]
+
+
+def test_normalizar_quita_tildes_y_mayusculas():
+    assert normalizar("  Julio   CORTÁZAR ") == "julio cortazar"
+
+
+def test_orden_prefijo_de_campo_palabra_y_subcadena():
+    # "Borges y yo" empieza con la consulta; en los otros es una palabra del autor
+    assert ids(indice().buscar("borges")) == [5, 2, 1]
+    puntajes = [puntaje for puntaje, _ in indice().buscar("cortazar")]
+    assert puntajes == [3.0, 3.0]
+
+
+def test_tolera_errores_de_tipeo():
+    assert ids(indice().buscar("rayuala")) == [3]
+    assert ids(indice().buscar("rayuala", errores=0)) == []
+    puntaje, _ = indice().buscar("soledda")[0]
+    assert 0 < puntaje < 2
+
+
+def test_consulta_corta_no_tolera_errores():
+    assert ids(indice().buscar("ra")) == [3]
+    assert indice().buscar("x") == []
+
+
+def test_actualizar_y_quitar():
+    indice_ = indice()
+    indice_.actualizar(3, {"titulo": "Los premios", "autor": None})
+    assert ids(indice_.buscar("rayuela")) == []
+    assert ids(indice_.buscar("premios")) == [3]
+    assert indice_.buscar("premios")[0][1].autor == "Julio Cortázar"
+
+    indice_.quitar([1, 2])
+    assert ids(indice_.buscar("borges")) == [5]
+    indice_.compactar()
+    assert indice_.estadisticas()["obsoletas"] == 0
+    assert ids(indice_.buscar("borges")) == [5]
+
+
+def test_limite():
+    assert ids(indice().buscar("borges", limite=2)) == [5, 2]
+
+
+# ---------------------------------------------------------
+# Índice de crud_biblioteca sobre la base sustituta
+# ---------------------------------------------------------
+
+def test_despues_del_commit_se_descarta_con_rollback(base):
+    llamadas = []
+    despues_del_commit(lambda: llamadas.append("fuera"))
+    with transaction():
+        despues_del_commit(lambda: llamadas.append("confirmada"))
+        assert llamadas == ["fuera"]
+    with pytest.raises(RuntimeError):
+        with transaction():
+            despues_del_commit(lambda: llamadas.append("revertida"))
+            raise RuntimeError("corte")
+    assert llamadas == ["fuera", "confirmada"]
+
+
+def test_indice_de_busqueda_no_ve_lo_revertido(base):
+    crud.create_libro("Ficciones", "Jorge Luis Borges", 1944, id=1)
+    assert len(crud.buscar_libros("borges")) == 1
+    with pytest.raises(TransaccionFallida):
+        with transaction():
+            crud.create_libro("El Aleph", "Jorge Luis Borges", 1949, id=2)
+            crud.update_libro(1, titulo="Artificios")
+            crud.create_libro("Duplicado", "Nadie", 2000, id=1)
+    assert [libro.titulo for _, libro in crud.buscar_libros("borges")] == ["Ficciones"]
+
+    crud.update_libro(1, anio_publicacion=1945)
+    assert [libro.anio_publicacion for _, libro in crud.buscar_libros("borges")] == [1945]
+
+
+def test_recarga_trae_cambios_de_otros_procesos(base):
+    crud.create_libro("Ficciones", "Jorge Luis Borges", 1944, id=1)
+    assert ids(crud.buscar_libros("borges")) == [1]
+    # Como si los escribiera importar.py: directo en la base, sin pasar por el índice
+    base._db.execute(
+        "INSERT INTO LIBROS (id, titulo, autor, anio_publicacion) "
+        "VALUES (2, 'El Aleph', 'Jorge Luis Borges', 1949)"
+    )
+    base._db.execute("DELETE FROM LIBROS WHERE id = 1")
+    base._db.commit()
+    assert ids(crud.buscar_libros("borges")) == [1]
+
+    crud.recargar_indice_libros()
+    assert ids(crud.buscar_libros("borges")) == [2]
+
+
+def test_recarga_repite_los_cambios_propios_hechos_mientras_carga(base, monkeypatch):
+    crud.create_libro("Ficciones", "Jorge Luis Borges", 1944, id=1)
+    crud.buscar_libros("borges")
+    cargar = crud._cargar_indice
+
+    def cargar_y_escribir():
+        indice_ = cargar()
+        crud.create_libro("El Aleph", "Jorge Luis Borges", 1949, id=2)
+        return indice_
+
+    monkeypatch.setattr(crud, "_cargar_indice", cargar_y_escribir)
+    crud.recargar_indice_libros()
+    assert sorted(ids(crud.buscar_libros("borges"))) == [1, 2]
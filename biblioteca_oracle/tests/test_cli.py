@@ -0,0 +1,59 @@
+import io
+import json
+
+import cli
+
+
+def lineas(*operaciones):
+    return io.StringIO("".join(
+        (op if isinstance(op, str) else json.dumps(op)) + "\n" for op in operaciones
+    ))
+
+
+def libro(id, titulo="Rayuela"):
+    datos = {"id": id, "titulo": titulo, "autor": "Julio Cortázar", "anio_publicacion": 1963}
+    return {"op": "create", "tabla": "libros", "datos": datos}
+
+
+def ejecutar_batch(entrada, lote):
+    salida = io.StringIO()
+    errores = cli.batch(entrada, salida, lote)
+    return errores, [json.loads(linea) for linea in salida.getvalue().splitlines()]
+
+
+def test_batch_reintenta_linea_por_linea(contar):
+    errores, resultados = ejecutar_batch(
+        lineas(libro(1), libro(2), libro(1, "Repetido"), libro(3)), lote=10
+    )
+    assert errores == 1
+    assert [(r["linea"], r["ok"]) for r in resultados] == [
+        (1, True), (2, True), (3, False), (4, True)
+    ]
+    assert "UNIQUE" in resultados[2]["error"]
+    assert contar("LIBROS") == 3
+
+
+def test_batch_indexa_una_vez_lo_reintentado(base):
+    cli.crud.buscar_libros("rayuela")
+    ejecutar_batch(lineas(libro(1), libro(1, "Repetido"), libro(2)), lote=10)
+    assert sorted(l.id for _, l in cli.crud.buscar_libros("rayuela")) == [1, 2]
+    assert cli.crud.indice_libros().estadisticas()["libros"] == 2
+
+
+def test_batch_json_invalido_respeta_el_orden(base):
+    errores, resultados = ejecutar_batch(
+        lineas(libro(1), "{roto", {"op": "get", "tabla": "libros", "id": 1}), lote=10
+    )
+    assert errores == 1
+    assert [r["linea"] for r in resultados] == [1, 2, 3]
+    assert resultados[1]["error"].startswith("JSON inválido")
+    assert resultados[2]["fila"]["titulo"] == "Rayuela"
+
+
+def test_batch_operacion_desconocida(base):
+    errores, resultados = ejecutar_batch(
+        lineas({"op": "truncate", "tabla": "libros"}, {"op": "get", "tabla": "socios", "id": 1}),
+        lote=10,
+    )
+    assert errores == 2
+    assert [r["ok"] for r in resultados] == [False, False]
@@ -0,0 +1,49 @@
+import crud_biblioteca as crud
+import importar
+
+
+def test_bulk_create_libros_informa_filas_invalidas_por_posicion(contar):
+    filas = [
+        {"id": 1, "titulo": "Rayuela", "autor": "Julio Cortázar", "anio_publicacion": "1963"},
+        {"id": 2, "titulo": "Sin autor"},
+        {"id": 1, "titulo": "Repetido", "autor": "X"},
+        {"id": 3, "titulo": "Ficciones", "autor": "Jorge Luis Borges", "anio_publicacion": ""},
+    ]
+    insertados, errores = crud.bulk_create_libros(filas, batch_size=2)
+    assert insertados == 2
+    assert [posicion for posicion, _ in errores] == [1, 2]
+    assert errores[0][1] == "fila inválida: 'autor'"
+    assert contar("LIBROS") == 2
+
+
+def test_importar_jsonl_sigue_tras_lineas_ilegibles(contar, tmp_path, capsys):
+    archivo = tmp_path / "libros.jsonl"
+    archivo.write_text(
+        '{"id": 1, "titulo": "Rayuela", "autor": "Cortázar"}\n'
+        "{roto\n"
+        "\n"
+        '{"id": 1, "titulo": "Repetido", "autor": "X"}\n'
+        "no es json\n"
+        '{"id": 2, "titulo": "Ficciones", "autor": "Borges"}\n',
+        encoding="utf-8",
+    )
+    assert importar.main(["libros", str(archivo), "--batch-size", "2"]) == 1
+    salida = capsys.readouterr()
+    assert [linea.split(":")[0] for linea in salida.err.splitlines()] == [
+        "Fila 2", "Fila 3", "Fila 4"
+    ]
+    assert "JSON inválido" in salida.err.splitlines()[0]
+    assert "2 filas insertadas en LIBROS, 3 con error." in salida.out
+    assert contar("LIBROS") == 2
+
+
+def test_importar_csv(contar, tmp_path):
+    archivo = tmp_path / "usuarios.csv"
+    archivo.write_text(
+        "id,nombre,rut,correo,tipo_usuario\n"
+        "1,Ana,1-9,ana@x.cl,alumno\n"
+        "2,Luis,2-7,luis@x.cl,docente\n",
+        encoding="utf-8",
+    )
+    assert importar.main(["usuarios", str(archivo)]) == 0
+    assert contar("USUARIOS") == 2
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+import crud_biblioteca as crud
+
+
+def cargar_libros(n: int):
+    crud.bulk_create_libros(
+        ({"id": id, "titulo": f"Libro {id}", "autor": "Autor"} for id in range(1, n + 1)),
+        batch_size=100,
+    )
+
+
+def test_lotes_por_llave_cruzan_los_limites(base):
+    cargar_libros(25)
+    lotes = list(crud.iter_libros_lotes(batch_size=10))
+    assert [len(lote) for lote in lotes] == [10, 10, 5]
+    assert [libro.id for lote in lotes for libro in lote] == list(range(1, 26))
+
+
+def test_lote_exacto_termina_con_una_consulta_vacia(base):
+    cargar_libros(20)
+    assert [len(lote) for lote in crud.iter_libros_lotes(batch_size=10)] == [10, 10]
+
+
+def test_desde_id(base):
+    cargar_libros(12)
+    assert [libro.id for libro in crud.iter_libros(batch_size=5, desde_id=9)] == [10, 11, 12]
+
+
+def test_filtro_donde_con_parametros(base):
+    crud.bulk_create_usuarios(
+        [{"id": 1, "nombre": "Ana", "rut": "1-9", "correo": "a@x.cl", "tipo_usuario": "alumno"}]
+    )
+    cargar_libros(1)
+    crud.bulk_create_prestamos(
+        {"id": id, "idUsuario": 1, "idLibro": 1, "fecha_prestamo": f"{dia:02d}-03-2026"}
+        for id, dia in enumerate([3, 10, 12, 20, 25, 28, 1], start=1)
+    )
+    prestamos = crud.iter_prestamos(
+        batch_size=2,
+        donde="fecha_prestamo >= :desde",
+        parametros={"desde": datetime(2026, 3, 12)},
+    )
+    assert [p.id for p in prestamos] == [3, 4, 5, 6]
@@ -0,0 +1,48 @@
+import crud_biblioteca as crud
+
+
+def preparar_base():
+    crud.bulk_create_usuarios([
+        {"id": 1, "nombre": "Ana", "rut": "1-9", "correo": "a@x.cl", "tipo_usuario": "alumno"},
+        {"id": 2, "nombre": "Luis", "rut": "2-7", "correo": "l@x.cl", "tipo_usuario": "docente"},
+        {"id": 3, "nombre": "Eva", "rut": "3-5", "correo": "e@x.cl", "tipo_usuario": "alumno"},
+    ])
+    crud.bulk_create_libros([{"id": 10, "titulo": "Rayuela", "autor": "Cortázar"}])
+    crud.bulk_create_prestamos(
+        [{"id": 100, "idUsuario": 1, "idLibro": 10, "fecha_prestamo": "01-03-2026"}]
+    )
+
+
+def test_bulk_update_resultado_por_id(base):
+    preparar_base()
+    resultados = crud.bulk_update_usuarios({
+        1: {"nombre": "Ana María"},
+        2: {"correo": "a@x.cl"},  # repite el correo de Ana
+        9: {"nombre": "Nadie"},
+    })
+    assert resultados[1] == 1
+    assert "UNIQUE" in resultados[2]
+    assert resultados[9] == 0
+    assert crud.read_usuario_by_id(1).nombre == "Ana María"
+    assert crud.read_usuario_by_id(2).correo == "l@x.cl"
+
+
+def test_bulk_update_conserva_las_columnas_en_none(base):
+    preparar_base()
+    assert crud.bulk_update_prestamos({100: {"fecha_devolucion": "15-03-2026"}}) == {100: 1}
+    prestamo = crud.read_prestamo_by_id(100)
+    assert prestamo.idUsuario == 1
+    assert prestamo.fecha_devolucion.day == 15
+
+
+def test_bulk_delete_informa_el_error_de_llave_foranea(base, contar):
+    preparar_base()
+    resultados = crud.bulk_delete_usuarios([1, 2, 3, 9])
+    assert "FOREIGN KEY" in resultados[1]
+    assert (resultados[2], resultados[3], resultados[9]) == (1, 1, 0)
+    assert contar("USUARIOS") == 1
+
+
+def test_bulk_vacio(base):
+    assert crud.bulk_update_libros({}) == {}
+    assert crud.bulk_delete_libros([]) == {}
@@ -0,0 +1,47 @@
+import pytest
+
+import crud_biblioteca as crud
+from conexion import transaction
+from replica import Replica
+
+
+@pytest.fixture
+def replica(base):
+    replica = Replica()
+    crud._replica = replica
+    yield replica
+    crud._replica = None
+    replica.close()
+
+
+def fila(id, titulo, scn=1):
+    # Como las trae sincronizar(): columnas del modelo y ORA_ROWSCN al final
+    return (id, titulo, "Autor", 2000, scn)
+
+
+def test_lee_por_id_desde_la_replica_y_si_falta_desde_oracle(replica):
+    crud.create_libro("En Oracle", "Autor", 2000, id=2)
+    replica._guardar("LIBROS", [fila(1, "En la réplica")], replica._generacion)
+    assert crud.read_libro_by_id(1).titulo == "En la réplica"
+    assert crud.read_libro_by_id(2).titulo == "En Oracle"
+    assert (replica.hits, replica.misses) == (1, 1)
+
+
+def test_sincronizacion_no_repone_filas_invalidadas_durante_su_lectura(replica):
+    desde = replica._generacion
+    replica.invalidar("LIBROS", [1])
+    replica._guardar("LIBROS", [fila(1, "Antiguo"), fila(2, "Otro")], desde)
+    assert replica.obtener("LIBROS", 1) is None
+    assert replica.obtener("LIBROS", 2).titulo == "Otro"
+    replica._guardar("LIBROS", [fila(1, "Nuevo", 2)], replica._generacion)
+    assert replica.obtener("LIBROS", 1).titulo == "Nuevo"
+
+
+def test_lee_lo_propio_tras_el_commit(replica):
+    crud.create_libro("Antiguo", "Autor", 2000, id=1)
+    replica._guardar("LIBROS", [fila(1, "Antiguo")], replica._generacion)
+    with transaction():
+        crud.update_libro(1, titulo="Nuevo")
+        # Una sincronización que lee antes del commit trae la fila antigua
+        replica._guardar("LIBROS", [fila(1, "Antiguo")], replica._generacion)
+    assert crud.read_libro_by_id(1).titulo == "Nuevo"
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+
+import crud_biblioteca as crud
+import reportes
+
+HOY = datetime(2024, 3, 31)
+
+
+@pytest.fixture
+def prestamos(base):
+    crud.bulk_create_usuarios([
+        {"id": 1, "nombre": "Ana", "rut": "1-9", "correo": "ana@x.cl", "tipo_usuario": "alumno"},
+        {"id": 2, "nombre": "Beto", "rut": "2-7", "correo": "beto@x.cl", "tipo_usuario": "docente"},
+    ])
+    crud.bulk_create_libros([
+        {"id": 10, "titulo": "Rayuela", "autor": "Julio Cortázar", "anio_publicacion": 1963},
+        {"id": 11, "titulo": "Ficciones", "autor": "Jorge Luis Borges", "anio_publicacion": 1944},
+        {"id": 12, "titulo": "El Aleph", "autor": "Jorge Luis Borges", "anio_publicacion": 1949},
+    ])
+    crud.bulk_create_prestamos([
+        {"id": 100, "idUsuario": 1, "idLibro": 10, "fecha_prestamo": "01-03-2024"},
+        {"id": 101, "idUsuario": 1, "idLibro": 11, "fecha_prestamo": "25-03-2024"},
+        {"id": 102, "idUsuario": 2, "idLibro": 10, "fecha_prestamo": "10-03-2024"},
+        {"id": 103, "idUsuario": 2, "idLibro": 12, "fecha_prestamo": "01-02-2024",
+         "fecha_devolucion": "15-02-2024"},
+    ])
+
+
+def ids(prestamos):
+    return [p.id for p in prestamos]
+
+
+def test_libros_prestados_excluye_los_devueltos(prestamos):
+    abiertos = reportes.libros_prestados()
+    assert ids(abiertos) == [100, 102, 101]
+    assert [p.titulo for p in abiertos] == ["Rayuela", "Rayuela", "Ficciones"]
+    assert ids(reportes.libros_prestados(limite=1)) == [100]
+
+
+def test_prestamos_vencidos_segun_plazo(prestamos):
+    assert ids(reportes.prestamos_vencidos(14, hoy=HOY)) == [100, 102]
+    assert ids(reportes.prestamos_vencidos(25, hoy=HOY)) == [100]
+    assert reportes.prestamos_vencidos(60, hoy=HOY) == []
+
+
+def test_dias_atraso(prestamos):
+    atrasos = {p.id: p.dias_atraso(14, hoy=HOY) for p in reportes.libros_prestados()}
+    assert atrasos == {100: 16, 102: 7, 101: 0}
+    sin_fecha = reportes.PrestamoAbierto(1, 1, 1, None, None)
+    assert sin_fecha.dias_atraso(hoy=HOY) == 0
+
+
+def test_activos_por_usuario_y_por_libro(prestamos):
+    assert reportes.prestamos_activos_por_usuario() == [(1, 2), (2, 1)]
+    assert reportes.prestamos_activos_por_usuario(2) == [(2, 1)]
+    assert reportes.prestamos_activos_por_libro() == [(10, 2), (11, 1)]
+    assert reportes.prestamos_activos_por_libro(limite=1) == [(10, 2)]
+    # Sin préstamos abiertos el libro no aparece
+    assert reportes.prestamos_activos_por_libro(12) == []
+
+
+def test_devolver_cierra_el_prestamo(prestamos):
+    crud.update_prestamo(100, fecha_devolucion="31-03-2024")
+    assert ids(reportes.libros_prestados()) == [102, 101]
+    assert reportes.prestamos_activos_por_usuario(1) == [(1, 1)]
@@ -0,0 +1,32 @@
+import pytest
+
+import crud_biblioteca as crud
+from conexion import TransaccionFallida, transaction
+
+
+def test_error_dentro_del_bloque_revierte_todo(contar):
+    crud.create_usuario("Ana", "1-9", "ana@x.cl", "alumno", id=1)
+    with pytest.raises(TransaccionFallida):
+        with transaction():
+            crud.create_libro("Rayuela", "Julio Cortázar", 1963, id=10)
+            # RUT repetido: create_usuario imprime el error y retorna None
+            assert crud.create_usuario("Otra", "1-9", "otra@x.cl", "alumno", id=2) is None
+    assert contar("USUARIOS") == 1
+    assert contar("LIBROS") == 0
+
+
+def test_excepcion_dentro_del_bloque_revierte_todo(contar):
+    with pytest.raises(RuntimeError):
+        with transaction():
+            crud.create_libro("Rayuela", "Julio Cortázar", 1963, id=10)
+            raise RuntimeError("corte")
+    assert contar("LIBROS") == 0
+
+
+def test_bloque_anidado_se_une_al_exterior(contar):
+    with transaction() as exterior:
+        with transaction() as interior:
+            assert interior is exterior
+            crud.create_libro("Rayuela", "Julio Cortázar", 1963, id=10)
+        crud.create_libro("Ficciones", "Jorge Luis Borges", 1944, id=11)
+    assert contar("LIBROS") == 2
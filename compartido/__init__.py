@@ -0,0 +1,9 @@
+"""Código común a biblioteca_oracle y unidad3_indicadores.
+
+Cada unidad se ejecuta desde su propia carpeta (python crud_biblioteca.py,
+python main.py), así que la raíz del repositorio no está en sys.path. El
+conexion.py de cada unidad, que es lo primero que importan sus módulos, la
+agrega una sola vez; después se importa explícitamente:
+
+    from compartido import instrumentacion
+"""
@@ -0,0 +1,260 @@
+"""Instrumentación de consultas: tiempos, filas y registro de consultas lentas.
+
+instrumentar() envuelve una conexión del pool; sus cursores miden cada
+sentencia (ejecución + fetch) y lo acumulan en un histograma por texto SQL.
+Las sentencias que superan SLOW_QUERY_MS (200 ms por defecto) se escriben
+en el logger "consultas_lentas". resumen() y prometheus() exponen los datos.
+
+Lo usan biblioteca_oracle y unidad3_indicadores (ver compartido/__init__.py).
+"""
+import logging
+import os
+import re
+import threading
+import time
+
+UMBRAL_LENTO_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+LIMITES_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+logger_lento = logging.getLogger("consultas_lentas")
+
+activa = os.getenv("INSTRUMENTACION", "1") != "0"
+
+
+class Histograma:
+    __slots__ = ("conteos", "suma", "total", "filas")
+
+    def __init__(self):
+        self.conteos = [0] * (len(LIMITES_MS) + 1)
+        self.suma = 0.0
+        self.total = 0
+        self.filas = 0
+
+    def observar(self, ms: float, filas: int = 0):
+        indice = next((i for i, limite in enumerate(LIMITES_MS) if ms <= limite), len(LIMITES_MS))
+        self.conteos[indice] += 1
+        self.suma += ms
+        self.total += 1
+        self.filas += filas
+
+
+_lock = threading.Lock()
+_sentencias: dict = {}
+_adquisiciones = Histograma()
+
+
+def _normalizar(sql: str) -> str:
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def registrar(sql: str, ms: float, filas: int = 0):
+    sql = _normalizar(sql)
+    with _lock:
+        _sentencias.setdefault(sql, Histograma()).observar(ms, filas)
+    if ms >= UMBRAL_LENTO_MS:
+        logger_lento.warning("%.1f ms, %d filas: %s", ms, filas, sql)
+
+
+def registrar_adquisicion(ms: float):
+    with _lock:
+        _adquisiciones.observar(ms)
+
+
+def reiniciar():
+    global _adquisiciones
+    with _lock:
+        _sentencias.clear()
+        _adquisiciones = Histograma()
+
+
+def _percentil(histograma: Histograma, p: float) -> float:
+    """Cota superior del bucket donde cae el percentil p."""
+    objetivo = histograma.total * p / 100
+    acumulado = 0
+    for limite, conteo in zip(LIMITES_MS + (float("inf"),), histograma.conteos):
+        acumulado += conteo
+        if acumulado >= objetivo:
+            return limite
+    return float("inf")
+
+
+def resumen() -> list:
+    """Estadísticas por sentencia, de mayor a menor tiempo total."""
+    with _lock:
+        filas = [
+            {
+                "sql": sql,
+                "ejecuciones": h.total,
+                "total_ms": round(h.suma, 1),
+                "media_ms": round(h.suma / h.total, 2),
+                "p95_ms": _percentil(h, 95),
+                "filas": h.filas,
+            }
+            for sql, h in _sentencias.items()
+        ]
+    return sorted(filas, key=lambda f: f["total_ms"], reverse=True)
+
+
+def imprimir_resumen(limite: int = 20):
+    with _lock:
+        adquisiciones = (_adquisiciones.total, _adquisiciones.suma)
+    if adquisiciones[0]:
+        print(f"Conexiones obtenidas: {adquisiciones[0]} "
+              f"(media {adquisiciones[1] / adquisiciones[0]:.2f} ms)")
+    print(f"{'ejec':>6} {'total ms':>10} {'media ms':>9} {'p95 ms':>7} {'filas':>8}  sql")
+    for fila in resumen()[:limite]:
+        print(f"{fila['ejecuciones']:>6} {fila['total_ms']:>10.1f} {fila['media_ms']:>9.2f} "
+              f"{fila['p95_ms']:>7} {fila['filas']:>8}  {fila['sql'][:80]}")
+
+
+def _etiqueta(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _lineas_histograma(nombre: str, h: Histograma, etiquetas: str = "") -> list:
+    separador = "," if etiquetas else ""
+    lineas = []
+    acumulado = 0
+    for limite, conteo in zip(LIMITES_MS + ("+Inf",), h.conteos):
+        acumulado += conteo
+        lineas.append(f'{nombre}_bucket{{{etiquetas}{separador}le="{limite}"}} {acumulado}')
+    lineas.append(f"{nombre}_sum{{{etiquetas}}} {h.suma:.3f}")
+    lineas.append(f"{nombre}_count{{{etiquetas}}} {h.total}")
+    return lineas
+
+
+def prometheus() -> str:
+    """Exporta las métricas en el formato de texto de Prometheus."""
+    lineas = [
+        "# HELP oracle_adquisicion_conexion_ms Tiempo para obtener una conexión del pool.",
+        "# TYPE oracle_adquisicion_conexion_ms histogram",
+    ]
+    with _lock:
+        lineas += _lineas_histograma("oracle_adquisicion_conexion_ms", _adquisiciones)
+        lineas += [
+            "# HELP oracle_sentencia_ms Tiempo de ejecución + fetch por sentencia SQL.",
+            "# TYPE oracle_sentencia_ms histogram",
+        ]
+        for sql, h in _sentencias.items():
+            lineas += _lineas_histograma("oracle_sentencia_ms", h, f'sql="{_etiqueta(sql)}"')
+        lineas += [
+            "# HELP oracle_sentencia_filas_total Filas leídas o afectadas por sentencia SQL.",
+            "# TYPE oracle_sentencia_filas_total counter",
+        ]
+        for sql, h in _sentencias.items():
+            lineas.append(f'oracle_sentencia_filas_total{{sql="{_etiqueta(sql)}"}} {h.filas}')
+    return "\n".join(lineas) + "\n"
+
+
+class CursorInstrumentado:
+    """Cursor que mide cada sentencia desde execute hasta el último fetch."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._sql = None
+        self._ms = 0.0
+        self._filas = 0
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def __setattr__(self, nombre, valor):
+        if nombre.startswith("_"):
+            object.__setattr__(self, nombre, valor)
+        else:
+            setattr(self._cursor, nombre, valor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            fila = self.fetchone()
+            if fila is None:
+                return
+            yield fila
+
+    def _cerrar_sentencia(self):
+        if self._sql is not None:
+            registrar(self._sql, self._ms, self._filas)
+            self._sql = None
+
+    def _medir(self, metodo, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            self._ms += (time.perf_counter() - inicio) * 1000
+
+    def execute(self, sql, *args, **kwargs):
+        self._cerrar_sentencia()
+        self._sql, self._ms, self._filas = sql, 0.0, 0
+        resultado = self._medir(self._cursor.execute, sql, *args, **kwargs)
+        if resultado is None:
+            # DML: se cuentan las filas afectadas
+            self._filas = max(self._cursor.rowcount, 0)
+            return None
+        return self
+
+    def executemany(self, sql, *args, **kwargs):
+        self._cerrar_sentencia()
+        self._sql, self._ms, self._filas = sql, 0.0, 0
+        resultado = self._medir(self._cursor.executemany, sql, *args, **kwargs)
+        self._filas = max(self._cursor.rowcount, 0)
+        return resultado
+
+    def fetchone(self):
+        fila = self._medir(self._cursor.fetchone)
+        self._filas += fila is not None
+        return fila
+
+    def fetchmany(self, *args, **kwargs):
+        filas = self._medir(self._cursor.fetchmany, *args, **kwargs)
+        self._filas += len(filas)
+        return filas
+
+    def fetchall(self):
+        filas = self._medir(self._cursor.fetchall)
+        self._filas += len(filas)
+        return filas
+
+    def close(self):
+        self._cerrar_sentencia()
+        self._cursor.close()
+
+
+class ConexionInstrumentada:
+    """Conexión cuyos cursores y commits quedan registrados."""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __getattr__(self, nombre):
+        return getattr(self._connection, nombre)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._connection.close()
+
+    def cursor(self, *args, **kwargs):
+        return CursorInstrumentado(self._connection.cursor(*args, **kwargs))
+
+    def commit(self):
+        inicio = time.perf_counter()
+        self._connection.commit()
+        registrar("COMMIT", (time.perf_counter() - inicio) * 1000)
+
+
+def adquirir(obtener):
+    """Llama obtener() (p. ej. pool.acquire), mide la espera y envuelve la conexión."""
+    if not activa:
+        return obtener()
+    inicio = time.perf_counter()
+    connection = obtener()
+    registrar_adquisicion((time.perf_counter() - inicio) * 1000)
+    return ConexionInstrumentada(connection)
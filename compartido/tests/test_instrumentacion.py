@@ -0,0 +1,50 @@
+import logging
+
+import pytest
+
+from compartido import instrumentacion
+
+
+@pytest.fixture(autouse=True)
+def limpio():
+    instrumentacion.reiniciar()
+    yield
+    instrumentacion.reiniciar()
+
+
+def test_prometheus_histogramas_acumulados():
+    instrumentacion.registrar_adquisicion(0.5)
+    instrumentacion.registrar("SELECT *\n  FROM LIBROS", 3.0, 10)
+    instrumentacion.registrar("SELECT * FROM LIBROS", 30.0, 5)
+    texto = instrumentacion.prometheus()
+    lineas = texto.splitlines()
+
+    assert texto.endswith("\n")
+    assert "# TYPE oracle_adquisicion_conexion_ms histogram" in lineas
+    assert 'oracle_adquisicion_conexion_ms_bucket{le="1"} 1' in lineas
+    assert "oracle_adquisicion_conexion_ms_count{} 1" in lineas
+
+    # Las dos sentencias se normalizan a la misma etiqueta
+    etiqueta = 'sql="SELECT * FROM LIBROS"'
+    assert f'oracle_sentencia_ms_bucket{{{etiqueta},le="1"}} 0' in lineas
+    assert f'oracle_sentencia_ms_bucket{{{etiqueta},le="5"}} 1' in lineas
+    assert f'oracle_sentencia_ms_bucket{{{etiqueta},le="50"}} 2' in lineas
+    assert f'oracle_sentencia_ms_bucket{{{etiqueta},le="+Inf"}} 2' in lineas
+    assert f"oracle_sentencia_ms_sum{{{etiqueta}}} 33.000" in lineas
+    assert f"oracle_sentencia_ms_count{{{etiqueta}}} 2" in lineas
+    assert f"oracle_sentencia_filas_total{{{etiqueta}}} 15" in lineas
+
+
+def test_prometheus_escapa_las_etiquetas():
+    instrumentacion.registrar('SELECT "id" FROM t', 1.0)
+    assert 'oracle_sentencia_filas_total{sql="SELECT \\"id\\" FROM t"} 0' in instrumentacion.prometheus()
+
+
+def test_resumen_y_consultas_lentas(caplog):
+    with caplog.at_level(logging.WARNING, logger="consultas_lentas"):
+        instrumentacion.registrar("SELECT 1 FROM dual", 1.0)
+        instrumentacion.registrar("SELECT 2 FROM dual", instrumentacion.UMBRAL_LENTO_MS + 1, 3)
+    assert [r.getMessage().endswith("SELECT 2 FROM dual") for r in caplog.records] == [True]
+    resumen = instrumentacion.resumen()
+    assert [fila["sql"] for fila in resumen] == ["SELECT 2 FROM dual", "SELECT 1 FROM dual"]
+    assert (resumen[0]["ejecuciones"], resumen[0]["filas"]) == (1, 3)
@@ -0,0 +1,122 @@
+"""Análisis vectorizado de la historia guardada en INDICADORES.
+
+La serie de un indicador se carga con una sola consulta a arreglos NumPy
+(un valor por día) y los cálculos se hacen sobre el arreglo completo, sin
+ciclos por fila. Para rangos muy grandes, resumen_sql() y media_movil_sql()
+hacen la agregación en Oracle y sólo traen el resultado.
+"""
+from datetime import date, timedelta
+from typing import Optional
+
+import numpy as np
+
+from conexion import Database
+
+# Un valor por día: si el mismo día se guardó varias veces, queda la última consulta
+SQL_SERIE = """
+    SELECT TRUNC(fecha_indicador) AS fecha,
+           MAX(valor) KEEP (DENSE_RANK LAST ORDER BY fecha_consulta) AS valor
+    FROM INDICADORES
+    WHERE nombre = :n
+      AND (:desde IS NULL OR fecha_indicador >= :desde)
+      AND (:hasta IS NULL OR fecha_indicador < :hasta)
+    GROUP BY TRUNC(fecha_indicador)
+    ORDER BY fecha
+"""
+
+
+def _filtro(indicador: str, desde: Optional[date], hasta: Optional[date]) -> dict:
+    # hasta es inclusivo: se compara contra el día siguiente
+    return {
+        "n": indicador.lower(),
+        "desde": desde,
+        "hasta": hasta + timedelta(days=1) if hasta else None,
+    }
+
+
+def cargar_serie(db: Database, indicador: str, desde: Optional[date] = None,
+                 hasta: Optional[date] = None) -> tuple[np.ndarray, np.ndarray]:
+    """Retorna (fechas datetime64[D], valores float64) del indicador, ordenados."""
+    filas = db.fetch(SQL_SERIE, _filtro(indicador, desde, hasta))
+    if not filas:
+        return np.array([], dtype="datetime64[D]"), np.array([], dtype=np.float64)
+    fechas, valores = zip(*filas)
+    return np.array(fechas, dtype="datetime64[D]"), np.array(valores, dtype=np.float64)
+
+
+def variacion_diaria(valores: np.ndarray) -> np.ndarray:
+    """Variación porcentual entre observaciones consecutivas (largo n - 1)."""
+    return np.diff(valores) / valores[:-1] * 100
+
+
+def media_movil(valores: np.ndarray, ventana: int) -> np.ndarray:
+    """Media móvil simple; el resultado tiene largo n - ventana + 1."""
+    if len(valores) < ventana:
+        return np.array([], dtype=np.float64)
+    acumulado = np.cumsum(np.insert(valores, 0, 0.0))
+    return (acumulado[ventana:] - acumulado[:-ventana]) / ventana
+
+
+def volatilidad(valores: np.ndarray, ventana: Optional[int] = None) -> np.ndarray | float:
+    """Desviación estándar de la variación diaria, total o móvil por ventana."""
+    variaciones = variacion_diaria(valores)
+    if ventana is None:
+        return float(np.std(variaciones, ddof=1)) if len(variaciones) > 1 else 0.0
+    if len(variaciones) < ventana:
+        return np.array([], dtype=np.float64)
+    ventanas = np.lib.stride_tricks.sliding_window_view(variaciones, ventana)
+    return ventanas.std(axis=1, ddof=1)
+
+
+def uf_a_clp(montos, valor_uf: float | np.ndarray) -> np.ndarray:
+    """Convierte montos en UF a pesos; valor_uf puede ser un escalar o un arreglo."""
+    return np.asarray(montos, dtype=np.float64) * valor_uf
+
+
+def uf_a_clp_en_fechas(montos, fechas_montos, fechas_uf: np.ndarray,
+                       valores_uf: np.ndarray) -> np.ndarray:
+    """Convierte cada monto usando la UF vigente en su fecha (último valor conocido)."""
+    fechas_montos = np.asarray(fechas_montos, dtype="datetime64[D]")
+    indices = np.searchsorted(fechas_uf, fechas_montos, side="right") - 1
+    if np.any(indices < 0):
+        raise ValueError("Hay montos con fecha anterior al primer valor de UF cargado")
+    return uf_a_clp(montos, valores_uf[indices])
+
+
+# ---------------------------------------------------------------------------
+# Agregaciones en la base de datos
+# ---------------------------------------------------------------------------
+
+def resumen_sql(db: Database, indicador: str, periodo: str = "MM",
+                desde: Optional[date] = None, hasta: Optional[date] = None) -> list:
+    """Promedio, mínimo, máximo y desviación por período ('MM' mes, 'Q' trimestre, 'YYYY' año, 'IW' semana)."""
+    if periodo not in ("MM", "YYYY", "IW", "Q"):
+        raise ValueError(f"Período no soportado: {periodo}")
+    return db.fetch(
+        f"""
+        SELECT TRUNC(fecha_indicador, '{periodo}') AS periodo,
+               COUNT(*), AVG(valor), MIN(valor), MAX(valor), STDDEV(valor)
+        FROM INDICADORES
+        WHERE nombre = :n
+          AND (:desde IS NULL OR fecha_indicador >= :desde)
+          AND (:hasta IS NULL OR fecha_indicador < :hasta)
+        GROUP BY TRUNC(fecha_indicador, '{periodo}')
+        ORDER BY periodo
+        """,
+        _filtro(indicador, desde, hasta),
+    )
+
+
+def media_movil_sql(db: Database, indicador: str, ventana: int,
+                    desde: Optional[date] = None, hasta: Optional[date] = None) -> list:
+    """Media móvil calculada con una función analítica de Oracle: [(fecha, valor, media)]."""
+    ventana = int(ventana)
+    return db.fetch(
+        f"""
+        SELECT fecha, valor,
+               AVG(valor) OVER (ORDER BY fecha ROWS BETWEEN {ventana - 1} PRECEDING AND CURRENT ROW)
+        FROM ({SQL_SERIE})
+        ORDER BY fecha
+        """,
+        _filtro(indicador, desde, hasta),
+    )
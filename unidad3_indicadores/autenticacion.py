@@ -1,14 +1,73 @@
+import asyncio
+import atexit
 import bcrypt
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def _hash(password_bytes: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=rounds))
+
+
+def _check(password_bytes: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password_bytes, hashed)
+
 
 class Auth:
-    @staticmethod
-    def hash_password(password: str) -> bytes:
+    # Costo de bcrypt y pool de trabajo; se ajustan con BCRYPT_ROUNDS,
+    # BCRYPT_WORKERS y BCRYPT_POOL=thread|process o con Auth.configurar()
+    rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    workers = int(os.getenv("BCRYPT_WORKERS", str(os.cpu_count() or 2)))
+    modo = os.getenv("BCRYPT_POOL", "thread")
+    _executor: Executor | None = None
+
+    @classmethod
+    def configurar(cls, rounds: int = None, workers: int = None, modo: str = None):
+        cls.cerrar()
+        if rounds is not None:
+            cls.rounds = rounds
+        if workers is not None:
+            cls.workers = workers
+        if modo is not None:
+            cls.modo = modo
+
+    @classmethod
+    def executor(cls) -> Executor:
+        if cls._executor is None:
+            pool = ProcessPoolExecutor if cls.modo == "process" else ThreadPoolExecutor
+            cls._executor = pool(max_workers=cls.workers)
+        return cls._executor
+
+    @classmethod
+    def cerrar(cls):
+        if cls._executor is not None:
+            cls._executor.shutdown()
+            cls._executor = None
+
+    @classmethod
+    def hash_password(cls, password: str) -> bytes:
         password_bytes = password.encode("utf-8")
-        salt = bcrypt.gensalt(rounds=12)
-        return bcrypt.hashpw(password_bytes, salt)
+        return cls.executor().submit(_hash, password_bytes, cls.rounds).result()
 
-    @staticmethod
-    def verify_password(password: str, hashed: bytes) -> bool:
+    @classmethod
+    def verify_password(cls, password: str, hashed: bytes) -> bool:
         password_bytes = password.encode("utf-8")
-        return bcrypt.checkpw(password_bytes, hashed)
+        return cls.executor().submit(_check, password_bytes, hashed).result()
+
+    @classmethod
+    async def hash_password_async(cls, password: str) -> bytes:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls.executor(), _hash, password.encode("utf-8"), cls.rounds)
+
+    @classmethod
+    async def verify_password_async(cls, password: str, hashed: bytes) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls.executor(), _check, password.encode("utf-8"), hashed)
+
+    @classmethod
+    def needs_rehash(cls, hashed: bytes) -> bool:
+        # Formato bcrypt: $2b$<costo>$<salt+hash>
+        return int(hashed.split(b"$")[2]) != cls.rounds
+
 
+atexit.register(Auth.cerrar)
@@ -0,0 +1,71 @@
+"""Carga series históricas de mindicador.cl en la tabla INDICADORES.
+
+Descarga un año completo por petición (/api/{indicador}/{año}) y lo inserta
+con executemany, omitiendo las fechas que ya estén guardadas.
+
+Ejemplos:
+    python backfill.py uf dolar --desde 2015 --hasta 2024
+    python backfill.py --desde 2020
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from conexion import Database
+from indicadores import INDICADORES, IndicadoresEconomicos
+
+SQL_INSERT = """
+    INSERT INTO INDICADORES
+    (nombre, fecha_indicador, valor, fecha_consulta, usuario, fuente)
+    SELECT :n, :f, :v, SYSDATE, :u, 'mindicador.cl' FROM dual
+    WHERE NOT EXISTS (
+        SELECT 1 FROM INDICADORES WHERE nombre = :n AND fecha_indicador = :f
+    )
+"""
+
+
+def backfill(db: Database, api: IndicadoresEconomicos, indicadores: list,
+             desde: int, hasta: int, usuario: str = "backfill") -> int:
+    """Descarga los años pedidos en paralelo y retorna cuántas filas se insertaron."""
+    consultas = [(i, anio) for i in indicadores for anio in range(desde, hasta + 1)]
+    insertadas = 0
+
+    def descargar(consulta):
+        # Un año que falla (404, timeout) se informa y no detiene el resto
+        try:
+            return api.obtener_serie(*consulta), None
+        except Exception as error:
+            return None, error
+
+    with ThreadPoolExecutor(max_workers=api.max_concurrencia) as executor:
+        series = executor.map(descargar, consultas)
+        for (indicador, anio), (serie, error) in zip(consultas, series):
+            if error is not None:
+                print(f"{indicador.upper()} {anio}: error {error}")
+                continue
+            filas = [{"n": indicador, "f": f, "v": v, "u": usuario} for f, v in serie]
+            nuevas = db.execute_many(SQL_INSERT, filas)
+            insertadas += nuevas
+            print(f"{indicador.upper()} {anio}: {len(filas)} valores, {nuevas} nuevos")
+
+    return insertadas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill de INDICADORES")
+    parser.add_argument("indicadores", nargs="*", help=f"por defecto: {' '.join(INDICADORES)}")
+    parser.add_argument("--desde", type=int, default=date.today().year)
+    parser.add_argument("--hasta", type=int, default=date.today().year)
+    parser.add_argument("--usuario", default="backfill")
+    args = parser.parse_args(argv)
+    desconocidos = set(args.indicadores) - set(INDICADORES)
+    if desconocidos:
+        parser.error(f"indicadores desconocidos: {', '.join(sorted(desconocidos))}")
+
+    total = backfill(Database(), IndicadoresEconomicos(), args.indicadores or INDICADORES,
+                     args.desde, args.hasta, args.usuario)
+    print(f"Total insertado: {total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compara analitica.py (NumPy) contra el mismo cálculo con un ciclo por fila.
+
+No necesita base de datos: usa una serie sintética de n días.
+Uso: python bench_analitica.py [dias] [ventana]
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import analitica
+
+
+def con_ciclos(valores: list, ventana: int, montos: list):
+    variaciones = [(valores[i] - valores[i - 1]) / valores[i - 1] * 100 for i in range(1, len(valores))]
+    medias = [sum(valores[i:i + ventana]) / ventana for i in range(len(valores) - ventana + 1)]
+    volatilidades = [statistics.stdev(variaciones[i:i + ventana])
+                     for i in range(len(variaciones) - ventana + 1)]
+    pesos = [monto * uf for monto, uf in zip(montos, valores)]
+    return variaciones, medias, volatilidades, pesos
+
+
+def vectorizado(valores: np.ndarray, ventana: int, montos: np.ndarray):
+    return (
+        analitica.variacion_diaria(valores),
+        analitica.media_movil(valores, ventana),
+        analitica.volatilidad(valores, ventana),
+        analitica.uf_a_clp(montos, valores),
+    )
+
+
+def medir(funcion, *args) -> float:
+    inicio = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - inicio
+
+
+def main():
+    dias = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ventana = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+
+    rng = np.random.default_rng(0)
+    valores = 30000 * np.cumprod(1 + rng.normal(0, 0.001, dias))
+    montos = rng.uniform(1, 100, dias)
+
+    python = medir(con_ciclos, valores.tolist(), ventana, montos.tolist())
+    numpy = medir(vectorizado, valores, ventana, montos)
+
+    print(f"{dias} días, ventana {ventana}")
+    print(f"ciclo por fila: {python * 1000:10.2f} ms")
+    print(f"NumPy         : {numpy * 1000:10.2f} ms  ({python / numpy:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
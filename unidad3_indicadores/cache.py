@@ -0,0 +1,98 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def _restante(expira: Optional[float]) -> Optional[float]:
+    return max(0.0, expira - time.time()) if expira is not None else None
+
+
+class CacheLRU:
+    """Caché en memoria con expiración por entrada y desalojo LRU."""
+
+    def __init__(self, capacidad: int = 256):
+        self.capacidad = capacidad
+        self.hits = 0
+        self.misses = 0
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave: str) -> tuple[bool, Any]:
+        hit, valor, _ = self.get_con_ttl(clave)
+        return hit, valor
+
+    def get_con_ttl(self, clave: str) -> tuple[bool, Any, Optional[float]]:
+        """Como get(), más los segundos de vigencia que le quedan (None = no expira)."""
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None or (entrada[1] is not None and entrada[1] < time.time()):
+                self._datos.pop(clave, None)
+                self.misses += 1
+                return False, None, None
+            self._datos.move_to_end(clave)
+            self.hits += 1
+            return True, entrada[0], _restante(entrada[1])
+
+    def set(self, clave: str, valor: Any, ttl: Optional[float] = None):
+        """Guarda un valor; ttl=None significa que no expira."""
+        expira = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._datos[clave] = (valor, expira)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def estadisticas(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "entradas": len(self._datos)}
+
+
+class CacheSQLite:
+    """Caché persistente en un archivo SQLite, con la misma interfaz que CacheLRU."""
+
+    def __init__(self, ruta: str = "indicadores_cache.sqlite3"):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(ruta, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "clave TEXT PRIMARY KEY, valor TEXT NOT NULL, expira REAL)"
+        )
+        # Las entradas vencidas de ejecuciones anteriores no se volverán a leer
+        with self._conn:
+            self._conn.execute("DELETE FROM cache WHERE expira < ?", (time.time(),))
+
+    def get(self, clave: str) -> tuple[bool, Any]:
+        hit, valor, _ = self.get_con_ttl(clave)
+        return hit, valor
+
+    def get_con_ttl(self, clave: str) -> tuple[bool, Any, Optional[float]]:
+        """Como get(), más los segundos de vigencia que le quedan (None = no expira)."""
+        with self._lock:
+            fila = self._conn.execute(
+                "SELECT valor, expira FROM cache WHERE clave = ?", (clave,)
+            ).fetchone()
+            if fila is None or (fila[1] is not None and fila[1] < time.time()):
+                if fila is not None:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM cache WHERE clave = ?", (clave,))
+                self.misses += 1
+                return False, None, None
+            self.hits += 1
+            return True, json.loads(fila[0]), _restante(fila[1])
+
+    def set(self, clave: str, valor: Any, ttl: Optional[float] = None):
+        expira = time.time() + ttl if ttl is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (clave, valor, expira) VALUES (?, ?, ?)",
+                (clave, json.dumps(valor), expira),
+            )
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            entradas = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entradas": entradas}
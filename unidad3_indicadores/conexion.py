@@ -1,8 +1,14 @@
+import atexit
 import oracledb
 import os
+import sys
 from dotenv import load_dotenv
 from typing import Optional
 
+# Raíz del repositorio, para el paquete compartido (ver compartido/__init__.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from compartido import instrumentacion
+
 load_dotenv()
 
 class Database:
@@ -10,14 +16,64 @@ class Database:
         self.user = os.getenv("ORACLE_USER")
         self.password = os.getenv("ORACLE_PASSWORD")
         self.dsn = os.getenv("ORACLE_DSN")
+        self.stmtcachesize = int(os.getenv("ORACLE_STMT_CACHE", "40"))
+        self._pool = None
+        atexit.register(self.close)
+
+    def get_pool(self):
+        # Pool pequeño y persistente: cada llamada reutiliza sesiones ya autenticadas
+        if self._pool is None:
+            self._pool = oracledb.create_pool(
+                user=self.user,
+                password=self.password,
+                dsn=self.dsn,
+                min=1,
+                max=int(os.getenv("ORACLE_POOL_MAX", "4")),
+                increment=1,
+                stmtcachesize=self.stmtcachesize,
+            )
+        return self._pool
 
     def get_connection(self):
-        return oracledb.connect(user=self.user, password=self.password, dsn=self.dsn)
+        return instrumentacion.adquirir(self.get_pool().acquire)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close(force=True)
+            self._pool = None
+
+    def fetch(self, sql: str, params: Optional[dict] = None) -> list:
+        """Ejecuta una consulta y retorna todas las filas, sin commit."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params or {})
+                return cur.fetchall()
+
+    def execute(self, sql: str, params: Optional[dict] = None) -> int:
+        """Ejecuta una sentencia DML y hace commit; retorna las filas afectadas."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params or {})
+                rowcount = cur.rowcount
+            conn.commit()
+        return rowcount
+
+    def execute_returning(self, sql: str, params: Optional[dict] = None):
+        """Ejecuta un INSERT ... RETURNING <col> INTO :retorno y retorna ese valor."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                retorno = cur.var(oracledb.DB_TYPE_NUMBER)
+                cur.execute(sql, {**(params or {}), "retorno": retorno})
+            conn.commit()
+        return retorno.getvalue()[0]
 
-    def query(self, sql: str, params: Optional[dict] = None):
+    def execute_many(self, sql: str, rows: list) -> int:
+        """Ejecuta una sentencia DML para cada fila en un solo viaje y hace commit."""
+        if not rows:
+            return 0
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                result = cur.execute(sql, params or {})
-                rows = result.fetchall() if sql.strip().upper().startswith("SELECT") else None
+                cur.executemany(sql, rows)
+                rowcount = cur.rowcount
             conn.commit()
-        return rows
+        return rowcount
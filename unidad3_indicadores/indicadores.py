@@ -1,15 +1,76 @@
+import asyncio
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from requests.adapters import HTTPAdapter
+from cache import CacheLRU
+
+# Segundos que se considera vigente el valor actual de cada indicador
+TTL_INDICADORES = {
+    "uf": 6 * 3600,
+    "dolar": 3600,
+    "euro": 3600,
+    "utm": 24 * 3600,
+    "ipc": 24 * 3600,
+    "ivp": 6 * 3600,
+}
+TTL_POR_DEFECTO = 3600
+INDICADORES = ["uf", "dolar", "euro", "utm", "ipc", "ivp"]
 
 class IndicadoresEconomicos:
-    def __init__(self):
+    def __init__(self, cache=None, cache_disco=None, max_concurrencia: int = 6):
         self.base_url = "https://mindicador.cl/api"
+        self.max_concurrencia = max_concurrencia
+        # Sesión con conexiones keep-alive: evita un handshake TCP+TLS por consulta
+        self.session = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrencia)
+        self.session.mount("https://", adaptador)
+        self.cache = cache if cache is not None else CacheLRU()
+        # Opcional: CacheSQLite para conservar valores entre ejecuciones
+        self.cache_disco = cache_disco
+
+    def _ttl(self, indicador: str, fecha: str = None):
+        # Un valor de una fecha pasada no cambia: se guarda sin expiración
+        if fecha and fecha != date.today().strftime("%d-%m-%Y"):
+            return None
+        return TTL_INDICADORES.get(indicador, TTL_POR_DEFECTO)
+
+    def _desde_cache(self, clave: str):
+        hit, valor = self.cache.get(clave)
+        if hit:
+            return True, valor
+        if self.cache_disco is not None:
+            # En memoria sólo por lo que le queda de vigencia en disco
+            hit, valor, restante = self.cache_disco.get_con_ttl(clave)
+            if hit:
+                self.cache.set(clave, valor, restante)
+                return True, valor
+        return False, None
+
+    def _guardar_cache(self, clave: str, valor, ttl):
+        self.cache.set(clave, valor, ttl)
+        if self.cache_disco is not None:
+            self.cache_disco.set(clave, valor, ttl)
+
+    def estadisticas_cache(self) -> dict:
+        stats = {"memoria": self.cache.estadisticas()}
+        if self.cache_disco is not None:
+            stats["disco"] = self.cache_disco.estadisticas()
+        return stats
 
     def obtener_indicador(self, indicador: str, fecha: str = None):
         try:
             indicador = indicador.strip().lower()
+            clave = f"{indicador}/{fecha}" if fecha else indicador
+            ttl = self._ttl(indicador, fecha)
+
+            hit, valor = self._desde_cache(clave)
+            if hit:
+                return valor
+
             url = f"{self.base_url}/{indicador}/{fecha}" if fecha else f"{self.base_url}/{indicador}"
 
-            resp = requests.get(url, timeout=10)
+            resp = self.session.get(url, timeout=10)
             resp.raise_for_status()
 
             data = resp.json()
@@ -17,7 +78,51 @@ class IndicadoresEconomicos:
             if not serie:
                 return None
 
-            return serie[0].get("valor")
+            valor = serie[0].get("valor")
+            self._guardar_cache(clave, valor, ttl)
+            return valor
         except Exception as e:
             print("Error al consumir la API:", e)
             return None
+
+    def obtener_serie(self, indicador: str, anio: int) -> list:
+        """Retorna la serie de un año como lista de (fecha, valor), ordenada por fecha."""
+        indicador = indicador.strip().lower()
+        clave = f"{indicador}/anio/{anio}"
+        # Un año cerrado ya no cambia; el año en curso se refresca como el valor actual
+        ttl = TTL_INDICADORES.get(indicador, TTL_POR_DEFECTO) if anio >= date.today().year else None
+
+        hit, serie = self._desde_cache(clave)
+        if not hit:
+            resp = self.session.get(f"{self.base_url}/{indicador}/{anio}", timeout=30)
+            resp.raise_for_status()
+            serie = [[p["fecha"][:10], p["valor"]] for p in resp.json().get("serie", [])]
+            self._guardar_cache(clave, serie, ttl)
+
+        return sorted((datetime.strptime(f, "%Y-%m-%d"), v) for f, v in serie)
+
+    def obtener_indicadores(self, consultas=None, fecha: str = None) -> dict:
+        """Consulta varios indicadores en paralelo.
+
+        consultas puede mezclar nombres ("uf") y pares (indicador, fecha);
+        por defecto se consultan todos los INDICADORES. Retorna un dict
+        {consulta: valor} con a lo más max_concurrencia peticiones en vuelo.
+        """
+        consultas = list(consultas or INDICADORES)
+        pares = [c if isinstance(c, tuple) else (c, fecha) for c in consultas]
+        with ThreadPoolExecutor(max_workers=self.max_concurrencia) as executor:
+            valores = executor.map(lambda par: self.obtener_indicador(*par), pares)
+            return dict(zip(consultas, valores))
+
+    async def obtener_indicadores_async(self, consultas=None, fecha: str = None) -> dict:
+        """Variante asyncio de obtener_indicadores, limitada por un semáforo."""
+        consultas = list(consultas or INDICADORES)
+        semaforo = asyncio.Semaphore(self.max_concurrencia)
+
+        async def consultar(consulta):
+            indicador, fecha_consulta = consulta if isinstance(consulta, tuple) else (consulta, fecha)
+            async with semaforo:
+                return await asyncio.to_thread(self.obtener_indicador, indicador, fecha_consulta)
+
+        valores = await asyncio.gather(*(consultar(c) for c in consultas))
+        return dict(zip(consultas, valores))
@@ -1,48 +1,77 @@
 from conexion import Database
 from autenticacion import Auth
 from indicadores import IndicadoresEconomicos
+from cache import CacheSQLite
 import oracledb
 import getpass
+from compartido import instrumentacion
+import os
+import re
 from datetime import datetime
 
-def next_user_id(db: Database) -> int:
-    rows = db.query("SELECT NVL(MAX(id), 0) + 1 FROM USERS")
-    return int(rows[0][0])
+def _es_usuario_duplicado(db: Database, error) -> bool:
+    """True si el ORA-00001 viene de la restricción única de USERS.username.
+
+    Se reconoce por su columna: en las bases creadas con el esquema original
+    la restricción no se llama USERS_USERNAME_UK sino SYS_C...
+    """
+    if error.code != 1:
+        return False
+    restriccion = re.search(r"\((\w+)\.(\w+)\)", error.message)
+    if restriccion is None:
+        return False
+    if restriccion.group(2).upper() == "USERS_USERNAME_UK":
+        return True
+    columnas = db.fetch(
+        "SELECT column_name FROM user_cons_columns "
+        "WHERE table_name = 'USERS' AND constraint_name = :c",
+        {"c": restriccion.group(2)},
+    )
+    return [c for (c,) in columnas] == ["USERNAME"]
 
 def registrar(db: Database):
     print("\n=== Registro de usuario ===")
     username = input("Nuevo usuario: ").strip()
     password = getpass.getpass("Nueva contraseña: ").strip()
 
-    # Verificar si ya existe
-    existe = db.query("SELECT 1 FROM USERS WHERE username = :u", {"u": username})
-    if existe:
-        print("Ese usuario ya existe.")
-        return
-
-    uid = next_user_id(db)
-    hashed = Auth.hash_password(password).hex()
-
-    db.query(
-        "INSERT INTO USERS (id, username, password_hash) VALUES (:id, :u, :p)",
-        {"id": uid, "u": username, "p": hashed}
-    )
-    print("Usuario registrado correctamente.")
+    hashed = Auth.hash_password(password)
+
+    # Un solo viaje: el id lo asigna la identity y la restricción única
+    # USERS_USERNAME_UK rechaza duplicados sin consultar antes
+    try:
+        uid = db.execute_returning(
+            "INSERT INTO USERS (username, password_hash) VALUES (:u, :p) "
+            "RETURNING id INTO :retorno",
+            {"u": username, "p": hashed}
+        )
+    except oracledb.IntegrityError as e:
+        # ORA-00001 también sale de otras restricciones (p. ej. la PK si la
+        # identity quedó atrás de ids manuales): sólo la de username es un duplicado
+        if _es_usuario_duplicado(db, e.args[0]):
+            print("Ese usuario ya existe.")
+            return
+        raise
+    print(f"Usuario registrado correctamente (id {int(uid)}).")
 
 def login(db: Database) -> str | None:
     print("\n=== Login ===")
     username = input("Usuario: ").strip()
     password = getpass.getpass("Contraseña: ").strip()
 
-    rows = db.query("SELECT password_hash FROM USERS WHERE username = :u", {"u": username})
+    rows = db.fetch("SELECT password_hash FROM USERS WHERE username = :u", {"u": username})
     if not rows:
         print("Usuario no existe.")
         return None
 
-    hashed_hex = rows[0][0]
-    hashed_bytes = bytes.fromhex(hashed_hex)
+    hashed_bytes = rows[0][0]
 
     if Auth.verify_password(password, hashed_bytes):
+        # Si cambió BCRYPT_ROUNDS, se actualiza el hash con el costo vigente
+        if Auth.needs_rehash(hashed_bytes):
+            db.execute(
+                "UPDATE USERS SET password_hash = :p WHERE username = :u",
+                {"p": Auth.hash_password(password), "u": username}
+            )
         print("Login exitoso ✅")
         return username
     else:
@@ -51,32 +80,41 @@ def login(db: Database) -> str | None:
 
 def consultar_y_guardar(db: Database, api: IndicadoresEconomicos, usuario: str):
     print("\n=== Indicadores económicos ===")
-    indicador = input("Indicador (uf, dolar, euro, utm, ipc, ivp): ").strip().lower()
+    indicador = input("Indicador (uf, dolar, euro, utm, ipc, ivp o 'todos'): ").strip().lower()
+
+    # 'todos' consulta los seis indicadores en paralelo
+    if indicador == "todos":
+        valores = {n: v for n, v in api.obtener_indicadores().items() if v is not None}
+    else:
+        valor = api.obtener_indicador(indicador)
+        valores = {indicador: valor} if valor is not None else {}
 
-    valor = api.obtener_indicador(indicador)
-    if valor is None:
+    if not valores:
         print("No se pudo obtener el indicador.")
         return
 
-    print(f"Valor actual de {indicador.upper()}: {valor}")
+    for nombre, valor in valores.items():
+        print(f"Valor actual de {nombre.upper()}: {valor}")
 
     guardar = input("¿Guardar en BD? (s/n): ").strip().lower()
     if guardar != "s":
         return
 
-    db.query(
+    db.execute_many(
         """
         INSERT INTO INDICADORES
         (nombre, fecha_indicador, valor, fecha_consulta, usuario, fuente)
         VALUES (:n, SYSDATE, :v, SYSDATE, :u, 'mindicador.cl')
         """,
-        {"n": indicador, "v": valor, "u": usuario}
+        [{"n": n, "v": v, "u": usuario} for n, v in valores.items()]
     )
     print("Indicador guardado en BD ✅")
 
 def main():
     db = Database()
-    api = IndicadoresEconomicos()
+    # INDICADORES_CACHE=<archivo> conserva los valores consultados entre ejecuciones
+    ruta_cache = os.getenv("INDICADORES_CACHE")
+    api = IndicadoresEconomicos(cache_disco=CacheSQLite(ruta_cache) if ruta_cache else None)
 
     usuario_logeado = None
 
@@ -85,6 +123,7 @@ def main():
         print("1) Registrar usuario")
         print("2) Login")
         print("3) Consultar indicador y guardar")
+        print("4) Estadísticas de consultas")
         print("0) Salir")
 
         op = input("Opción: ").strip()
@@ -99,7 +138,14 @@ def main():
                     print("Debes iniciar sesión primero.")
                 else:
                     consultar_y_guardar(db, api, usuario_logeado)
+            elif op == "4":
+                instrumentacion.imprimir_resumen()
+                ruta = input("Archivo Prometheus (vacío = no exportar): ").strip()
+                if ruta:
+                    with open(ruta, "w", encoding="utf-8") as archivo:
+                        archivo.write(instrumentacion.prometheus())
             elif op == "0":
+                print("Caché de indicadores:", api.estadisticas_cache())
                 print("Saliendo...")
                 break
             else:
@@ -1,7 +1,7 @@
 CREATE TABLE USERS (
-    id NUMBER PRIMARY KEY,
-    username VARCHAR2(50) UNIQUE,
-    password_hash VARCHAR2(200)
+    id NUMBER GENERATED BY DEFAULT ON NULL AS IDENTITY PRIMARY KEY,
+    username VARCHAR2(50) CONSTRAINT USERS_USERNAME_UK UNIQUE,
+    password_hash RAW(60)  -- hash bcrypt en binario (60 bytes)
 );
 
 CREATE TABLE INDICADORES (
@@ -13,3 +13,22 @@ CREATE TABLE INDICADORES (
     usuario VARCHAR2(50),
     fuente VARCHAR2(100)
 );
+
+-- Búsqueda por (nombre, fecha) para el backfill histórico
+CREATE INDEX INDICADORES_NOMBRE_FECHA_IX ON INDICADORES (nombre, fecha_indicador);
+
+-- Migración para una tabla USERS ya creada con id manual:
+-- CREATE SEQUENCE USERS_SEQ START WITH <MAX(id) + 1> CACHE 100;
+-- ALTER TABLE USERS MODIFY id DEFAULT ON NULL USERS_SEQ.NEXTVAL;
+
+-- Nombre estable para la restricción única de username en una tabla USERS
+-- creada con "username VARCHAR2(50) UNIQUE" (main.py la reconoce igual por su columna):
+-- SELECT constraint_name FROM user_cons_columns
+--  WHERE table_name = 'USERS' AND column_name = 'USERNAME';
+-- ALTER TABLE USERS RENAME CONSTRAINT <SYS_C...> TO USERS_USERNAME_UK;
+
+-- Migración de password_hash en hexadecimal (VARCHAR2) a RAW:
+-- ALTER TABLE USERS ADD password_hash_raw RAW(60);
+-- UPDATE USERS SET password_hash_raw = HEXTORAW(password_hash);
+-- ALTER TABLE USERS DROP COLUMN password_hash;
+-- ALTER TABLE USERS RENAME COLUMN password_hash_raw TO password_hash;
@@ -0,0 +1,5 @@
+"""Las pruebas importan los módulos de la unidad por nombre, como main.py."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
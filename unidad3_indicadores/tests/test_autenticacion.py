@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("bcrypt")
+
+from autenticacion import Auth
+
+
+@pytest.fixture
+def auth():
+    rounds = Auth.rounds
+    Auth.configurar(rounds=4, workers=2, modo="thread")
+    yield Auth
+    Auth.configurar(rounds=rounds)
+
+
+def test_needs_rehash_compara_el_costo_del_hash(auth):
+    assert not auth.needs_rehash(b"$2b$04$" + b"a" * 53)
+    assert auth.needs_rehash(b"$2b$12$" + b"a" * 53)
+
+
+def test_hash_y_verificacion_en_el_pool(auth):
+    hashed = auth.hash_password("secreto")
+    assert hashed.startswith(b"$2b$04$")
+    assert not auth.needs_rehash(hashed)
+    assert auth.verify_password("secreto", hashed)
+    assert not auth.verify_password("otro", hashed)
+
+    auth.configurar(rounds=5)
+    assert auth.needs_rehash(hashed)
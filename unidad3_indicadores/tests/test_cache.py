@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from cache import CacheLRU, CacheSQLite
+
+
+def test_lru_desaloja_la_menos_usada():
+    cache = CacheLRU(capacidad=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.estadisticas() == {"hits": 2, "misses": 1, "entradas": 2}
+
+
+def test_lru_expira_por_entrada():
+    cache = CacheLRU()
+    cache.set("corta", 1, ttl=0.01)
+    cache.set("fija", 2)
+    time.sleep(0.02)
+    assert cache.get("corta") == (False, None)
+    assert cache.get_con_ttl("fija") == (True, 2, None)
+
+
+def test_sqlite_retorna_la_vigencia_restante(tmp_path):
+    cache = CacheSQLite(str(tmp_path / "cache.sqlite3"))
+    cache.set("uf", 39000.5, ttl=100)
+    hit, valor, restante = cache.get_con_ttl("uf")
+    assert (hit, valor) == (True, 39000.5)
+    assert 99 < restante <= 100
+
+
+def test_sqlite_borra_las_entradas_vencidas(tmp_path):
+    ruta = str(tmp_path / "cache.sqlite3")
+    cache = CacheSQLite(ruta)
+    cache.set("a", 1, ttl=0.01)
+    cache.set("b", 2, ttl=0.01)
+    cache.set("c", [1, 2])
+    time.sleep(0.02)
+    assert cache.get("a") == (False, None)
+    assert cache.estadisticas()["entradas"] == 2
+    assert CacheSQLite(ruta).estadisticas()["entradas"] == 1
+    assert CacheSQLite(ruta).get("c") == (True, [1, 2])
+
+
+def test_acierto_en_disco_pasa_a_memoria_con_la_vigencia_restante(tmp_path):
+    pytest.importorskip("requests")
+    from indicadores import IndicadoresEconomicos
+
+    disco = CacheSQLite(str(tmp_path / "cache.sqlite3"))
+    disco.set("uf", 39000.5, ttl=10)
+    api = IndicadoresEconomicos(cache=CacheLRU(), cache_disco=disco)
+    assert api._desde_cache("uf") == (True, 39000.5)
+    _, _, restante = api.cache.get_con_ttl("uf")
+    assert restante <= 10